@@ -0,0 +1,299 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+import numpy as np
+
+from .conductor import Conductor
+from .constants import CF_CLASSIC, CF_IEEE, TA_MIN, TA_MAX, TC_MIN, TC_MAX
+from .currentcalc import _balanceArray, _bisectArray, _heatTerms
+
+#-----------------------------------------------------------------------------------------
+
+__all__ = ['ConductorCatalog', 'CatalogCalc']
+
+#-----------------------------------------------------------------------------------------
+
+def _readOnly(values):
+    # Returns read-only float array
+    arr = np.array(values, dtype=float)
+    arr.flags.writeable = False
+    return arr
+
+#-----------------------------------------------------------------------------------------
+
+class ConductorCatalog(object):
+    """Container for the characteristics of many conductors, stored as arrays.
+    
+    Read-only properties
+    names      : Tuple of conductor names
+    categories : Tuple of Category instances
+    idxs       : Tuple of database keys
+    diameter   : Diameters [mm] (array)
+    area       : Cross section areas [mm2] (array)
+    weight     : Weights per unit [kg/m] (array)
+    strength   : Rated strengths [kg] (array)
+    r25        : Resistances at 25°C [Ohm/km] (array)
+    hcap       : Heat capacities [kcal/(ft*°C)] (array)
+    alpha      : Temperature coefficients of resistance of categories [1/°C] (array)
+    
+    """
+    
+    __slots__ = ('_names', '_categories', '_idxs', '_diameter', '_area', '_weight',
+                 '_strength', '_r25', '_hcap', '_alpha')
+    
+    def __init__(self, conductors):
+        """
+        conductors : Iterable of Conductor instances
+        """
+        conductors = list(conductors)
+        self._names = tuple(c.name for c in conductors)
+        self._categories = tuple(c.category for c in conductors)
+        self._idxs = tuple(c.idx for c in conductors)
+        self._diameter = _readOnly([c.diameter for c in conductors])
+        self._area = _readOnly([c.area for c in conductors])
+        self._weight = _readOnly([c.weight for c in conductors])
+        self._strength = _readOnly([c.strength for c in conductors])
+        self._r25 = _readOnly([c.r25 for c in conductors])
+        self._hcap = _readOnly([c.hcap for c in conductors])
+        self._alpha = _readOnly([c.category.alpha for c in conductors])
+    
+    #-------------------------------------------------------------------------------------
+    # Public methods
+    
+    def getConductor(self, i):
+        """Returns Conductor instance
+        i : Position in catalog
+        """
+        return Conductor(self._names[i], self._categories[i], float(self._diameter[i]),
+                         float(self._area[i]), float(self._weight[i]),
+                         float(self._strength[i]), float(self._r25[i]), float(self._hcap[i]),
+                         self._idxs[i])
+    
+    def getConductors(self):
+        """Returns list of Conductor instances"""
+        return [self.getConductor(i) for i in range(len(self._names))]
+    
+    def __len__(self):
+        return len(self._names)
+    
+    #-------------------------------------------------------------------------------------
+    # Properties
+    
+    @property
+    def names(self):
+        return self._names
+    
+    @property
+    def categories(self):
+        return self._categories
+    
+    @property
+    def idxs(self):
+        return self._idxs
+    
+    @property
+    def diameter(self):
+        return self._diameter
+    
+    @property
+    def area(self):
+        return self._area
+    
+    @property
+    def weight(self):
+        return self._weight
+    
+    @property
+    def strength(self):
+        return self._strength
+    
+    @property
+    def r25(self):
+        return self._r25
+    
+    @property
+    def hcap(self):
+        return self._hcap
+    
+    @property
+    def alpha(self):
+        return self._alpha
+
+#-----------------------------------------------------------------------------------------
+
+class CatalogCalc(object):
+    """Object to calculate currents and temperatures for all conductors of a catalog.
+    
+    Same formulas and settings as CurrentCalc. Arguments of getCurrent and getTc are
+    broadcast against the conductors, placed in the last axis: getCurrent(35, 75) returns
+    the current of each conductor and getCurrent(ta[:, None], 75) one row for each ta.
+    
+    Read-only properties
+    catalog  : ConductorCatalog instance
+    
+    Read-write properties
+    altitude    : Altitude [m] = 300.0
+    airVelocity : Velocity of air stream [ft/seg] =   2.0
+    sunEffect   : Sun effect factor (0 to 1) = 1.0
+    emissivity  : Emissivity (0 to 1) = 0.5
+    formula     : Define formula for current calculation = CF_IEEE
+    deltaTemp   : Temperature difference to determine equality [°C] = 0.01
+    
+    """
+    
+    __slots__ = ('_catalog', '_altitude', '_airVelocity', '_sunEffect', '_emissivity',
+                 '_formula', '_deltaTemp', '_D', '_D75', '_Pb', '_V', '_Qr0', '_Qs')
+    
+    def __init__(self, catalog):
+        """
+        catalog : ConductorCatalog instance
+        Valid values are required for r25, diameter and category.alpha of all conductors
+        """
+        if len(catalog) > 0:
+            if catalog.diameter.min() <= 0: raise ValueError("diameter <= 0")
+            if catalog.r25.min() <= 0: raise ValueError("r25 <= 0")
+            if catalog.alpha.min() <= 0: raise ValueError("category.alpha <= 0")
+            if catalog.alpha.max() >= 1: raise ValueError("category.alpha >= 1")
+        
+        self._catalog = catalog
+        self._altitude = 300.0
+        self._airVelocity = 2.0
+        self._sunEffect = 1.0
+        self._emissivity = 0.5
+        self._formula = CF_IEEE
+        self._deltaTemp = 0.01
+        self._updateTerms()
+    
+    #-------------------------------------------------------------------------------------
+    # Public methods
+    
+    def getCurrent(self, ta, tc):
+        """Returns array of currents [ampere], conductors in last axis
+        ta : Ambient temperatures [°C] (array_like)
+        tc : Conductor temperatures [°C] (array_like)
+        """
+        ta, tc = self._broadcast(ta, tc)
+        if ta.size > 0:
+            if ta.min() < TA_MIN: raise ValueError("ta < TA_MIN")
+            if ta.max() > TA_MAX: raise ValueError("ta > TA_MAX")
+            if tc.min() < TC_MIN: raise ValueError("tc < TC_MIN")
+            if tc.max() > TC_MAX: raise ValueError("tc > TC_MAX")
+        return self._calcCurrent(ta, tc, Ellipsis)
+    
+    def getTc(self, ta, ic):
+        """Returns array of conductor temperatures [°C], conductors in last axis
+        ta : Ambient temperatures [°C] (array_like)
+        ic : Currents [ampere] (array_like)
+        Range checks are done once per array and the bisection runs for all elements
+        together.
+        """
+        ta, ic = self._broadcast(ta, ic)
+        shape = ta.shape
+        cols = np.broadcast_to(np.arange(len(self._catalog)), shape).ravel()
+        ta = ta.ravel()
+        ic = ic.ravel()
+        
+        if ta.size > 0:
+            if ta.min() < TA_MIN: raise ValueError("ta < TA_MIN")
+            if ta.max() > TA_MAX: raise ValueError("ta > TA_MAX")
+            if ic.min() < 0: raise ValueError("ic < 0")
+            Icmax = self._calcCurrent(ta, np.full(ta.shape, TC_MAX), cols)
+            if (ic > Icmax).any(): raise ValueError("ic > Imax (TC_MAX)")
+        
+        below = lambda idx, t: self._calcCurrent(ta[idx], t, cols[idx]) > ic[idx]
+        Tmed = _bisectArray(below, ta.copy(), np.full(ta.shape, TC_MAX), self._deltaTemp)
+        return Tmed.reshape(shape)
+    
+    #-------------------------------------------------------------------------------------
+    # Private methods
+    
+    def _broadcast(self, x, y):
+        # Broadcast x and y against the conductors of catalog (last axis)
+        x, y, _ = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float),
+                                      np.empty(len(self._catalog)))
+        return x, y
+    
+    def _updateTerms(self):
+        # Terms of getCurrent that depend only on conductors and settings
+        self._D, self._D75, self._Pb, self._V, self._Qr0, self._Qs = _heatTerms(
+            self._catalog.diameter, self._altitude, self._airVelocity, self._sunEffect,
+            self._emissivity)
+    
+    def _calcCurrent(self, ta, tc, cols):
+        # Currents without range checks. cols : Conductor positions for elements of ta and
+        # tc, or Ellipsis when conductors are in the last axis
+        cat = self._catalog
+        with np.errstate(invalid='ignore'):
+            g = _balanceArray(ta, tc, self._D[cols], self._D75[cols], cat.r25[cols],
+                              cat.alpha[cols], self._Pb, self._V, self._Qr0[cols],
+                              self._Qs[cols], self._formula)
+            return np.sqrt(np.maximum(np.where(ta < tc, g, 0.0), 0.0))
+    
+    #-------------------------------------------------------------------------------------
+    # Read-only properties
+    
+    @property
+    def catalog(self):
+        return self._catalog
+    
+    #-------------------------------------------------------------------------------------
+    # Read-write properties
+    
+    @property
+    def altitude(self):
+        return self._altitude
+    
+    @altitude.setter
+    def altitude(self, v):
+        if v < 0: raise ValueError("altitude < 0")
+        self._altitude = v
+        self._updateTerms()
+    
+    @property
+    def airVelocity(self):
+        return self._airVelocity
+    
+    @airVelocity.setter
+    def airVelocity(self, v):
+        if v < 0: raise ValueError("airVelocity < 0")
+        self._airVelocity = v
+        self._updateTerms()
+    
+    @property
+    def sunEffect(self):
+        return self._sunEffect
+    
+    @sunEffect.setter
+    def sunEffect(self, v):
+        if v < 0: raise ValueError("sunEffect < 0")
+        if v > 1: raise ValueError("sunEffect > 1")
+        self._sunEffect = v
+        self._updateTerms()
+    
+    @property
+    def emissivity(self):
+        return self._emissivity
+    
+    @emissivity.setter
+    def emissivity(self, v):
+        if v < 0: raise ValueError("emissivity < 0")
+        if v > 1: raise ValueError("emissivity > 1")
+        self._emissivity = v
+        self._updateTerms()
+    
+    @property
+    def formula(self):
+        return self._formula
+    
+    @formula.setter
+    def formula(self, v):
+        if v not in [CF_IEEE, CF_CLASSIC]: raise ValueError("formula <> CF_IEEE, CF_CLASSIC")
+        self._formula = v
+    
+    @property
+    def deltaTemp(self):
+        return self._deltaTemp
+    
+    @deltaTemp.setter
+    def deltaTemp(self, v):
+        if v <= 0: raise ValueError("deltaTemp <= 0")
+        self._deltaTemp = v
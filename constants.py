@@ -5,6 +5,15 @@ Formula to use in CurrentCalc for current calculations
 CF_IEEE    = 0    Identifies IEEE formula
 CF_CLASSIC = 1    Identifies CLASSIC formula
 
+Root finding method to use in CurrentCalc.getTc and CurrentCalc.getTa
+SV_BISECTION = 0    Identifies bisection method
+SV_BRENT     = 1    Identifies Brent method (falls back to bisection steps)
+
+Integration method to use in TcTimeCalc.getData
+TI_EULER    = 0    Identifies Euler method with timeStep steps
+TI_RK4      = 1    Identifies classic Runge-Kutta method with timeStep steps
+TI_ADAPTIVE = 2    Identifies Dormand-Prince method with steps adapted to tolerance
+
 Ambient temperature in °C
 TA_MIN = -90    Minimum value for ambient temperature
                 World lowest -82.2°C Vostok Antartica 21/07/1983
@@ -26,8 +35,8 @@ TENSION_MAX = 50000    Maximum conductor tension
 
 #-----------------------------------------------------------------------------------------
 
-__all__ = ['CF_CLASSIC', 'CF_IEEE', 'TA_MIN', 'TA_MAX', 'TC_MIN', 'TC_MAX', 'ITER_MAX',
-           'TENSION_MAX']
+__all__ = ['CF_CLASSIC', 'CF_IEEE', 'SV_BISECTION', 'SV_BRENT', 'TI_EULER', 'TI_RK4',
+           'TI_ADAPTIVE', 'TA_MIN', 'TA_MAX', 'TC_MIN', 'TC_MAX', 'ITER_MAX', 'TENSION_MAX']
 
 #-----------------------------------------------------------------------------------------
 
@@ -35,6 +44,15 @@ __all__ = ['CF_CLASSIC', 'CF_IEEE', 'TA_MIN', 'TA_MAX', 'TC_MIN', 'TC_MAX', 'ITE
 CF_IEEE    = 0
 CF_CLASSIC = 1
 
+# Root finding methods
+SV_BISECTION = 0
+SV_BRENT     = 1
+
+# Integration methods
+TI_EULER    = 0
+TI_RK4      = 1
+TI_ADAPTIVE = 2
+
 # Ambient temperature
 TA_MIN = -90.0
 TA_MAX =  90.0
@@ -1,6 +1,12 @@
 # CRISTIAN ECHEVERRÍA RABÍ
 
-from .constants import (CF_CLASSIC, CF_IEEE, TA_MIN, TA_MAX, TC_MIN, TC_MAX) #, ITER_MAX)
+import weakref
+
+import numpy as np
+
+from .constants import (CF_CLASSIC, CF_IEEE, SV_BISECTION, SV_BRENT, TA_MIN, TA_MAX, TC_MIN, 
+                        TC_MAX, ITER_MAX)
+from .currentsurface import CurrentSurface
 
 #-----------------------------------------------------------------------------------------
 
@@ -8,11 +14,125 @@ __all__ = ['CurrentCalc']
 
 #-----------------------------------------------------------------------------------------
 
+def _brent(func, xa, xb, fa, fb, delta):
+    # Brent method to find the root of func in [xa, xb]. Returns x within delta of the root.
+    # fa, fb : func(xa) and func(xb), with opposite signs
+    # Interpolation steps that leave the bracket or converge slowly are replaced by 
+    # bisection steps.
+    xpre, xcur = xa, xb
+    fpre, fcur = fa, fb
+    xblk = fblk = spre = scur = 0.0
+    if fpre == 0: return xpre
+    if fcur == 0: return xcur
+    
+    tol = 0.5*delta
+    for cuenta in range(ITER_MAX):
+        if fpre*fcur < 0:
+            xblk = xpre
+            fblk = fpre
+            spre = scur = xcur - xpre
+        if abs(fblk) < abs(fcur):
+            xpre, xcur, xblk = xcur, xblk, xcur
+            fpre, fcur, fblk = fcur, fblk, fcur
+        
+        sbis = 0.5*(xblk - xcur)
+        if fcur == 0 or abs(sbis) < tol:
+            return xcur
+        
+        if abs(spre) > tol and abs(fcur) < abs(fpre):
+            if xpre == xblk:
+                # Interpolación lineal
+                stry = -fcur*(xcur - xpre)/(fcur - fpre)
+            else:
+                # Interpolación cuadrática inversa
+                dpre = (fpre - fcur)/(xpre - xcur)
+                dblk = (fblk - fcur)/(xblk - xcur)
+                stry = -fcur*(fblk*dblk - fpre*dpre)/(dblk*dpre*(fblk - fpre))
+            if 2*abs(stry) < min(abs(spre), 3*abs(sbis) - tol):
+                spre = scur
+                scur = stry
+            else:
+                spre = scur = sbis
+        else:
+            spre = scur = sbis
+        
+        xpre = xcur
+        fpre = fcur
+        if abs(scur) > tol:
+            xcur += scur
+        else:
+            xcur += tol if sbis > 0 else -tol
+        fcur = func(xcur)
+    
+    raise RuntimeError("brent: N° iterations > %d" % ITER_MAX)
+
+def _heatTerms(diameter, altitude, airVelocity, sunEffect, emissivity):
+    # Returns (D, D75, Pb, V, Qr0, Qs), the terms of the current that depend only on 
+    # conductor and settings. Scalars or arrays
+    D = diameter/25.4                                          # Diámetro en pulgadas
+    Pb = 10**(1.880813592 - altitude/18336)                    # Presión barométrica en cmHg
+    V = airVelocity*3600                                       # Vel. viento en pies/hora
+    return D, D**0.75, Pb, V, 0.138*D*emissivity, 3.87*D*sunEffect
+
+def _bisectArray(below, Tmin, Tmax, delta, idx=None):
+    # Bisection for all elements of float arrays Tmin and Tmax together (updated in place).
+    # below(idx, t) : Boolean array, True where the root of elements idx is below t
+    # idx           : Optional. Elements to solve, all by default
+    # Returns array with the last midpoints, the initial ones for elements not solved
+    Tmed = 0.5*(Tmin + Tmax)
+    
+    # Índices de elementos que no han convergido
+    if idx is None:
+        idx = np.flatnonzero((Tmax - Tmin) > delta)
+    else:
+        idx = idx[(Tmax[idx] - Tmin[idx]) > delta]
+    while idx.size > 0:
+        tmin = Tmin[idx]
+        tmax = Tmax[idx]
+        tmed = 0.5*(tmin + tmax)
+        lower = below(idx, tmed)
+        Tmax[idx] = np.where(lower, tmed, tmax)
+        Tmin[idx] = np.where(lower, tmin, tmed)
+        Tmed[idx] = tmed
+        idx = idx[(Tmax[idx] - Tmin[idx]) > delta]
+    return Tmed
+
+def _balanceArray(ta, tc, D, D75, r25, alpha, Pb, V, Qr0, Qs, formula):
+    # Returns (Qc + Qr - Qs)/Rc, the current**2 with sign, for arrays with tc >= ta.
+    # Terms as in CurrentCalc._updateTerms, scalars or arrays broadcastable with ta and tc
+    # (ta >= tc must be set to zero current by the caller)
+    dt = np.maximum(tc - ta, 0.0)
+    Rc = r25*(1 + alpha*(tc - 25))*0.0003048
+    Tm = 0.5*(tc + ta)
+    Rf = 0.2901577*Pb/(273 + Tm)
+    Uf = 0.04165 + 0.000111*Tm
+    Kf = 0.00739 + 0.0000227*Tm
+    Qc = .283*(Rf**0.5)*D75*dt**1.25
+    
+    if np.any(V != 0):
+        factor = D*Rf*V/Uf
+        Qc1 = 0.1695*Kf*dt*factor**0.6
+        Qc2 = Kf*dt*(1.01 + 0.371*factor**0.52)
+        if formula == CF_IEEE:
+            Qcf = np.maximum(np.maximum(Qc, Qc1), Qc2)
+        else:
+            Qcf = np.where(factor < 12000, Qc2, Qc1)
+        Qc = np.where(V != 0, Qcf, Qc)                 # Sin viento solo convección natural
+    
+    LK = ((tc + 273)/100)**4
+    MK = ((ta + 273)/100)**4
+    Qr = Qr0*(LK - MK)
+    
+    return (Qc + Qr - Qs)/Rc
+
+#-----------------------------------------------------------------------------------------
+
 class CurrentCalc(object):
     """Object to calculate conductor current and temperatures.
     
     Read-only properties
     conductor  : Conductor instance
+    surface    : CurrentSurface instance or None. Dropped when settings change
     
     Read-write properties
     altitude    : Altitude [m] = 300.0
@@ -21,11 +141,19 @@ class CurrentCalc(object):
     emissivity  : Emissivity (0 to 1) = 0.5  
     formula     : Define formula for current calculation = CF_IEEE
     deltaTemp   : Temperature difference to determine equality [°C] = 0.01
+    solver      : Root finding method for getTc and getTa = SV_BISECTION
+    useSurface  : If True getCurrent and the methods using it interpolate on surface when
+                  it exists and contains (ta, tc) = False
+    
+    Changes in settings that modify getCurrent results are notified to the OperatingTable
+    instances using the calculator, to drop their stored results.
     
     """
 
     __slots__ = ('_conductor', '_diameter', '_r25', '_alpha', '_altitude', '_airVelocity', 
-                 '_sunEffect', '_emissivity', '_formula', '_deltaTemp')
+                 '_sunEffect', '_emissivity', '_formula', '_deltaTemp', '_solver',
+                 '_D', '_D75', '_Pb', '_V', '_Qr0', '_Qs', '_surface', '_useSurface', 
+                 '_tables')
     
     def __init__(self, conductor):
         """
@@ -50,6 +178,10 @@ class CurrentCalc(object):
         self._emissivity = 0.5
         self._formula = CF_IEEE
         self._deltaTemp = 0.01
+        self._solver = SV_BISECTION
+        self._useSurface = False
+        self._tables = weakref.WeakSet()
+        self._updateTerms()
     
     #-------------------------------------------------------------------------------------
     # Public methods
@@ -74,38 +206,40 @@ class CurrentCalc(object):
         
         if ta >= tc:
             return 0.0
-
-        D = self._diameter/25.4                        # Diámetro en pulgadas
-        Pb = 10**(1.880813592 - self._altitude/18336)  # Presión barométrica en cmHg
-        V = self._airVelocity*3600                     # Vel. viento en pies/hora
-        Rc = self.getResistance(tc)*0.0003048          # Resistencia en ohm/pies
-        Tm = 0.5*(tc + ta)                             # Temperatura media
-        Rf = 0.2901577*Pb/(273 + Tm)                   # Densidad rel.aire ¿lb/ft^3?
-        Uf = 0.04165 + 0.000111*Tm                     # Viscosidad abs. aire ¿lb/(ft x hora)
-        Kf = 0.00739 + 0.0000227*Tm                    # Coef. conductividad term. aire [Watt/(ft x °C)]
-        Qc = .283*(Rf**0.5)*(D**0.75)*(tc - ta)**1.25  # watt/ft
-        
-        if V != 0:
-            factor = D*Rf*V/Uf
-            Qc1 = 0.1695*Kf*(tc - ta)*factor**0.6
-            Qc2 = Kf*(tc - ta)*(1.01 + 0.371*factor**0.52)
-            if self._formula == CF_IEEE:    # IEEE criteria
-                Qc = max(Qc, Qc1, Qc2)
-            else:                           # CLASSIC criteria
-                if factor < 12000:
-                    Qc = Qc2
-                else:
-                    Qc = Qc1
         
-        LK = ((tc + 273)/100)**4
-        MK = ((ta + 273)/100)**4
-        Qr = 0.138*D*self._emissivity*(LK - MK)
-        Qs = 3.87*D*self._sunEffect
+        if self._useSurface and self._surface is not None and self._surface.contains(ta, tc):
+            return self._surface.getCurrent(ta, tc)
+        return self._calcCurrent(ta, tc)
+
+    def getCurrentArray(self, ta, tc, airVelocity=None, sunEffect=None):
+        """Returns array of currents [ampere]
+        ta          : Ambient temperatures [°C] (array_like)
+        tc          : Conductor temperatures [°C] (array_like)
+        airVelocity : Velocities of air stream [ft/seg] (array_like) or None to use the 
+                      airVelocity property
+        sunEffect   : Sun effect factors (0 to 1) (array_like) or None to use the sunEffect
+                      property
+        Arguments must be broadcastable. Range checks are done once per array. The
+        instance is not modified and the surface is not used with airVelocity or sunEffect.
+        """
+        ta, tc = np.broadcast_arrays(np.asarray(ta, dtype=float), np.asarray(tc, dtype=float))
+        if ta.size > 0:
+            if ta.min() < TA_MIN: raise ValueError("ta < TA_MIN")
+            if ta.max() > TA_MAX: raise ValueError("ta > TA_MAX")
+            if tc.min() < TC_MIN: raise ValueError("tc < TC_MIN")
+            if tc.max() > TC_MAX: raise ValueError("tc > TC_MAX")
+        if airVelocity is None and sunEffect is None:
+            return self._getCurrentArray(ta, tc)
         
-        if (Qc + Qr) < Qs: 
-            return 0.0
-        else: 
-            return ((Qc + Qr - Qs)/Rc)**(0.5)
+        if airVelocity is not None:
+            airVelocity = np.asarray(airVelocity, dtype=float)
+            if airVelocity.size > 0 and airVelocity.min() < 0: raise ValueError("airVelocity < 0")
+        if sunEffect is not None:
+            sunEffect = np.asarray(sunEffect, dtype=float)
+            if sunEffect.size > 0:
+                if sunEffect.min() < 0: raise ValueError("sunEffect < 0")
+                if sunEffect.max() > 1: raise ValueError("sunEffect > 1")
+        return self._calcCurrentArray(ta, tc, airVelocity, sunEffect)
 
     def getTc(self, ta, ic):
         """Returns conductor temperature [ampere]
@@ -115,7 +249,13 @@ class CurrentCalc(object):
         if ta < TA_MIN: raise ValueError("ta < TA_MIN")
         if ta > TA_MAX: raise ValueError("ta > TA_MAX")
         if ic < 0: raise ValueError("ic < 0")
-        if ic > self.getCurrent(ta, TC_MAX): raise ValueError("ic > Imax (TC_MAX)")
+        Icmax = self.getCurrent(ta, TC_MAX)
+        if ic > Icmax: raise ValueError("ic > Imax (TC_MAX)")
+        
+        # With ic = 0 the root is not unique (sun effect), bisection gives the highest one
+        if self._solver == SV_BRENT and ic > 0:
+            func = lambda t: self.getCurrent(ta, t) - ic
+            return _brent(func, ta, TC_MAX, -ic, Icmax - ic, self._deltaTemp)
         
         Tmin = ta
         Tmax = TC_MAX
@@ -133,6 +273,49 @@ class CurrentCalc(object):
             #    raise RuntimeError(err_msg)
         return Tmed
     
+    def getTcArray(self, ta, ic):
+        """Returns array of conductor temperatures [°C]
+        ta : Ambient temperatures [°C] (array_like)
+        ic : Currents [ampere] (array_like)
+        ta and ic must be broadcastable. Range checks are done once per array and the 
+        bisection runs for all elements together.
+        """
+        ta, ic = np.broadcast_arrays(np.asarray(ta, dtype=float), np.asarray(ic, dtype=float))
+        shape = ta.shape
+        ta = ta.ravel()
+        ic = ic.ravel()
+        
+        if ta.size > 0:
+            if ta.min() < TA_MIN: raise ValueError("ta < TA_MIN")
+            if ta.max() > TA_MAX: raise ValueError("ta > TA_MAX")
+            if ic.min() < 0: raise ValueError("ic < 0")
+            Icmax = self._getCurrentArray(ta, np.full(ta.shape, TC_MAX))
+            if (ic > Icmax).any(): raise ValueError("ic > Imax (TC_MAX)")
+        
+        below = lambda idx, t: self._getCurrentArray(ta[idx], t) > ic[idx]
+        Tmed = _bisectArray(below, ta.copy(), np.full(ta.shape, TC_MAX), self._deltaTemp)
+        return Tmed.reshape(shape)
+    
+    def iterTc(self, tas, ics):
+        """Yields conductor temperatures [°C] for a sequence of ambient temperatures and 
+        currents, as getTc
+        tas : Ambient temperatures [°C] (iterable)
+        ics : Currents [ampere] (iterable)
+        Each solve starts from a bracket around the previous temperature, expanded until 
+        it contains the root. Results are within deltaTemp of the root, as with getTc.
+        """
+        tc = None
+        step = 2*self._deltaTemp
+        for ta, ic in zip(tas, ics):
+            # With ic = 0 the root is not unique (sun effect), getTc gives the highest one
+            if tc is None or ic == 0:
+                tcx = self.getTc(ta, ic)
+            else:
+                tcx = self._getTcNear(ta, ic, tc, step)
+                step = max(abs(tcx - tc), 2*self._deltaTemp)
+            tc = tcx
+            yield tc
+    
     def getTa(self, tc, ic):
         """Returns ambient temperature [ampere]
         tc : Conductor temperature [°C]
@@ -140,14 +323,22 @@ class CurrentCalc(object):
         """
         if tc < TC_MIN: raise ValueError("tc < TC_MIN")
         if tc > TC_MAX: raise ValueError("tc > TC_MAX")
-        if ic < self.getCurrent(TA_MAX, tc): raise ValueError("ic < Imin (TA_MAX)")
-        if ic > self.getCurrent(TA_MIN, tc): raise ValueError("ic > Imax (TA_MIN)")
+        Icmin = self.getCurrent(TA_MAX, tc)
+        Icmax = self.getCurrent(TA_MIN, tc)
+        if ic < Icmin: raise ValueError("ic < Imin (TA_MAX)")
+        if ic > Icmax: raise ValueError("ic > Imax (TA_MIN)")
         
         Tmin = TA_MIN
         Tmax = min([TA_MAX, tc])
         if Tmin >= Tmax:
             return tc
         
+        # With ic = 0 the root is not unique (sun effect), bisection gives the lowest one
+        if self._solver == SV_BRENT and ic > 0:
+            func = lambda t: self.getCurrent(t, tc) - ic
+            Icmin = Icmin if Tmax == TA_MAX else 0.0
+            return _brent(func, Tmin, Tmax, Icmax - ic, Icmin - ic, self._deltaTemp)
+        
         #cuenta = 0
         while (Tmax - Tmin) > self._deltaTemp:
             Tmed = 0.5*(Tmin + Tmax)
@@ -162,12 +353,184 @@ class CurrentCalc(object):
             #    raise RuntimeError(err_msg)
         return Tmed
     
+    def getTaArray(self, tc, ic):
+        """Returns array of ambient temperatures [°C]
+        tc : Conductor temperatures [°C] (array_like)
+        ic : Currents [ampere] (array_like)
+        tc and ic must be broadcastable. Elements out of range (the conditions that make
+        getTa raise ValueError) are returned as NaN.
+        """
+        tc, ic = np.broadcast_arrays(np.asarray(tc, dtype=float), np.asarray(ic, dtype=float))
+        shape = tc.shape
+        tc = tc.ravel()
+        ic = ic.ravel()
+        
+        # Corrientes en los extremos TA_MAX y TA_MIN en una sola evaluación
+        valid = (tc >= TC_MIN) & (tc <= TC_MAX)
+        tcv = np.where(valid, tc, TC_MAX)
+        Imin, Imax = self._getCurrentArray(np.array([[TA_MAX], [TA_MIN]]), tcv)
+        valid &= (ic >= Imin) & (ic <= Imax)
+        
+        Tmin = np.full(tc.shape, TA_MIN)
+        Tmax = np.minimum(TA_MAX, tcv)
+        below = lambda idx, t: self._getCurrentArray(t, tcv[idx]) <= ic[idx]
+        Tmed = _bisectArray(below, Tmin, Tmax, self._deltaTemp, np.flatnonzero(valid))
+        
+        Tmed = np.where(Tmin >= Tmax, tcv, Tmed)
+        Tmed[~valid] = np.nan
+        return Tmed.reshape(shape)
+    
+    def buildSurface(self, maxError=0.1, taMin=TA_MIN, taMax=TA_MAX, tcMax=200.0):
+        """Builds, stores and returns CurrentSurface instance for current settings
+        maxError : Maximum absolute error [ampere]
+        taMin    : Minimum ambient temperature [°C]
+        taMax    : Maximum ambient temperature [°C]
+        tcMax    : Maximum conductor temperature [°C]
+        """
+        self._surface = CurrentSurface(self, maxError, taMin, taMax, tcMax)
+        self._changed()
+        return self._surface
+    
+    def __getstate__(self):
+        # OperatingTable instances using the calculator are not copied
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_tables'}
+    
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._tables = weakref.WeakSet()
+    
+    #-------------------------------------------------------------------------------------
+    # Private methods
+
+    def _changed(self):
+        # getCurrent results changed, OperatingTable instances using it are notified
+        for table in list(self._tables):
+            table._invalidate()
+    
+    def _updateTerms(self):
+        # Terms of getCurrent that depend only on conductor and settings
+        self._D, self._D75, self._Pb, self._V, self._Qr0, self._Qs = _heatTerms(
+            self._diameter, self._altitude, self._airVelocity, self._sunEffect, 
+            self._emissivity)
+        self._surface = None
+        self._changed()
+    
+    def _calcCurrent(self, ta, tc):
+        # Exact current without range checks
+        if ta >= tc:
+            return 0.0
+        
+        D = self._D
+        V = self._V
+        Rc = self._r25*(1 + self._alpha*(tc - 25))*0.0003048    # Resistencia en ohm/pies
+        Tm = 0.5*(tc + ta)                             # Temperatura media
+        Rf = 0.2901577*self._Pb/(273 + Tm)             # Densidad rel.aire ¿lb/ft^3?
+        Uf = 0.04165 + 0.000111*Tm                     # Viscosidad abs. aire ¿lb/(ft x hora)
+        Kf = 0.00739 + 0.0000227*Tm                    # Coef. conductividad term. aire [Watt/(ft x °C)]
+        Qc = .283*(Rf**0.5)*self._D75*(tc - ta)**1.25  # watt/ft
+        
+        if V != 0:
+            factor = D*Rf*V/Uf
+            Qc1 = 0.1695*Kf*(tc - ta)*factor**0.6
+            Qc2 = Kf*(tc - ta)*(1.01 + 0.371*factor**0.52)
+            if self._formula == CF_IEEE:    # IEEE criteria
+                Qc = max(Qc, Qc1, Qc2)
+            else:                           # CLASSIC criteria
+                if factor < 12000:
+                    Qc = Qc2
+                else:
+                    Qc = Qc1
+        
+        LK = ((tc + 273)/100)**4
+        MK = ((ta + 273)/100)**4
+        Qr = self._Qr0*(LK - MK)
+        Qs = self._Qs
+        
+        if (Qc + Qr) < Qs: 
+            return 0.0
+        else: 
+            return ((Qc + Qr - Qs)/Rc)**(0.5)
+    
+    def _getTcNear(self, ta, ic, t0, step):
+        # getTc for ic > 0 with bracket around t0, expanded doubling step until it 
+        # contains the root: getCurrent(ta, Tmin) <= ic < getCurrent(ta, Tmax)
+        if ta < TA_MIN: raise ValueError("ta < TA_MIN")
+        if ta > TA_MAX: raise ValueError("ta > TA_MAX")
+        if ic < 0: raise ValueError("ic < 0")
+        
+        t0 = min(max(t0, ta), TC_MAX)
+        f0 = self.getCurrent(ta, t0) - ic
+        if f0 > 0:
+            Tmax, fmax = t0, f0
+            Tmin = max(t0 - step, ta)
+            fmin = self.getCurrent(ta, Tmin) - ic
+            while fmin > 0:                            # En Tmin = ta, fmin = -ic < 0
+                Tmax, fmax = Tmin, fmin
+                step = 2*step
+                Tmin = max(Tmin - step, ta)
+                fmin = self.getCurrent(ta, Tmin) - ic
+        else:
+            Tmin, fmin = t0, f0
+            Tmax = min(t0 + step, TC_MAX)
+            fmax = self.getCurrent(ta, Tmax) - ic
+            while fmax <= 0 and Tmax < TC_MAX:
+                Tmin, fmin = Tmax, fmax
+                step = 2*step
+                Tmax = min(Tmax + step, TC_MAX)
+                fmax = self.getCurrent(ta, Tmax) - ic
+            if fmax < 0: raise ValueError("ic > Imax (TC_MAX)")
+        
+        if self._solver == SV_BRENT:
+            func = lambda t: self.getCurrent(ta, t) - ic
+            return _brent(func, Tmin, Tmax, fmin, fmax, self._deltaTemp)
+        
+        Tmed = 0.5*(Tmin + Tmax)
+        while (Tmax - Tmin) > self._deltaTemp:
+            Tmed = 0.5*(Tmin + Tmax)
+            Imed = self.getCurrent(ta, Tmed)
+            if Imed > ic:
+                Tmax = Tmed
+            else:
+                Tmin = Tmed
+        return Tmed
+    
+    def _getCurrentArray(self, ta, tc):
+        # getCurrent for float arrays of equal shape, without range checks
+        if self._useSurface and self._surface is not None:
+            inside = self._surface.containsArray(ta, tc)
+            if inside.all():
+                return self._surface.getCurrentArray(ta, tc)
+            tas, tcs = np.broadcast_arrays(ta, tc)
+            amps = np.asarray(self._calcCurrentArray(ta, tc))     # 0-d también
+            amps[inside] = self._surface.getCurrentArray(tas[inside], tcs[inside])
+            return amps
+        return self._calcCurrentArray(ta, tc)
+    
+    def _calcCurrentArray(self, ta, tc, airVelocity=None, sunEffect=None):
+        # Exact current for float arrays of equal shape, without range checks
+        with np.errstate(invalid='ignore'):
+            g = self._calcBalanceArray(ta, tc, airVelocity, sunEffect)
+            return np.sqrt(np.maximum(np.where(ta < tc, g, 0.0), 0.0))
+    
+    def _calcBalanceArray(self, ta, tc, airVelocity=None, sunEffect=None):
+        # Returns (Qc + Qr - Qs)/Rc, the current**2 with sign, for arrays with tc >= ta
+        # airVelocity, sunEffect : Arrays replacing the settings, or None
+        V = self._V if airVelocity is None else airVelocity*3600
+        Qs = self._Qs if sunEffect is None else 3.87*self._D*sunEffect
+        return _balanceArray(ta, tc, self._D, self._D75, self._r25, self._alpha, self._Pb, V, 
+                             self._Qr0, Qs, self._formula)
+
     #-------------------------------------------------------------------------------------
     # Read-only properties
     
     @property
     def conductor(self):
         return self._conductor
+    
+    @property
+    def surface(self):
+        return self._surface
 
     #-------------------------------------------------------------------------------------
     # Read-write properties
@@ -180,6 +543,7 @@ class CurrentCalc(object):
     def altitude(self, v):
         if v < 0: raise ValueError("altitude < 0")
         self._altitude = v
+        self._updateTerms()
     
     @property
     def airVelocity(self):
@@ -189,6 +553,7 @@ class CurrentCalc(object):
     def airVelocity(self, v):
         if v < 0: raise ValueError("airVelocity < 0")
         self._airVelocity = v
+        self._updateTerms()
     
     @property
     def sunEffect(self):
@@ -199,6 +564,7 @@ class CurrentCalc(object):
         if v < 0: raise ValueError("sunEffect < 0")
         if v > 1: raise ValueError("sunEffect > 1")
         self._sunEffect = v
+        self._updateTerms()
     
     @property
     def emissivity(self):
@@ -209,6 +575,7 @@ class CurrentCalc(object):
         if v < 0: raise ValueError("emissivity < 0")
         if v > 1: raise ValueError("emissivity > 1")
         self._emissivity = v
+        self._updateTerms()
     
     @property
     def formula(self):
@@ -218,6 +585,8 @@ class CurrentCalc(object):
     def formula(self, v):
         if v not in [CF_IEEE, CF_CLASSIC]: raise ValueError("formula <> CF_IEEE, CF_CLASSIC")
         self._formula = v
+        self._surface = None
+        self._changed()
     
     @property
     def deltaTemp(self):
@@ -226,4 +595,22 @@ class CurrentCalc(object):
     @deltaTemp.setter
     def deltaTemp(self, v):
         if v <= 0: raise ValueError("deltaTemp <= 0")
-        self._deltaTemp = v
\ No newline at end of file
+        self._deltaTemp = v
+    
+    @property
+    def solver(self):
+        return self._solver
+    
+    @solver.setter
+    def solver(self, v):
+        if v not in [SV_BISECTION, SV_BRENT]: raise ValueError("solver <> SV_BISECTION, SV_BRENT")
+        self._solver = v
+    
+    @property
+    def useSurface(self):
+        return self._useSurface
+    
+    @useSurface.setter
+    def useSurface(self, v):
+        self._useSurface = bool(v)
+        self._changed()
\ No newline at end of file
@@ -0,0 +1,229 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+from bisect import bisect_right
+
+import numpy as np
+
+from .constants import (TA_MIN, TA_MAX, TC_MAX)
+
+#-----------------------------------------------------------------------------------------
+
+__all__ = ['CurrentSurface']
+
+#-----------------------------------------------------------------------------------------
+
+_NODES_MAX = 4000000     # Maximum number of grid nodes
+_EXACT_FACTOR = 100.0    # Cells with current < _EXACT_FACTOR*maxError use exact formula
+
+#-----------------------------------------------------------------------------------------
+
+def _refine(nodes):
+    # Returns nodes with the midpoints of each interval inserted
+    fine = np.empty(2*len(nodes) - 1)
+    fine[::2] = nodes
+    fine[1::2] = 0.5*(nodes[:-1] + nodes[1:])
+    return fine
+
+def _cellMax(err):
+    # Returns maximum of err (on refinement grid) over the points of each coarse cell.
+    # Cell corners are grid nodes with no error
+    return np.maximum.reduce((err[1::2, 1::2], err[1::2, :-1:2], err[1::2, 2::2],
+                              err[:-1:2, 1::2], err[2::2, 1::2]))
+
+#-----------------------------------------------------------------------------------------
+
+class CurrentSurface(object):
+    """Interpolation surface for the current of a CurrentCalc instance.
+    
+    Interpolates current**2 (with sign) bilinearly on a grid over ta and tc - ta, so 
+    lookups cost two binary searches, a few multiply-adds and a square root. Grid cells are
+    split until the error against the exact formula, measured on a grid twice as fine, is 
+    below maxError.
+    Near zero current the square root is not smooth and the interpolation error can not be
+    bounded from grid values, so cells with a corner current below 100*maxError use the 
+    exact formula.
+    The surface reflects the CurrentCalc settings at build time.
+    
+    Read-only properties
+    taMin    : Minimum ambient temperature [°C]
+    taMax    : Maximum ambient temperature [°C]
+    tcMax    : Maximum conductor temperature [°C]
+    maxError : Maximum absolute error requested [ampere]
+    error    : Maximum error found on refinement grid [ampere]
+    shape    : Number of grid nodes (ta, tc - ta)
+    
+    """
+    
+    __slots__ = ('_calc', '_taMin', '_taMax', '_tcMax', '_maxError', '_error', '_taNodes',
+                 '_dtNodes', '_taList', '_dtList', '_values', '_rows', '_exact', '_exactRows')
+    
+    def __init__(self, currentcalc, maxError=0.1, taMin=TA_MIN, taMax=TA_MAX, tcMax=200.0):
+        """
+        currentcalc : CurrentCalc instance
+        maxError    : Maximum absolute error [ampere]
+        taMin       : Minimum ambient temperature [°C]
+        taMax       : Maximum ambient temperature [°C]
+        tcMax       : Maximum conductor temperature [°C]
+        """
+        if maxError <= 0: raise ValueError("maxError <= 0")
+        if taMin < TA_MIN: raise ValueError("taMin < TA_MIN")
+        if taMax > TA_MAX: raise ValueError("taMax > TA_MAX")
+        if taMin >= taMax: raise ValueError("taMin >= taMax")
+        if tcMax <= taMin: raise ValueError("tcMax <= taMin")
+        if tcMax > TC_MAX: raise ValueError("tcMax > TC_MAX")
+        
+        # Copia sin superficie para evaluar las celdas exactas
+        calc = type(currentcalc)(currentcalc.conductor)
+        calc.altitude = currentcalc.altitude
+        calc.airVelocity = currentcalc.airVelocity
+        calc.sunEffect = currentcalc.sunEffect
+        calc.emissivity = currentcalc.emissivity
+        calc.formula = currentcalc.formula
+        
+        self._calc = calc
+        self._taMin = taMin
+        self._taMax = taMax
+        self._tcMax = tcMax
+        self._maxError = maxError
+        
+        # Malla adaptiva en ta y tc - ta (más fina donde la corriente se anula)
+        dtMax = tcMax - taMin
+        taNodes = np.linspace(taMin, taMax, max(2, int(np.ceil((taMax - taMin)/5.0)) + 1))
+        dtNodes = np.linspace(0.0, dtMax, max(2, int(np.ceil(dtMax/5.0)) + 1))
+        
+        while True:
+            if (2*len(taNodes) - 1)*(2*len(dtNodes) - 1) > _NODES_MAX:
+                raise RuntimeError("CurrentSurface: N° nodes > %d" % _NODES_MAX)
+            
+            # Valores exactos en la malla de refinamiento (doble de fina)
+            ta = _refine(taNodes)
+            dt = _refine(dtNodes)
+            fine = calc._calcBalanceArray(ta[:, None], ta[:, None] + dt)
+            
+            values = fine[::2, ::2]
+            interp = np.empty_like(fine)
+            interp[::2, ::2] = values
+            interp[1::2, ::2] = 0.5*(values[:-1] + values[1:])
+            interp[:, 1::2] = 0.5*(interp[:, :-2:2] + interp[:, 2::2])
+            
+            gmin = np.minimum.reduce((values[:-1, :-1], values[1:, :-1], values[:-1, 1:],
+                                      values[1:, 1:]))
+            exact = gmin < (_EXACT_FACTOR*maxError)**2
+            err = abs(np.sqrt(np.maximum(interp, 0.0)) - np.sqrt(np.maximum(fine, 0.0)))
+            err = np.where(exact, 0.0, _cellMax(err))
+            errTa = err.max(axis=1)
+            errDt = err.max(axis=0)
+            if max(errTa.max(), errDt.max()) <= maxError:
+                break
+            
+            # Divide las celdas con error mayor a maxError/2
+            taNodes = np.sort(np.concatenate((taNodes, ta[1::2][errTa > 0.5*maxError])))
+            dtNodes = np.sort(np.concatenate((dtNodes, dt[1::2][errDt > 0.5*maxError])))
+        
+        self._error = max(errTa.max(), errDt.max())
+        self._taNodes = taNodes
+        self._dtNodes = dtNodes
+        self._taList = taNodes.tolist()
+        self._dtList = dtNodes.tolist()
+        self._values = np.ascontiguousarray(values)
+        self._rows = values.tolist()
+        self._exact = exact
+        self._exactRows = exact.tolist()
+    
+    #-------------------------------------------------------------------------------------
+    # Public methods
+    
+    def contains(self, ta, tc):
+        """Returns True if (ta, tc) is inside the surface
+        ta : Ambient temperature [°C]
+        tc : Conductor temperature [°C]
+        """
+        return self._taMin <= ta <= self._taMax and tc <= self._tcMax
+    
+    def getCurrent(self, ta, tc):
+        """Returns interpolated current [ampere]
+        ta : Ambient temperature [°C]
+        tc : Conductor temperature [°C]
+        (ta, tc) must be inside the surface
+        """
+        if ta >= tc:
+            return 0.0
+        
+        tas = self._taList
+        dts = self._dtList
+        dt = tc - ta
+        i = min(bisect_right(tas, ta), len(tas) - 1) - 1
+        j = min(bisect_right(dts, dt), len(dts) - 1) - 1
+        fx = (ta - tas[i])/(tas[i + 1] - tas[i])
+        fy = (dt - dts[j])/(dts[j + 1] - dts[j])
+        
+        if self._exactRows[i][j]:
+            return self._calc.getCurrent(ta, tc)
+        
+        r0 = self._rows[i]
+        r1 = self._rows[i + 1]
+        g0 = r0[j] + fx*(r1[j] - r0[j])
+        g1 = r0[j + 1] + fx*(r1[j + 1] - r0[j + 1])
+        g = g0 + fy*(g1 - g0)
+        return g**0.5 if g > 0 else 0.0
+    
+    def containsArray(self, ta, tc):
+        """Returns boolean array, True where (ta, tc) is inside the surface
+        ta : Ambient temperatures [°C] (array_like)
+        tc : Conductor temperatures [°C] (array_like)
+        """
+        ta = np.asarray(ta, dtype=float)
+        return (ta >= self._taMin) & (ta <= self._taMax) & (np.asarray(tc) <= self._tcMax)
+    
+    def getCurrentArray(self, ta, tc):
+        """Returns array of interpolated currents [ampere]
+        ta : Ambient temperatures [°C] (array_like)
+        tc : Conductor temperatures [°C] (array_like)
+        Elements must be inside the surface
+        """
+        ta, tc = np.broadcast_arrays(np.asarray(ta, dtype=float), np.asarray(tc, dtype=float))
+        tas = self._taNodes
+        dts = self._dtNodes
+        dt = np.maximum(tc - ta, 0.0)
+        i = np.clip(np.searchsorted(tas, ta, side='right'), 1, len(tas) - 1) - 1
+        j = np.minimum(np.searchsorted(dts, dt, side='right'), len(dts) - 1) - 1
+        fx = (ta - tas[i])/(tas[i + 1] - tas[i])
+        fy = (dt - dts[j])/(dts[j + 1] - dts[j])
+        
+        v = self._values
+        g0 = v[i, j] + fx*(v[i + 1, j] - v[i, j])
+        g1 = v[i, j + 1] + fx*(v[i + 1, j + 1] - v[i, j + 1])
+        g = np.where(ta < tc, g0 + fy*(g1 - g0), 0.0)
+        amps = np.asarray(np.sqrt(np.maximum(g, 0.0)))         # 0-d también
+        
+        exact = self._exact[i, j] & (ta < tc)
+        if exact.any():
+            amps[exact] = self._calc._calcCurrentArray(ta[exact], tc[exact])
+        return amps
+    
+    #-------------------------------------------------------------------------------------
+    # Properties
+    
+    @property
+    def taMin(self):
+        return self._taMin
+    
+    @property
+    def taMax(self):
+        return self._taMax
+    
+    @property
+    def tcMax(self):
+        return self._tcMax
+    
+    @property
+    def maxError(self):
+        return self._maxError
+    
+    @property
+    def error(self):
+        return self._error
+    
+    @property
+    def shape(self):
+        return self._values.shape
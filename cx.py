@@ -1,12 +1,17 @@
 # CRISTIAN ECHEVERRÍA RABÍ
 
+from .catalog import *
 from .category import *
 from .conductor import *
 from .constants import *
 from .currentcalc import *
+from .currentsurface import *
+from .dlr import *
+from .fleet import *
 from .tctimecalc import *
 from .tensioncalc import *
 from .operatingtable import *
+from .registry import *
 
 #-----------------------------------------------------------------------------------------
 
@@ -0,0 +1,79 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+from itertools import islice
+
+import numpy as np
+
+#-----------------------------------------------------------------------------------------
+
+__all__ = ['RatingStream']
+
+#-----------------------------------------------------------------------------------------
+
+class RatingStream(object):
+    """Streaming dynamic line rating of an OperatingTable over weather records.
+    
+    Records are (ta, airVelocity, sunEffect) values. They are rated in chunks with 
+    OperatingTable.getCurrentArray, passing airVelocity and sunEffect per record, so the
+    calculators of the table are not modified and memory use depends on chunkSize only.
+    
+    Read-only properties
+    table     : OperatingTable instance
+    chunkSize : Number of records rated together
+    
+    """
+    
+    __slots__ = ('_table', '_chunkSize')
+    
+    def __init__(self, table, chunkSize=4096):
+        """
+        table     : OperatingTable instance
+        chunkSize : Number of records rated together
+        """
+        if chunkSize < 1: raise ValueError("chunkSize < 1")
+        
+        self._table = table
+        self._chunkSize = chunkSize
+    
+    #-------------------------------------------------------------------------------------
+    # Public methods
+    
+    def getCurrentArray(self, ta, airVelocity, sunEffect):
+        """Returns array of lowest currents for the OperatingItems of table [ampere]
+        ta          : Ambient temperatures [°C] (array_like)
+        airVelocity : Velocities of air stream [ft/seg] (array_like)
+        sunEffect   : Sun effect factors (0 to 1) (array_like)
+        Arguments must be broadcastable
+        """
+        return self._table.getCurrentArray(ta, airVelocity, sunEffect)
+    
+    def iterChunks(self, chunks):
+        """Yields arrays of lowest currents [ampere], one for each chunk
+        chunks : Iterable of (ta, airVelocity, sunEffect) arrays
+        """
+        for ta, airVelocity, sunEffect in chunks:
+            yield self.getCurrentArray(ta, airVelocity, sunEffect)
+    
+    def iterCurrents(self, records):
+        """Yields lowest current [ampere] for each record
+        records : Iterable of (ta, airVelocity, sunEffect) records
+        Records are read and rated chunkSize at a time
+        """
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self._chunkSize))
+            if not chunk:
+                return
+            data = np.array(chunk, dtype=float).reshape(len(chunk), 3)
+            yield from self.getCurrentArray(data[:, 0], data[:, 1], data[:, 2]).tolist()
+    
+    #-------------------------------------------------------------------------------------
+    # Properties
+    
+    @property
+    def table(self):
+        return self._table
+    
+    @property
+    def chunkSize(self):
+        return self._chunkSize
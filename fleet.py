@@ -0,0 +1,122 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .registry import LineRegistry, _rate
+
+#-----------------------------------------------------------------------------------------
+
+__all__ = ['FleetRating']
+
+#-----------------------------------------------------------------------------------------
+
+class FleetRating(object):
+    """Rates many OperatingTable instances over ambient temperatures with a process pool.
+    
+    Tables are stored in a LineRegistry, split in chunks of chunkSize and each chunk is
+    rated in a worker process with the vectorized formula of CurrentCalc.getCurrentArray. 
+    Only the arrays with the items of the chunk are sent to the workers. Results keep the
+    order of tables. Changes in tables or calculators after creation are not seen.
+    The pool is created on the first call and reused by the next ones until close. It can
+    be used as context manager to close the pool at the end, or a ProcessPoolExecutor 
+    can be given to share it (close does not shut it down).
+    
+    Read-only properties
+    tables     : Tuple of OperatingTable instances
+    registry   : LineRegistry instance with the tables
+    maxWorkers : Maximum number of processes (None: number of processors, 1: no pool)
+    chunkSize  : Number of tables for each task
+    executor   : Executor used for the tasks or None before the first call
+    
+    """
+    
+    __slots__ = ('_tables', '_registry', '_maxWorkers', '_chunkSize', '_executor', 
+                 '_ownExecutor')
+    
+    def __init__(self, tables, maxWorkers=None, chunkSize=64, executor=None):
+        """
+        tables     : Iterable of OperatingTable instances
+        maxWorkers : Maximum number of processes (None: number of processors, 1: no pool)
+        chunkSize  : Number of tables for each task
+        executor   : Optional. Executor to use instead of an own pool, maxWorkers is not
+                     used to create the pool
+        """
+        if maxWorkers is not None and maxWorkers < 1: raise ValueError("maxWorkers < 1")
+        if chunkSize < 1: raise ValueError("chunkSize < 1")
+        
+        self._tables = tuple(tables)
+        self._registry = LineRegistry(self._tables)
+        self._maxWorkers = maxWorkers
+        self._chunkSize = chunkSize
+        self._executor = executor
+        self._ownExecutor = False
+    
+    #-------------------------------------------------------------------------------------
+    # Public methods
+    
+    def getCurrentArray(self, ta):
+        """Returns array of lowest currents [ampere] with shape (len(tables), len(ta))
+        ta : Ambient temperatures [°C] (1-D array_like)
+        """
+        ta = self._registry._checkTa(ta)
+        tasks = list(self._tasks(ta))
+        if len(tasks) < 2 or (self._maxWorkers == 1 and self._executor is None):
+            results = [_rate(*task) for task in tasks]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self._maxWorkers)
+                self._ownExecutor = True
+            results = list(self._executor.map(_rate, *zip(*tasks)))
+        
+        if not results:
+            return np.empty((0, ta.size))
+        return np.concatenate(results)
+    
+    def close(self):
+        """Shuts down the pool created by the instance. A new one is created if needed"""
+        if self._ownExecutor:
+            self._executor.shutdown()
+            self._executor = None
+            self._ownExecutor = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    #-------------------------------------------------------------------------------------
+    # Private methods
+    
+    def _tasks(self, ta):
+        # Yields (params, offsets, ta) for each chunk of tables
+        registry = self._registry
+        for i in range(0, len(self._tables), self._chunkSize):
+            j = min(i + self._chunkSize, len(self._tables))
+            offsets = registry.offsets[i:j + 1]
+            yield registry._getParams(i, j), offsets - offsets[0], ta
+    
+    #-------------------------------------------------------------------------------------
+    # Properties
+    
+    @property
+    def tables(self):
+        return self._tables
+    
+    @property
+    def registry(self):
+        return self._registry
+    
+    @property
+    def maxWorkers(self):
+        return self._maxWorkers
+    
+    @property
+    def chunkSize(self):
+        return self._chunkSize
+    
+    @property
+    def executor(self):
+        return self._executor
@@ -1,6 +1,10 @@
 # CRISTIAN ECHEVERRÍA RABÍ
 
-from .constants import (TC_MIN, TC_MAX)
+from bisect import bisect_right
+
+import numpy as np
+
+from .constants import (TA_MIN, TA_MAX, TC_MIN, TC_MAX)
 
 #-----------------------------------------------------------------------------------------
 
@@ -8,6 +12,11 @@ __all__ = ['OperatingItem', 'OperatingTable']
 
 #-----------------------------------------------------------------------------------------
 
+_CURVE_NODES_MAX = 1000000     # Maximum number of curve nodes
+_CURVE_STEP_MIN = 1e-6         # Minimum interval between curve nodes [°C]
+
+#-----------------------------------------------------------------------------------------
+
 class OperatingItem(object):
     """Container for conductor and operating conditions
     
@@ -42,6 +51,12 @@ class OperatingItem(object):
         """
         return self._currentcalc.getCurrent(ta, self._tempMaxOp) * self._nsc
     
+    def getCurrentArray(self, ta):
+        """Returns array of currents for the OperatingItem [ampere]
+        ta : Ambient temperatures [°C] (array_like)
+        """
+        return self._currentcalc.getCurrentArray(ta, self._tempMaxOp) * self._nsc
+    
     #--------------------------------------------------------------------------
     # Properties
     
@@ -60,23 +75,76 @@ class OperatingItem(object):
 
 #-----------------------------------------------------------------------------------------
 
+class _ItemList(list):
+    # List of OperatingItem instances of an OperatingTable. Changes drop the results 
+    # stored by the table
+    
+    __slots__ = ('_table',)
+    
+    def __init__(self, table):
+        list.__init__(self)
+        self._table = table
+    
+    def __reduce__(self):
+        # Copied as list, OperatingTable binds its copy
+        return (list, (list(self),))
+
+def _invalidating(name):
+    # Returns list method name calling OperatingTable._invalidate after the change
+    method = getattr(list, name)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._table._invalidate()
+        return result
+    wrapper.__name__ = name
+    return wrapper
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(_ItemList, _name, _invalidating(_name))
+
+#-----------------------------------------------------------------------------------------
+
 class OperatingTable(object):
     """Object to store OperatingItem instances and calculates current.
     
+    Items with the same CurrentCalc instance and tempMaxOp are calculated once. After
+    buildBreakpoints, getCurrent calculates only the limiting item until items or their
+    CurrentCalc settings change. Changes in items list and in CurrentCalc settings drop
+    the stored results when they happen, so queries do not check the items.
+    With curveTolerance, getCurrent and getCurrentArray interpolate on a piecewise linear
+    curve of current versus ta, built when needed and rebuilt after changes in items or
+    their CurrentCalc settings. Nodes are added until the error at the middle of each 
+    interval is below curveTolerance/2 or the interval is below 1e-6 °C (steps of current).
+    
     Read-only properties
-    idx : Optional database key
-    items: List of OperatingItem instances
+    idx         : Optional database key
+    items       : List of OperatingItem instances
+    breakpoints : Tuple of ambient temperatures where the limiting item changes [°C] or
+                  None if not built or outdated
+    
+    Read-write properties
+    curveTolerance : Maximum error of interpolated current [ampere] or None to use exact
+                     calculation = None
     
     """
 
-    __slots__ = ('_idx', '_items')
+    __slots__ = ('_idx', '_items', '_plan', '_calcs', '_breaks', '_binding', 
+                 '_curveTolerance', '_curveTas', '_curveAmps', '__weakref__')
 
     def __init__(self, idx=None):
         """
         idx   : Database key
         """
-        self._items = []
+        self._items = _ItemList(self)
         self._idx = idx
+        self._plan = None
+        self._calcs = set()
+        self._breaks = None
+        self._binding = None
+        self._curveTolerance = None
+        self._curveTas = None
+        self._curveAmps = None
     
     #-------------------------------------------------------------------------------------
 
@@ -84,12 +152,190 @@ class OperatingTable(object):
         """Returns lowest current for the OperatingItems contained [ampere]
         ta : Ambient temperature [°C]
         """
+        if self._curveTolerance is not None and TA_MIN <= ta <= TA_MAX:
+            if self._curveTas is None:
+                self._buildCurve()
+            tas = self._curveTas
+            amps = self._curveAmps
+            k = min(bisect_right(tas, ta), len(tas) - 1)
+            return amps[k - 1] + (ta - tas[k - 1])*(amps[k] - amps[k - 1])/(tas[k] - tas[k - 1])
+        
+        if self._breaks is not None:
+            k = self._binding[bisect_right(self._breaks, ta)]
+            if k < 0:
+                return 100000
+            return self._items[k].getCurrent(ta)
+        
         minimo = 100000
-        for item in self._items:
-            amp = item.getCurrent(ta)
-            if amp < minimo: minimo = amp
+        for currentcalc, tempMaxOp, positions, nscs in self._getPlan():
+            amp = currentcalc.getCurrent(ta, tempMaxOp)
+            for nsc in nscs:
+                if amp*nsc < minimo: minimo = amp*nsc
         return minimo
     
+    def getCurrentArray(self, ta, airVelocity=None, sunEffect=None):
+        """Returns array of lowest currents for the OperatingItems contained [ampere]
+        ta          : Ambient temperatures [°C] (array_like)
+        airVelocity : Velocities of air stream [ft/seg] (array_like) or None to use the 
+                      airVelocity of each CurrentCalc
+        sunEffect   : Sun effect factors (0 to 1) (array_like) or None to use the sunEffect
+                      of each CurrentCalc
+        Arguments must be broadcastable. With airVelocity or sunEffect the curve is not 
+        used and calculators are not modified (see CurrentCalc.getCurrentArray).
+        """
+        if airVelocity is not None or sunEffect is not None:
+            shape = np.broadcast_shapes(*[np.shape(x) for x in (ta, airVelocity, sunEffect) 
+                                          if x is not None])
+            minimo = np.full(shape, 100000.0)
+            for currentcalc, tempMaxOp, positions, nscs in self._getPlan():
+                amps = currentcalc.getCurrentArray(ta, tempMaxOp, airVelocity, sunEffect)
+                for nsc in nscs:
+                    np.minimum(minimo, amps*nsc, out=minimo)
+            return minimo
+        
+        if self._curveTolerance is not None:
+            ta = np.asarray(ta, dtype=float)
+            if ta.size == 0 or (ta.min() >= TA_MIN and ta.max() <= TA_MAX):
+                if self._curveTas is None:
+                    self._buildCurve()
+                return np.interp(ta, self._curveTas, self._curveAmps)
+        return self.getLimitArray(ta)[0]
+    
+    def getLimitArray(self, ta):
+        """Returns (currents, index) arrays: lowest current for the OperatingItems 
+        contained [ampere] and position in items of the limiting OperatingItem, -1 if no
+        item has current below 100000 (as getCurrent)
+        ta : Ambient temperatures [°C] (array_like)
+        """
+        ta = np.asarray(ta, dtype=float)
+        if not self._items:
+            return np.full(ta.shape, 100000.0), np.full(ta.shape, -1, dtype=np.intp)
+        
+        amps = np.empty((len(self._items),) + ta.shape)
+        for currentcalc, tempMaxOp, positions, nscs in self._getPlan():
+            amp = currentcalc.getCurrentArray(ta, tempMaxOp)
+            amps[positions] = amp*np.array(nscs).reshape((-1,) + (1,)*ta.ndim)
+        index = amps.argmin(axis=0)                    # Primer mínimo, como getCurrent
+        minimo = np.take_along_axis(amps, index[None], axis=0)[0]
+        limit = minimo < 100000
+        return np.where(limit, minimo, 100000.0), np.where(limit, index, -1)
+    
+    def buildBreakpoints(self, step=0.5, deltaTemp=0.001):
+        """Calculates and returns list of ambient temperatures in [TA_MIN, TA_MAX] where the
+        limiting item changes [°C]
+        step      : Sampling step [°C]. Changes closer than step may be missed
+        deltaTemp : Precision of breakpoints [°C]
+        Until items or their CurrentCalc settings change, getCurrent finds the limiting
+        item with a binary search and calculates only that one. Within deltaTemp of a 
+        breakpoint the current of either item can be returned.
+        """
+        if step <= 0: raise ValueError("step <= 0")
+        if deltaTemp <= 0: raise ValueError("deltaTemp <= 0")
+        
+        tas = np.linspace(TA_MIN, TA_MAX, int(np.ceil((TA_MAX - TA_MIN)/step)) + 1)
+        index = self.getLimitArray(tas)[1]
+        breaks = []
+        binding = [int(index[0])]
+        for k in np.flatnonzero(index[1:] != index[:-1]):
+            # Bisección entre muestras con distinto item limitante
+            Tmin = tas[k]
+            Tmax = tas[k + 1]
+            while (Tmax - Tmin) > deltaTemp:
+                Tmed = 0.5*(Tmin + Tmax)
+                if self.getLimitArray(Tmed)[1] == index[k]:
+                    Tmin = Tmed
+                else:
+                    Tmax = Tmed
+            breaks.append(float(0.5*(Tmin + Tmax)))
+            binding.append(int(index[k + 1]))
+        
+        self._breaks = breaks
+        self._binding = binding
+        return list(breaks)
+    
+    def __getstate__(self):
+        # Stored results are not copied, the copy registers in its CurrentCalc instances
+        # on the first query
+        return {'_idx': self._idx, '_items': list(self._items), 
+                '_curveTolerance': self._curveTolerance}
+    
+    def __setstate__(self, state):
+        self.__init__(state['_idx'])
+        self._items.extend(state['_items'])
+        self._curveTolerance = state['_curveTolerance']
+    
+    #-------------------------------------------------------------------------------------
+    # Private methods
+    
+    def _getPlan(self):
+        # Returns list of (currentcalc, tempMaxOp, positions, nscs), grouping the items
+        # with the same CurrentCalc instance and tempMaxOp, so each group is calculated once.
+        # Rebuilt after changes, the table is registered in the CurrentCalc instances to
+        # be notified of their changes
+        if self._plan is None:
+            groups = {}
+            for k, item in enumerate(self._items):
+                positions, nscs = groups.setdefault((item.currentcalc, item.tempMaxOp), ([], []))
+                positions.append(k)
+                nscs.append(item.nsc)
+            calcs = set([cc for cc, tc in groups])
+            for cc in self._calcs - calcs:
+                cc._tables.discard(self)
+            for cc in calcs:
+                cc._tables.add(self)
+            self._calcs = calcs
+            self._plan = [(cc, tc, pos, nscs) for (cc, tc), (pos, nscs) in groups.items()]
+        return self._plan
+    
+    def _buildCurve(self):
+        # Builds tas, amps lists with nodes of piecewise linear curve
+        tol = self._curveTolerance
+        tas = np.linspace(TA_MIN, TA_MAX, 181)
+        amps = self.getLimitArray(tas)[0]
+        
+        # Nodos donde la corriente llega a cero, la curva no es suave en ese punto
+        zeros = []
+        for k in np.flatnonzero((amps[:-1] > 0) & (amps[1:] <= 0)):
+            Tmin = tas[k]
+            Tmax = tas[k + 1]
+            while (Tmax - Tmin) > 1e-9:
+                Tmed = 0.5*(Tmin + Tmax)
+                if self.getLimitArray(Tmed)[0] > 0:
+                    Tmin = Tmed
+                else:
+                    Tmax = Tmed
+            zeros.append(Tmax)
+        tas = np.concatenate((tas, zeros))
+        amps = np.concatenate((amps, np.zeros(len(zeros))))
+        order = tas.argsort()
+        tas = tas[order]
+        amps = amps[order]
+        
+        while True:
+            if len(tas) > _CURVE_NODES_MAX:
+                raise RuntimeError("OperatingTable: N° curve nodes > %d" % _CURVE_NODES_MAX)
+            mid = 0.5*(tas[:-1] + tas[1:])
+            exact = self.getLimitArray(mid)[0]
+            split = abs(0.5*(amps[:-1] + amps[1:]) - exact) > 0.5*tol
+            split &= (tas[1:] - tas[:-1]) > _CURVE_STEP_MIN
+            if not split.any():
+                break
+            tas = np.concatenate((tas, mid[split]))
+            amps = np.concatenate((amps, exact[split]))
+            order = tas.argsort()
+            tas = tas[order]
+            amps = amps[order]
+        self._curveTas = tas.tolist()
+        self._curveAmps = amps.tolist()
+    
+    def _invalidate(self):
+        # Items or their CurrentCalc settings changed, drops plan, breakpoints and curve
+        self._plan = None
+        self._breaks = None
+        self._binding = None
+        self._curveTas = None
+        self._curveAmps = None
+    
     #--------------------------------------------------------------------------
     # Properties
     
@@ -99,4 +345,21 @@ class OperatingTable(object):
     
     @property
     def items(self):
-        return self._items
\ No newline at end of file
+        return self._items
+    
+    @property
+    def curveTolerance(self):
+        return self._curveTolerance
+    
+    @curveTolerance.setter
+    def curveTolerance(self, v):
+        if v is not None and v <= 0: raise ValueError("curveTolerance <= 0")
+        self._curveTolerance = v
+        self._curveTas = None
+        self._curveAmps = None
+    
+    @property
+    def breakpoints(self):
+        if self._breaks is None:
+            return None
+        return tuple(self._breaks)
\ No newline at end of file
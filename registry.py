@@ -0,0 +1,228 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+import numpy as np
+
+from .catalog import ConductorCatalog
+from .constants import TA_MIN, TA_MAX
+from .currentcalc import _balanceArray, _heatTerms
+
+#-----------------------------------------------------------------------------------------
+
+__all__ = ['LineRegistry']
+
+#-----------------------------------------------------------------------------------------
+
+_BLOCK_SIZE = 1000000     # Maximum number of item x ta values calculated together
+
+#-----------------------------------------------------------------------------------------
+
+def _rate(params, offsets, ta):
+    # Returns lowest currents [ampere] with shape (len(offsets) - 1, len(ta)) for tables
+    # with items in rows of params (see LineRegistry._getParams) and offsets[k]:offsets[k + 1]
+    # the rows of table k. Only arrays are used, so it can run in worker processes
+    nt = len(offsets) - 1
+    out = np.full((nt, len(ta)), 100000.0)
+    if len(params) == 0:
+        return out
+    
+    diameter, r25, alpha, altitude, airVelocity, sunEffect, emissivity, formula, tc, nsc = \
+        [col[:, None] for col in params.T]
+    D, D75, Pb, V, Qr0, Qs = _heatTerms(diameter, altitude, airVelocity, sunEffect, emissivity)
+    
+    # Cada fórmula se calcula por separado (criterio común en _balanceArray)
+    g = np.empty((len(params), len(ta)))
+    for f in np.unique(formula):
+        k = formula[:, 0] == f
+        g[k] = _balanceArray(ta, tc[k], D[k], D75[k], r25[k], alpha[k], Pb[k], V[k], Qr0[k],
+                             Qs[k], int(f))
+    with np.errstate(invalid='ignore'):
+        amps = np.sqrt(np.maximum(np.where(ta < tc, g, 0.0), 0.0))*nsc
+    
+    # Mínimo por tabla, las tablas sin items quedan con 100000
+    full = offsets[1:] > offsets[:-1]
+    out[full] = np.minimum(np.minimum.reduceat(amps, offsets[:-1][full], axis=0), 100000.0)
+    return out
+
+#-----------------------------------------------------------------------------------------
+
+class LineRegistry(object):
+    """Columnar storage of many OperatingTable instances.
+    
+    Items of all tables are stored in flat arrays, with conductors in a ConductorCatalog
+    and the CurrentCalc settings copied for each item. Items of table k are the rows
+    offsets[k]:offsets[k + 1]. Currents are calculated for all tables together with the
+    vectorized formula of CurrentCalc.getCurrentArray. Changes in tables or calculators
+    after creation are not seen.
+    
+    Read-only properties
+    idxs        : Tuple of OperatingTable.idx values
+    catalog     : ConductorCatalog instance with the conductors of items
+    offsets     : First item of each table, and number of items at the end (array)
+    conductor   : Position of item conductor in catalog (array)
+    tempMaxOp   : Maximum operating temperatures of items [°C] (array)
+    nsc         : Number of subconductors of items (array)
+    altitude    : CurrentCalc altitude of items [m] (array)
+    airVelocity : CurrentCalc airVelocity of items [ft/seg] (array)
+    sunEffect   : CurrentCalc sunEffect of items (array)
+    emissivity  : CurrentCalc emissivity of items (array)
+    formula     : CurrentCalc formula of items (array)
+    
+    """
+    
+    __slots__ = ('_idxs', '_positions', '_catalog', '_offsets', '_conductor', '_tempMaxOp',
+                 '_nsc', '_altitude', '_airVelocity', '_sunEffect', '_emissivity', '_formula')
+    
+    def __init__(self, tables):
+        """
+        tables : Iterable of OperatingTable instances. idx values other than None must be
+                 unique
+        """
+        idxs = []
+        positions = {}
+        conductors = {}
+        offsets = [0]
+        rows = []
+        for table in tables:
+            if table.idx is not None:
+                if table.idx in positions: raise ValueError("duplicated idx %r" % (table.idx,))
+                positions[table.idx] = len(idxs)
+            idxs.append(table.idx)
+            for item in table.items:
+                cc = item.currentcalc
+                cond = conductors.setdefault(id(cc.conductor), (len(conductors), cc.conductor))
+                rows.append((cond[0], item.tempMaxOp, item.nsc, cc.altitude, cc.airVelocity,
+                             cc.sunEffect, cc.emissivity, cc.formula))
+            offsets.append(len(rows))
+        
+        cols = np.array(rows, dtype=float).reshape(len(rows), 8).T
+        self._idxs = tuple(idxs)
+        self._positions = positions
+        self._catalog = ConductorCatalog([c for k, c in conductors.values()])
+        self._offsets = np.array(offsets, dtype=np.intp)
+        self._conductor = cols[0].astype(np.intp)
+        self._tempMaxOp = cols[1].copy()
+        self._nsc = cols[2].astype(int)
+        self._altitude = cols[3].copy()
+        self._airVelocity = cols[4].copy()
+        self._sunEffect = cols[5].copy()
+        self._emissivity = cols[6].copy()
+        self._formula = cols[7].astype(int)
+        for arr in (self._offsets, self._conductor, self._tempMaxOp, self._nsc, self._altitude,
+                    self._airVelocity, self._sunEffect, self._emissivity, self._formula):
+            arr.flags.writeable = False
+    
+    #-------------------------------------------------------------------------------------
+    # Public methods
+    
+    def getPosition(self, idx):
+        """Returns position of table with OperatingTable.idx = idx
+        idx : Database key
+        """
+        return self._positions[idx]
+    
+    def getCurrent(self, ta):
+        """Returns array of lowest currents of each table [ampere]
+        ta : Ambient temperature [°C] or 1-D array_like of temperatures
+        Shape of result is (len(registry),) for one temperature or (len(registry), len(ta))
+        """
+        tas = self._checkTa(ta)
+        out = np.empty((len(self._idxs), tas.size))
+        for start, stop in self._blocks(0, len(self._idxs), tas.size):
+            out[start:stop] = self._getCurrent(start, stop, tas)
+        return out[:, 0] if np.ndim(ta) == 0 else out
+    
+    def getTableCurrent(self, idx, ta):
+        """Returns lowest current of table with OperatingTable.idx = idx [ampere]
+        idx : Database key
+        ta  : Ambient temperature [°C] or 1-D array_like of temperatures
+        """
+        k = self._positions[idx]
+        tas = self._checkTa(ta)
+        out = self._getCurrent(k, k + 1, tas)[0]
+        return float(out[0]) if np.ndim(ta) == 0 else out
+    
+    def __len__(self):
+        return len(self._idxs)
+    
+    #-------------------------------------------------------------------------------------
+    # Private methods
+    
+    def _checkTa(self, ta):
+        # Returns ta as 1-D float array after range checks
+        tas = np.asarray(ta, dtype=float).reshape(-1)
+        if tas.size > 0:
+            if tas.min() < TA_MIN: raise ValueError("ta < TA_MIN")
+            if tas.max() > TA_MAX: raise ValueError("ta > TA_MAX")
+        return tas
+    
+    def _blocks(self, start, stop, nta, size=_BLOCK_SIZE):
+        # Yields (start, stop) ranges of tables with about size/nta items
+        offsets = self._offsets
+        while start < stop:
+            limit = offsets[start] + max(size//max(nta, 1), 1)
+            end = min(max(int(np.searchsorted(offsets, limit, 'right')) - 1, start + 1), stop)
+            yield start, end
+            start = end
+    
+    def _getParams(self, start, stop):
+        # Returns params of _rate for items of tables start:stop
+        i = self._offsets[start]
+        j = self._offsets[stop]
+        cat = self._catalog
+        cond = self._conductor[i:j]
+        return np.column_stack((cat.diameter[cond], cat.r25[cond], cat.alpha[cond],
+                                self._altitude[i:j], self._airVelocity[i:j],
+                                self._sunEffect[i:j], self._emissivity[i:j],
+                                self._formula[i:j], self._tempMaxOp[i:j], self._nsc[i:j]))
+    
+    def _getCurrent(self, start, stop, tas):
+        # Lowest currents of tables start:stop for 1-D array tas
+        offsets = self._offsets[start:stop + 1]
+        return _rate(self._getParams(start, stop), offsets - offsets[0], tas)
+    
+    #-------------------------------------------------------------------------------------
+    # Properties
+    
+    @property
+    def idxs(self):
+        return self._idxs
+    
+    @property
+    def catalog(self):
+        return self._catalog
+    
+    @property
+    def offsets(self):
+        return self._offsets
+    
+    @property
+    def conductor(self):
+        return self._conductor
+    
+    @property
+    def tempMaxOp(self):
+        return self._tempMaxOp
+    
+    @property
+    def nsc(self):
+        return self._nsc
+    
+    @property
+    def altitude(self):
+        return self._altitude
+    
+    @property
+    def airVelocity(self):
+        return self._airVelocity
+    
+    @property
+    def sunEffect(self):
+        return self._sunEffect
+    
+    @property
+    def emissivity(self):
+        return self._emissivity
+    
+    @property
+    def formula(self):
+        return self._formula
@@ -1,12 +1,49 @@
 # CRISTIAN ECHEVERRÍA RABÍ
 
 import math
+from concurrent.futures import ProcessPoolExecutor
 
-from .constants import (TA_MIN, TA_MAX, TC_MAX, ITER_MAX)
+import numpy as np
+
+from .constants import (SV_BISECTION, SV_BRENT, TA_MIN, TA_MAX, TC_MIN, TC_MAX, ITER_MAX,
+                         TI_EULER, TI_RK4, TI_ADAPTIVE)
+from .currentcalc import _brent
+
+try:
+    # Euler loop compiled in zx, optional
+    from .zx.zx import fillEuler as _fillEuler
+except ImportError:
+    _fillEuler = None
+
+#-----------------------------------------------------------------------------------------
+
+__all__ = ['TcTimeCalc', 'TcTimeData', 'TcTimeState']
 
 #-----------------------------------------------------------------------------------------
 
-__all__ = ['TcTimeCalc', 'TcTimeData']
+def _iciniRow(scc, tcx, lapses, factors, prev=None):
+    # Returns array (len(lapses), len(factors)) with Icini for scc.ta. With SV_BRENT each 
+    # cell starts from the linear extrapolation of the results of near cells: prev (array
+    # with rows of previous ta values, the last one first) or previous lapses
+    out = np.empty((len(lapses), len(factors)))
+    for j, lapse in enumerate(lapses):
+        for k, factor in enumerate(factors):
+            if scc.solver != SV_BRENT:
+                out[j, k] = scc.getIcini(tcx, factor, lapse)
+                continue
+            if prev is not None and len(prev) > 1:
+                guess = 2*prev[0][j, k] - prev[1][j, k]
+            elif prev is not None:
+                guess = prev[0][j, k]
+            elif j > 1:
+                guess = out[j - 1, k] + (out[j - 1, k] - out[j - 2, k])*(
+                        (lapse - lapses[j - 1])/(lapses[j - 1] - lapses[j - 2]))
+            elif j > 0:
+                guess = out[j - 1, k]
+            else:
+                guess = None
+            out[j, k] = scc._getIciniBrent(tcx, factor, lapse, guess)
+    return out
 
 #-----------------------------------------------------------------------------------------
 
@@ -18,13 +55,29 @@ class TcTimeCalc(object):
     icmax       : Maximum current (varies with the value of ta)
     
     Read-write properties
-    ta        : Ambient temperature [°C]
-    timeStep  : Time step for iterations (o to 60) [seconds]
-    deltaIc   : Current difference to determine equality [ampere] = 0.01
+    ta         : Ambient temperature [°C]
+    timeStep   : Time step for iterations (o to 60) [seconds]
+    deltaIc    : Current difference to determine equality [ampere] = 0.01
+    integrator : Integration method for getData = TI_EULER
+    tolerance  : Temperature error allowed in each TI_ADAPTIVE step [°C] = 0.001
+    steadyDelta: Temperature change in a timeStep to stop integration [°C] or None to 
+                 integrate all the lapse = None
+    solver     : Root finding method for getIcini and getIcfin = SV_BISECTION
+    
+    With TI_EULER and TI_RK4 the integration steps are timeStep. With TI_ADAPTIVE the
+    steps are adjusted to tolerance, independent of timeStep, and the values each 
+    timeStep are interpolated (dense output).
+    With steadyDelta, when the change of temperature in a timeStep is below steadyDelta
+    the remaining values are the equilibrium temperature currentcalc.getTc(ta, icfin),
+    the limit of the steps within currentcalc.deltaTemp.
+    With SV_BRENT, getIcini and getIcfin find the root of the temperature riched at
+    lapse with Brent method and evaluate only the bisection steps near it, so results 
+    are the ones of SV_BISECTION (within deltaIc) with about half the evaluations.
     
     """
 
-    __slots__ = ('_currentcalc', '_ta', '_icmax', '_timeStep', '_deltaIc')
+    __slots__ = ('_currentcalc', '_ta', '_icmax', '_timeStep', '_deltaIc', '_integrator',
+                 '_tolerance', '_steadyDelta', '_solver')
     
     def __init__(self, currentcalc, ta):
         """
@@ -38,6 +91,10 @@ class TcTimeCalc(object):
         self.ta = ta
         self._timeStep  = 1.0
         self._deltaIc   = 0.01
+        self._integrator = TI_EULER
+        self._tolerance = 0.001
+        self._steadyDelta = None
+        self._solver = SV_BISECTION
     
     #-------------------------------------------------------------------------------------
     # Public methods
@@ -69,19 +126,112 @@ class TcTimeCalc(object):
         if lapse <= 0: raise ValueError("lapse <= 0")
         
         npasos = int(math.ceil(lapse/self._timeStep)) + 1
-        times = [(timex + x*self._timeStep) for x in range(npasos)]
+        temps = self._integrateArray(tcx, icfin, npasos)
+        return TcTimeData.fromSteps(temps, self._timeStep, timex)
+    
+    def getDataArray(self, tcx, icfin, lapse, timex=0):
+        """Returns (times, temps) arrays with the values of getData [seconds], [°C]
+        Same arguments that getData
+        With TI_EULER, without steadyDelta and surface, the steps run in the compiled
+        loop of zx when it is available.
+        """
+        if icfin < 0: raise ValueError("icfin < 0")
+        if icfin > self._icmax: raise ValueError("icfin > icmax (ta)")
+        if lapse <= 0: raise ValueError("lapse <= 0")
         
-        K = 0.86/3600*self._timeStep/self._currentcalc.conductor.hcap
-        temp = tcx
-        sal = []
-        for tiempo in times:
-            sal.append((tiempo, temp))
-            Rtemp = self.getResistance(temp)*.0003048  # Resistencia Ohm/pie
-            Itemp = self.getCurrent(temp)
-            deltatemp = K*Rtemp*(icfin**2 - Itemp**2)
-            temp = temp + deltatemp
-        return TcTimeData(sal)
+        npasos = int(math.ceil(lapse/self._timeStep)) + 1
+        times = timex + np.arange(npasos)*self._timeStep
+        temps = self._integrateArray(tcx, icfin, npasos)
+        return times, temps
+    
+    def getFinalTc(self, tcx, icfin, lapse):
+        """Returns conductor temperature riched at lapse [°C], the value of
+        getData(tcx, icfin, lapse).getTc(lapse) without building the secuence
+        Same arguments that getData
+        """
+        if icfin < 0: raise ValueError("icfin < 0")
+        if icfin > self._icmax: raise ValueError("icfin > icmax (ta)")
+        if lapse <= 0: raise ValueError("lapse <= 0")
+        
+        npasos = int(math.ceil(lapse/self._timeStep)) + 1
+        v0, v1 = self._getFinal(tcx, icfin, npasos)
+        t0 = (npasos - 2)*self._timeStep
+        t1 = (npasos - 1)*self._timeStep
+        return (lapse - t0)*(v1 - v0)/(t1 - t0) + v0
+    
+    def getScheduleData(self, tcx, times, currents, tas=None):
+        """Returns TcTimeData instance for a load schedule of constant currents
+        tcx      : Conductor temperature at times[0] [°C]
+        times    : Limits of the schedule intervals [seconds] (len(currents) + 1 values)
+        currents : Current during each interval [ampere] (array_like)
+        tas      : Optional. Ambient temperature during each interval [°C] (array_like)
+                   If None ta is used for all intervals.
+        Values start at times[0] each timeStep until times[-1] or the next timeStep.
+        With TI_EULER and TI_RK4 each step uses the current of the interval where it
+        starts. With TI_ADAPTIVE each interval is integrated up to its limits, the
+        fastest option for long schedules with long intervals.
+        """
+        times = np.asarray(times, dtype=float).reshape(-1)
+        currents = np.asarray(currents, dtype=float).reshape(-1)
+        n = len(currents)
+        if n < 1: raise ValueError("len(currents) < 1")
+        if len(times) != n + 1: raise ValueError("len(times) != len(currents) + 1")
+        if np.any(np.diff(times) <= 0): raise ValueError("times not increasing")
+        if tas is None:
+            tas = np.full(n, self._ta)
+        else:
+            tas = np.asarray(tas, dtype=float).reshape(-1)
+            if len(tas) != n: raise ValueError("len(tas) != len(currents)")
+            if tas.min() < TA_MIN: raise ValueError("ta < TA_MIN")
+            if tas.max() > TA_MAX: raise ValueError("ta > TA_MAX")
+        if currents.min() < 0: raise ValueError("icfin < 0")
+        icmax = {ta: self._currentcalc.getCurrent(ta, TC_MAX) for ta in set(tas.tolist())}
+        if any(ic > icmax[ta] for ic, ta in zip(currents.tolist(), tas.tolist())):
+            raise ValueError("icfin > icmax (ta)")
+        
+        step = self._timeStep
+        bounds = times - times[0]
+        npasos = int(math.ceil(bounds[-1]/step)) + 1
+        if self._integrator == TI_ADAPTIVE:
+            temps = self._scheduleAdaptive(tcx, bounds, currents, tas, npasos)
+        else:
+            temps = self._scheduleFixed(tcx, bounds, currents, tas, npasos)
+        return TcTimeData.fromSteps(temps, step, times[0])
 
+    def getAdiabaticTc(self, tcx, ic, t):
+        """Returns conductor temperature [°C] after t seconds with current ic without heat
+        exchange with the air (short-circuit heating)
+        tcx : Conductor temperature at t = 0 [°C]
+        ic  : Current [ampere] (array_like)
+        t   : Time [seconds] (array_like)
+        Resistance changes linearly with alpha as in getResistance and the temperature 
+        rise is solved exactly. ic and t are broadcast, values are not limited to TC_MAX.
+        """
+        ic, t = self._checkAdiabatic(tcx, ic, t)
+        cc = self._currentcalc
+        alpha = cc._alpha
+        c = alpha*0.86/3600/cc.conductor.hcap*cc._r25*.0003048
+        tc = 25 + ((1 + alpha*(tcx - 25))*np.exp(c*ic**2*t) - 1)/alpha
+        return float(tc) if tc.ndim == 0 else tc
+    
+    def getAdiabaticTime(self, tcx, ic, tc):
+        """Returns time [seconds] to rich tc with current ic without heat exchange with 
+        the air, inverse of getAdiabaticTc
+        tcx : Conductor temperature at t = 0 [°C]
+        ic  : Current [ampere] (array_like)
+        tc  : Conductor temperature to rich [°C] (array_like)
+        Returns 0 for tc <= tcx (also with ic = 0) and inf for ic = 0 and tc > tcx.
+        """
+        ic, tc = self._checkAdiabatic(tcx, ic, tc, "tc")
+        cc = self._currentcalc
+        alpha = cc._alpha
+        c = alpha*0.86/3600/cc.conductor.hcap*cc._r25*.0003048
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.log((1 + alpha*(tc - 25))/(1 + alpha*(tcx - 25)))/(c*ic**2)
+        # Sin corriente no se alcanza tc > tcx
+        t = np.where(tc > tcx, np.where(ic > 0, t, np.inf), 0.0)
+        return float(t) if t.ndim == 0 else t
+    
     def getIcini(self, tcx, factor, lapse):
         """Iterates and returns the initial current Icini [ampere] (before change)
         tcx     : Conductor temperature to rich after lapse [°C]
@@ -93,25 +243,46 @@ class TcTimeCalc(object):
         if factor <= 0: raise ValueError("factor <= 0")
         if lapse <= 0: raise ValueError("lapse <= 0")
         
-        ibmin = 0
-        ibmax = self._icmax/factor
-        cuenta = 0
-        while (ibmax - ibmin) > self._deltaIc:
-            ibmed = 0.5*(ibmin + ibmax)
-            tmed = self.getTc(ibmed)
-            perfil = self.getData(tmed, ibmed*factor, lapse+self._timeStep, timex=0)
-            tc = perfil.getTc(lapse)
-            
-            if tc > tcx:
-                ibmax = ibmed
-            else:
-                ibmin = ibmed
-            
-            cuenta = cuenta + 1
-            if cuenta > ITER_MAX:
-                err_msg = "getIfin: Nº iterations > %d" % ITER_MAX
-                raise RuntimeError(err_msg)
-        return ibmed
+        if self._solver == SV_BRENT:
+            return self._getIciniBrent(tcx, factor, lapse)
+        func = self._getIciniFunc(tcx, factor, lapse)
+        return self._bisectCurrent(func, 0, self._icmax/factor)
+
+    def getIciniTable(self, tcx, tas, lapses, factors, maxWorkers=1):
+        """Returns array of initial currents Icini [ampere] with shape
+        (len(tas), len(lapses), len(factors)), the values of getIcini for each ambient 
+        temperature, lapse and factor. Final currents are Icini*factor.
+        tcx        : Conductor temperature to rich after lapse [°C]
+        tas        : Ambient temperatures [°C] (1-D array_like)
+        lapses     : Time intervals to rich tcx [seconds] (1-D array_like)
+        factors    : Ifin/Iini values (1-D array_like)
+        maxWorkers : Maximum number of processes (None: number of processors, 1: no pool)
+        Cells are calculated with the settings of this instance, the values of getIcini.
+        With SV_BRENT each cell starts from the result of a near cell. With a pool each
+        process calculates the cells of one ambient temperature.
+        """
+        tas = np.asarray(tas, dtype=float).reshape(-1)
+        lapses = np.asarray(lapses, dtype=float).reshape(-1)
+        factors = np.asarray(factors, dtype=float).reshape(-1)
+        if maxWorkers is not None and maxWorkers < 1: raise ValueError("maxWorkers < 1")
+        if tcx > TC_MAX: raise ValueError("tcx > TC_MAX")
+        if tas.size > 0 and tcx <= tas.max(): raise ValueError("tcx <= ta")
+        if factors.size > 0 and factors.min() <= 0: raise ValueError("factor <= 0")
+        if lapses.size > 0 and lapses.min() <= 0: raise ValueError("lapse <= 0")
+        
+        sccs = [self._copy(ta) for ta in tas]
+        out = np.empty((len(tas), len(lapses), len(factors)))
+        if maxWorkers == 1 or len(tas) < 2:
+            for i, scc in enumerate(sccs):
+                prev = out[i - 1::-1][:2] if i > 0 else None
+                out[i] = _iciniRow(scc, tcx, lapses, factors, prev)
+        else:
+            n = len(tas)
+            with ProcessPoolExecutor(maxWorkers) as executor:
+                rows = executor.map(_iciniRow, sccs, [tcx]*n, [lapses]*n, [factors]*n)
+                for i, row in enumerate(rows):
+                    out[i] = row
+        return out
 
     def getIcfin(self, tcx, icini, lapse, tcxini=None):
         """Iterates and returns the final current Ifin [ampere] (after change)
@@ -142,13 +313,114 @@ class TcTimeCalc(object):
             ibmin = 0.0
             ibmax = icini
         
+        func = lambda ib: self.getFinalTc(tcxini, ib, lapse) - tcx
+        near = None
+        if self._solver == SV_BRENT:
+            # Tc riched no sobrepasa la temperatura de equilibrio de Icfin, luego Icfin
+            # es mayor que Ix (creciente) o menor que Ix, la corriente de equilibrio en tcx
+            ix = min(self.getCurrent(tcx), ibmax)
+            if tcx > Tini:
+                near = self._findCurrent(func, ibmin, ibmax, max(ix, ibmin), None)
+            else:
+                near = self._findCurrent(func, ibmin, ibmax, None, max(ix, ibmin))
+        return self._bisectCurrent(func, ibmin, ibmax, near)
+    
+    #-------------------------------------------------------------------------------------
+    # Private methods
+    
+    def _checkAdiabatic(self, tcx, ic, x, name="t"):
+        # Range checks of getAdiabaticTc and getAdiabaticTime, returns ic and x as arrays
+        if tcx < TC_MIN: raise ValueError("tcx < TC_MIN")
+        if tcx > TC_MAX: raise ValueError("tcx > TC_MAX")
+        ic = np.asarray(ic, dtype=float)
+        x = np.asarray(x, dtype=float)
+        if ic.size > 0 and ic.min() < 0: raise ValueError("ic < 0")
+        if name == "t":
+            if x.size > 0 and x.min() < 0: raise ValueError("t < 0")
+        else:
+            if x.size > 0 and x.max() > TC_MAX: raise ValueError("tc > TC_MAX")
+        return ic, x
+    
+    def _copy(self, ta):
+        # Returns TcTimeCalc with the same settings for ambient temperature ta
+        scc = TcTimeCalc(self._currentcalc, ta)
+        scc._timeStep = self._timeStep
+        scc._deltaIc = self._deltaIc
+        scc._integrator = self._integrator
+        scc._tolerance = self._tolerance
+        scc._steadyDelta = self._steadyDelta
+        scc._solver = self._solver
+        return scc
+    
+    def _getIciniFunc(self, tcx, factor, lapse):
+        # Returns increasing function of Icini with the temperature riched at lapse minus
+        # tcx, starting from the steady state temperature of Icini (getTc)
+        icmax = self._icmax
+        values = {}
+        
+        def func(ib):
+            if ib not in values:
+                tini = self.getTc(ib)
+                values[ib] = self.getFinalTc(tini, min(ib*factor, icmax), lapse) - tcx
+            return values[ib]
+        return func
+    
+    def _getIciniBrent(self, tcx, factor, lapse, guess=None):
+        # getIcini with Brent method, the result of the bisection from its root
+        # guess : Optional approximate result to narrow the bracket
+        ta = self._ta
+        icmax = self._icmax
+        current = self._getCurrentFunc()
+        func = self._getIciniFunc(tcx, factor, lapse)
+        
+        # Tc riched está entre las temperaturas de equilibrio de Icini e Icfin, luego 
+        # Icini está entre Ix/factor e Ix, con Ix la corriente de equilibrio en tcx
+        ibmax = icmax/max(factor, 1.0)
+        ix = current(ta, tcx)
+        ilo = min(ix, ix/factor, ibmax)
+        ihi = min(max(ix, ix/factor), ibmax)
+        if guess is not None and ilo < guess < ihi:
+            # Intervalo alrededor de guess, ampliado al doble hasta contener la raíz. El 
+            # primer paso considera aumento de temperatura proporcional a corriente^2
+            fg = func(guess)
+            step = 0.75*abs(fg)*guess/(tcx - ta) + self._deltaIc
+            if fg > 0:
+                ihi = x = guess
+                while x > ilo:
+                    x = max(x - step, ilo)
+                    if func(x) <= 0:
+                        ilo = x
+                        break
+                    ihi = x
+                    step = 2*step
+            else:
+                ilo = x = guess
+                while x < ihi:
+                    x = min(x + step, ihi)
+                    if func(x) > 0:
+                        ihi = x
+                        break
+                    ilo = x
+                    step = 2*step
+        near = self._findCurrent(func, 0.0, ibmax, ilo, ihi)
+        return self._bisectCurrent(func, 0, icmax/factor, near)
+    
+    def _bisectCurrent(self, func, ibmin, ibmax, near=None):
+        # Bisection of getIcini and getIcfin, returns the last middle value for increasing
+        # func in [ibmin, ibmax] within deltaIc. near : Optional root within deltaIc/2
+        # (_findCurrent), then func is evaluated only at middle values near the root and
+        # the result is the same with fewer evaluations
+        deltaIc = self._deltaIc
+        ibmed = 0.5*(ibmin + ibmax)
         cuenta = 0
-        while (ibmax - ibmin) > self._deltaIc:
+        while (ibmax - ibmin) > deltaIc:
             ibmed = 0.5*(ibmin + ibmax)
-            perfil = self.getData(tcxini, ibmed, lapse + self._timeStep, timex=0)
-            tc = perfil.getTc(lapse)
+            if near is not None and abs(ibmed - near) > deltaIc:
+                above = ibmed > near
+            else:
+                above = func(ibmed) > 0
             
-            if tc > tcx:
+            if above:
                 ibmax = ibmed
             else:
                 ibmin = ibmed
@@ -159,6 +431,321 @@ class TcTimeCalc(object):
                 raise RuntimeError(err_msg)
         return ibmed
     
+    def _findCurrent(self, func, ibmin, ibmax, ilo=None, ihi=None):
+        # Root of increasing func in [ibmin, ibmax] with Brent method, within deltaIc/2.
+        # ilo, ihi : Optional narrower bracket, replaced by the limits if it fails
+        # Returns the nearest limit if there is no root
+        flo = fhi = None
+        if ilo is not None:
+            flo = func(ilo)
+            if flo > 0:
+                flo = None
+        if flo is None:
+            ilo = ibmin
+            flo = func(ibmin)
+            if flo >= 0:
+                return ibmin
+        
+        if ihi is not None:
+            fhi = func(ihi)
+            if fhi < 0:
+                fhi = None
+        if fhi is None:
+            ihi = ibmax
+            fhi = func(ibmax)
+            if fhi <= 0:
+                return ibmax
+        return _brent(func, ilo, ihi, flo, fhi, 0.5*self._deltaIc)
+    
+    def _integrate(self, tcx, icfin, npasos):
+        # Returns list with npasos temperatures each timeStep from tcx
+        temps = self._iterTemps(tcx, icfin, npasos)
+        steady = self._steadyDelta
+        if steady is None:
+            return list(temps)
+        
+        sal = []
+        for temp in temps:
+            sal.append(temp)
+            if len(sal) > 2 and abs(sal[-1] - sal[-2]) < steady:
+                # Resto de la secuencia con la temperatura de equilibrio
+                Teq = self._getSteady(icfin, temp)
+                sal.extend([Teq]*(npasos - len(sal)))
+                break
+        return sal
+    
+    def _integrateArray(self, tcx, icfin, npasos):
+        # Returns array with the values of _integrate, fixed steps filled at once
+        if self._integrator == TI_ADAPTIVE or self._steadyDelta is not None:
+            return np.array(self._integrate(tcx, icfin, npasos))
+        
+        temps = np.empty(npasos)
+        temps[0] = tcx
+        self._fillSteps(temps, icfin, self._ta, self._timeStep)
+        return temps
+    
+    def _getFinal(self, tcx, icfin, npasos):
+        # Returns the last two of the npasos temperatures of _integrate, without the list
+        # (array of zx loop when possible)
+        if self._canFill() and self._steadyDelta is None:
+            temps = self._integrateArray(tcx, icfin, npasos)
+            return float(temps[-2]), float(temps[-1])
+        
+        steady = self._steadyDelta
+        T1 = T2 = None
+        n = 0
+        for temp in self._iterTemps(tcx, icfin, npasos):
+            T1, T2 = T2, temp
+            n = n + 1
+            if steady is not None and n > 2 and abs(T2 - T1) < steady:
+                Teq = self._getSteady(icfin, temp)
+                m = npasos - n
+                if m == 1:
+                    T1, T2 = T2, Teq
+                elif m > 1:
+                    T1, T2 = Teq, Teq
+                break
+        return T1, T2
+    
+    def _getSteady(self, icfin, temp):
+        # Returns equilibrium temperature of the steps from temp with current icfin [°C],
+        # currentcalc.getTc within deltaTemp. With icfin = 0 steps stop at temperatures
+        # without current, below getTc
+        Teq = self._currentcalc.getTc(self._ta, icfin)
+        if icfin == 0 and temp < Teq:
+            return temp
+        return Teq
+    
+    def _canFill(self):
+        # True if Euler steps can run in zx loop: TI_EULER without surface
+        cc = self._currentcalc
+        return (_fillEuler is not None and self._integrator == TI_EULER and 
+                not (cc._useSurface and cc._surface is not None))
+    
+    def _fillSteps(self, out, icfin, ta, h):
+        # Fills out[1:] (float array) with the temperatures each step h [seconds] from 
+        # out[0] with current icfin and ambient temperature ta, TI_RK4 or else TI_EULER 
+        # steps. Euler steps run in the zx loop when possible
+        temp = float(out[0])
+        cc = self._currentcalc
+        if self._canFill():
+            terms = (cc._D, cc._D75, cc._Pb, cc._V, cc._Qr0, cc._Qs)
+            _fillEuler(out, temp, icfin, ta, h, cc._r25, cc._alpha, cc.conductor.hcap, 
+                       terms, cc._formula)
+            return
+        
+        if temp < TC_MIN: raise ValueError("tc < TC_MIN")
+        if temp > TC_MAX: raise ValueError("tc > TC_MAX")
+        ic2 = icfin**2
+        sal = []
+        if self._integrator == TI_RK4:
+            f = self._getRateFunc()
+            for x in range(len(out) - 1):
+                k1 = f(temp, ic2, ta)
+                k2 = f(temp + 0.5*h*k1, ic2, ta)
+                k3 = f(temp + 0.5*h*k2, ic2, ta)
+                k4 = f(temp + h*k3, ic2, ta)
+                temp = temp + h/6*(k1 + 2*k2 + 2*k3 + k4)
+                if temp < TC_MIN: raise ValueError("tc < TC_MIN")
+                if temp > TC_MAX: raise ValueError("tc > TC_MAX")
+                sal.append(temp)
+        else:
+            # Mismos pasos de getData sin llamadas a funciones ni comprobaciones de rango
+            current = self._getCurrentFunc()
+            r25 = cc._r25
+            alpha = cc._alpha
+            K = 0.86/3600*h/cc.conductor.hcap
+            for x in range(len(out) - 1):
+                Rtemp = r25*(1 + alpha*(temp - 25))*.0003048  # Resistencia Ohm/pie
+                temp = temp + K*Rtemp*(ic2 - current(ta, temp)**2)
+                if temp < TC_MIN: raise ValueError("tc < TC_MIN")
+                if temp > TC_MAX: raise ValueError("tc > TC_MAX")
+                sal.append(temp)
+        out[1:] = sal
+    
+    def _scheduleFixed(self, tcx, bounds, currents, tas, npasos):
+        # Array with npasos temperatures each timeStep from tcx, TI_EULER or TI_RK4 steps
+        # with the current and ta of the interval where each step starts, each interval
+        # filled at once
+        h = self._timeStep
+        # Nº de pasos que comienzan en cada intervalo
+        segs = np.searchsorted(bounds[1:-1], np.arange(npasos - 1)*h, side='right')
+        counts = np.bincount(segs, minlength=len(currents)).tolist()
+        
+        if tcx < TC_MIN: raise ValueError("tc < TC_MIN")
+        if tcx > TC_MAX: raise ValueError("tc > TC_MAX")
+        temps = np.empty(npasos)
+        temps[0] = tcx
+        k = 0
+        for icfin, ta, m in zip(currents.tolist(), tas.tolist(), counts):
+            if m > 0:
+                self._fillSteps(temps[k:k + m + 1], icfin, ta, h)
+                k = k + m
+        return temps
+    
+    def _scheduleAdaptive(self, tcx, bounds, currents, tas, npasos):
+        # List with npasos temperatures each timeStep from tcx, TI_ADAPTIVE steps
+        # integrating each interval up to its limits, the last one up to the last value
+        step = self._timeStep
+        tol = self._tolerance
+        
+        if tcx < TC_MIN: raise ValueError("tc < TC_MIN")
+        if tcx > TC_MAX: raise ValueError("tc > TC_MAX")
+        sal = [tcx]
+        
+        n = len(currents)
+        t = 0.0
+        y = tcx
+        h = step
+        k = 1                                          # Siguiente valor de salida
+        cuenta = 0
+        for i in range(n):
+            f = self._getDerivFunc(currents[i], tas[i])
+            tend = bounds[i + 1] if i < n - 1 else (npasos - 1)*step
+            k1 = f(y)
+            while t < tend:
+                last = h >= tend - t
+                if last:
+                    h = tend - t
+                y1, k7, err = self._stepDP(f, y, k1, h)
+                
+                if err <= tol:
+                    if y1 < TC_MIN: raise ValueError("tc < TC_MIN")
+                    if y1 > TC_MAX: raise ValueError("tc > TC_MAX")
+                    # Valores de salida dentro del paso
+                    t1 = tend if last else t + h
+                    j = npasos if last and i == n - 1 else min(npasos, int(t1//step) + 1)
+                    if j > k:
+                        s = (np.arange(k, j)*step - t)/h
+                        sal.extend(((1 - s)*y + s*y1 + s*(s - 1)*((1 - 2*s)*(y1 - y) + 
+                                    (s - 1)*h*k1 + s*h*k7)).tolist())
+                        k = j
+                    t = t1
+                    y = y1
+                    k1 = k7
+                    if last:
+                        break
+                
+                h = h*min(5.0, max(0.2, 0.9*(tol/err)**0.2)) if err > 0 else 5.0*h
+                cuenta = cuenta + 1
+                if cuenta > ITER_MAX:
+                    err_msg = "TcTimeCalc: Nº integration steps > %d" % ITER_MAX
+                    raise RuntimeError(err_msg)
+        return sal
+    
+    def _iterTemps(self, tcx, icfin, npasos):
+        # Iterator with npasos temperatures each timeStep from tcx
+        if self._integrator == TI_ADAPTIVE:
+            return self._iterAdaptive(tcx, icfin, npasos)
+        return self._iterSteps(tcx, icfin, npasos)
+    
+    def _iterSteps(self, tcx, icfin, npasos):
+        # TI_EULER or TI_RK4 with timeStep steps, filled in blocks of growing size
+        if tcx < TC_MIN: raise ValueError("tc < TC_MIN")
+        if tcx > TC_MAX: raise ValueError("tc > TC_MAX")
+        yield tcx
+        
+        block = np.empty(65)
+        block[0] = tcx
+        k = 1
+        while k < npasos:
+            m = min(len(block) - 1, npasos - k)
+            self._fillSteps(block[:m + 1], icfin, self._ta, self._timeStep)
+            yield from block[1:m + 1].tolist()
+            k = k + m
+            if k < npasos:
+                temp = block[m]
+                block = np.empty(2*len(block) - 1)
+                block[0] = temp
+    
+    def _iterAdaptive(self, tcx, icfin, npasos):
+        # Dormand-Prince 5(4) with step control and cubic Hermite dense output
+        f = self._getDerivFunc(icfin)
+        step = self._timeStep
+        tol = self._tolerance
+        tend = (npasos - 1)*step
+        
+        if tcx < TC_MIN: raise ValueError("tc < TC_MIN")
+        if tcx > TC_MAX: raise ValueError("tc > TC_MAX")
+        yield tcx
+        
+        t = 0.0
+        y = tcx
+        k1 = f(y)
+        h = step
+        k = 1                                          # Siguiente valor de salida
+        cuenta = 0
+        while k < npasos:
+            last = h >= tend - t
+            if last:
+                h = tend - t
+            y1, k7, err = self._stepDP(f, y, k1, h)
+            
+            if err <= tol:
+                if y1 < TC_MIN: raise ValueError("tc < TC_MIN")
+                if y1 > TC_MAX: raise ValueError("tc > TC_MAX")
+                # Valores de salida dentro del paso
+                t1 = tend if last else t + h
+                while k < npasos and (last or k*step <= t1):
+                    s = (k*step - t)/h
+                    yield ((1 - s)*y + s*y1 + 
+                           s*(s - 1)*((1 - 2*s)*(y1 - y) + (s - 1)*h*k1 + s*h*k7))
+                    k = k + 1
+                t = t1
+                y = y1
+                k1 = k7
+            
+            h = h*min(5.0, max(0.2, 0.9*(tol/err)**0.2)) if err > 0 else 5.0*h
+            cuenta = cuenta + 1
+            if cuenta > ITER_MAX:
+                err_msg = "TcTimeCalc: Nº integration steps > %d" % ITER_MAX
+                raise RuntimeError(err_msg)
+    
+    def _stepDP(self, f, y, k1, h):
+        # Dormand-Prince 5(4) step h from y with k1 = f(y), returns (y1, f(y1), error)
+        k2 = f(y + h*(k1/5))
+        k3 = f(y + h*(3/40*k1 + 9/40*k2))
+        k4 = f(y + h*(44/45*k1 - 56/15*k2 + 32/9*k3))
+        k5 = f(y + h*(19372/6561*k1 - 25360/2187*k2 + 64448/6561*k3 - 212/729*k4))
+        k6 = f(y + h*(9017/3168*k1 - 355/33*k2 + 46732/5247*k3 + 49/176*k4 
+                      - 5103/18656*k5))
+        y1 = y + h*(35/384*k1 + 500/1113*k3 + 125/192*k4 - 2187/6784*k5 + 11/84*k6)
+        k7 = f(y1)
+        err = abs(h*(71/57600*k1 - 71/16695*k3 + 71/1920*k4 - 17253/339200*k5 
+                     + 22/525*k6 - k7/40))
+        return y1, k7, err
+    
+    def _getCurrentFunc(self):
+        # Function (ta, tc) for currents, exact calculation without range checks 
+        # unless CurrentCalc uses its surface
+        cc = self._currentcalc
+        if cc._useSurface and cc._surface is not None:
+            return cc.getCurrent
+        return cc._calcCurrent
+    
+    def _getRateFunc(self):
+        # Returns function (temp, ic2, ta) with dTc/dt [°C/seconds] for squared current
+        # ic2 and ambient temperature ta
+        cc = self._currentcalc
+        current = self._getCurrentFunc()
+        r25 = cc._r25
+        alpha = cc._alpha
+        K = 0.86/3600/cc.conductor.hcap
+        
+        def f(temp, ic2, ta):
+            Rtemp = r25*(1 + alpha*(temp - 25))*.0003048  # Resistencia Ohm/pie
+            return K*Rtemp*(ic2 - current(ta, temp)**2)
+        return f
+    
+    def _getDerivFunc(self, icfin, ta=None):
+        # Returns function of temperature with dTc/dt [°C/seconds] for current icfin
+        # and ambient temperature ta (None: self._ta)
+        f = self._getRateFunc()
+        if ta is None:
+            ta = self._ta
+        ic2 = icfin**2
+        return lambda temp: f(temp, ic2, ta)
+    
     #-------------------------------------------------------------------------------------
     # Properties
     
@@ -199,6 +786,44 @@ class TcTimeCalc(object):
     def deltaIc(self, value):
         if value <= 0: raise ValueError("value <= 0")
         self._deltaIc = value
+    
+    @property
+    def integrator(self):
+        return self._integrator
+    
+    @integrator.setter
+    def integrator(self, value):
+        if value not in [TI_EULER, TI_RK4, TI_ADAPTIVE]: 
+            raise ValueError("integrator <> TI_EULER, TI_RK4, TI_ADAPTIVE")
+        self._integrator = value
+    
+    @property
+    def tolerance(self):
+        return self._tolerance
+    
+    @tolerance.setter
+    def tolerance(self, value):
+        if value <= 0: raise ValueError("value <= 0")
+        self._tolerance = value
+    
+    @property
+    def solver(self):
+        return self._solver
+    
+    @solver.setter
+    def solver(self, value):
+        if value not in [SV_BISECTION, SV_BRENT]: 
+            raise ValueError("solver <> SV_BISECTION, SV_BRENT")
+        self._solver = value
+    
+    @property
+    def steadyDelta(self):
+        return self._steadyDelta
+    
+    @steadyDelta.setter
+    def steadyDelta(self, value):
+        if value is not None and value <= 0: raise ValueError("value <= 0")
+        self._steadyDelta = value
 
 
 #-----------------------------------------------------------------------------------------
@@ -206,12 +831,18 @@ class TcTimeCalc(object):
 class TcTimeData(tuple):
     """Inmutable secuence with tuples (time, Tc) 
     
+    Values are also stored in two float arrays, or only temperatures when times have 
+    uniform steps (see fromArrays and fromSteps), used by the queries and the times and
+    temps properties.
+    
     Read-only properties
     growing : True if the secuence grows in Tc values
     tempMin : Maximun conductor temperature into the secuence [°C]
     tempMax : Minimun conductor temperature into the secuence [°C]
     timeMin : Maximun time value into the secuence [seg]
     timeMax : Minimun time value into the secuence [seg]
+    times   : Time values [seg] (read-only array)
+    temps   : Conductor temperatures [°C] (read-only array)
     
     """
     
@@ -223,13 +854,43 @@ class TcTimeData(tuple):
         if len(data) <= 1: raise ValueError("len(data) <= 1")
         
         t = tuple.__new__(cls, data)
+        values = np.array(t, dtype=float)
+        t._setArrays(values[:, 0], values[:, 1], None, None)
+        return t
+    
+    def __reduce__(self):
+        return (TcTimeData, (tuple(self),))
+    
+    @classmethod
+    def fromArrays(cls, times, temps):
+        """Returns TcTimeData instance
+        times : Increasing time values [seg] (array_like)
+        temps : Conductor temperatures [°C] (array_like)
+        """
+        times = np.array(times, dtype=float)
+        temps = np.array(temps, dtype=float)
+        if len(temps) <= 1: raise ValueError("len(temps) <= 1")
+        if len(times) != len(temps): raise ValueError("len(times) <> len(temps)")
         
-        tlist = [x[1] for x in t]
-        t._tempMin = min(tlist)
-        t._tempMax = max(tlist)
-        t._growing = t[-1][1] > t[0][1]
+        data = tuple.__new__(cls, zip(times.tolist(), temps.tolist()))
+        data._setArrays(times, temps, None, None)
+        return data
+    
+    @classmethod
+    def fromSteps(cls, temps, timeStep, timex=0):
+        """Returns TcTimeData instance with times timex + k*timeStep, not stored
+        temps    : Conductor temperatures [°C] (array_like)
+        timeStep : Time step [seg]
+        timex    : Time of the first value [seg]
+        """
+        temps = np.array(temps, dtype=float)
+        if len(temps) <= 1: raise ValueError("len(temps) <= 1")
+        if timeStep <= 0: raise ValueError("timeStep <= 0")
         
-        return t
+        times = timex + np.arange(len(temps))*timeStep
+        data = tuple.__new__(cls, zip(times.tolist(), temps.tolist()))
+        data._setArrays(None, temps, timex, timeStep)
+        return data
     
     #-------------------------------------------------------------------------------------
     # Public methods
@@ -239,19 +900,15 @@ class TcTimeData(tuple):
         tc : Conductor temperature [°C] 
         If tc is out of range it returns POS_INDEF or NEG_INDEF
         """
-        tcs = [x[1] for x in self]
-        grow = self._growing
-        ilo = 0
-        ihi = len(tcs) - 1
-        
-        while ihi - ilo > 1:
-            mid = (ilo + ihi) // 2
-            if tc > tcs[mid]:
-                ilo = mid if grow else ilo
-                ihi = ihi if grow else mid
-            else:
-                ihi = mid if grow else ihi
-                ilo = ilo if grow else mid
+        temps = self._temps
+        n = len(temps)
+        # Mismos índices que la bisección: primer valor >= tc (creciente) o < tc
+        if self._growing:
+            ihi = int(np.searchsorted(temps, tc, 'left'))
+        else:
+            ihi = n - int(np.searchsorted(temps[::-1], tc, 'left'))
+        ihi = min(max(ihi, 1), n - 1)
+        ilo = ihi - 1
         
         t0, v0 = self[ilo]
         t1, v1 = self[ihi]
@@ -266,22 +923,97 @@ class TcTimeData(tuple):
         with intepolations of values.
         t : Time [seconds] 
         """
-        times = [x[0] for x in self]
-        ilo = 0
-        ihi = len(times) - 1
-        
-        while ihi - ilo > 1:
-            mid = (ilo + ihi) // 2
-            if t > times[mid]:
-                ilo = mid
-            else:
-                ihi = mid
+        n = len(self._temps)
+        if self._times is None:
+            # Primer tiempo >= t, calculado y corregido por redondeo
+            ihi = min(max(int(math.ceil((t - self._time0)/self._step)), 0), n)
+            while ihi > 0 and self._getTime(ihi - 1) >= t:
+                ihi = ihi - 1
+            while ihi < n and self._getTime(ihi) < t:
+                ihi = ihi + 1
+        else:
+            ihi = int(np.searchsorted(self._times, t, 'left'))
+        ihi = min(max(ihi, 1), n - 1)
+        ilo = ihi - 1
         
         t0, v0 = self[ilo]
         t1, v1 = self[ihi]
 
         return (t - t0)*(v1 - v0)/(t1 - t0) + v0
     
+    def getTimeArray(self, tc):
+        """Returns array of times [seconds] to rich tc, same values that getTime
+        tc : Conductor temperatures [°C] (array_like)
+        Intervals with equal temperatures give nan or inf instead of ZeroDivisionError
+        """
+        tc = np.asarray(tc, dtype=float)
+        temps = self._temps
+        n = len(temps)
+        if self._growing:
+            ihi = np.searchsorted(temps, tc, 'left')
+        else:
+            ihi = n - np.searchsorted(temps[::-1], tc, 'left')
+        ihi = np.clip(ihi, 1, n - 1)
+        ilo = ihi - 1
+        
+        t0 = self._getTimes(ilo)
+        t1 = self._getTimes(ihi)
+        v0 = temps[ilo]
+        v1 = temps[ihi]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tx = (tc - v0)*(t1 - t0)/(v1 - v0) + t0
+        return np.where(tx < 0, 0.0, tx)
+    
+    def getTcArray(self, t):
+        """Returns array of conductor temperatures [°C] riched at t, same values that getTc
+        t : Times [seconds] (array_like)
+        """
+        t = np.asarray(t, dtype=float)
+        n = len(self._temps)
+        if self._times is None:
+            # Primer tiempo >= t, calculado y corregido por redondeo
+            ihi = np.clip(np.ceil((t - self._time0)/self._step), 0, n).astype(np.intp)
+            ihi = ihi - ((ihi > 0) & (self._getTimes(ihi - 1) >= t))
+            ihi = ihi + ((ihi < n) & (self._getTimes(ihi) < t))
+        else:
+            ihi = np.searchsorted(self._times, t, 'left')
+        ihi = np.clip(ihi, 1, n - 1)
+        ilo = ihi - 1
+        
+        t0 = self._getTimes(ilo)
+        t1 = self._getTimes(ihi)
+        v0 = self._temps[ilo]
+        v1 = self._temps[ihi]
+        return (t - t0)*(v1 - v0)/(t1 - t0) + v0
+    
+    #-------------------------------------------------------------------------------------
+    # Private methods
+    
+    def _setArrays(self, times, temps, time0, step):
+        # Stores values, times is None for uniform steps
+        temps.flags.writeable = False
+        if times is not None:
+            times.flags.writeable = False
+        self._times = times
+        self._temps = temps
+        self._time0 = time0
+        self._step = step
+        self._tempMin = float(temps.min())
+        self._tempMax = float(temps.max())
+        self._growing = bool(temps[-1] > temps[0])
+    
+    def _getTime(self, i):
+        # Time of value i
+        if self._times is None:
+            return self._time0 + i*self._step
+        return float(self._times[i])
+    
+    def _getTimes(self, idx):
+        # Times of values in array idx, idx may be out of range with uniform steps
+        if self._times is None:
+            return self._time0 + idx*self._step
+        return self._times[idx]
+    
     #-------------------------------------------------------------------------------------
     # Properties
     
@@ -299,8 +1031,134 @@ class TcTimeData(tuple):
     
     @property
     def timeMin(self):
-        return self[0][0]
+        return self._getTime(0)
     
     @property
     def timeMax(self):
-        return self[-1][0]
\ No newline at end of file
+        return self._getTime(len(self._temps) - 1)
+    
+    @property
+    def times(self):
+        if self._times is None:
+            times = self._time0 + np.arange(len(self._temps))*self._step
+            times.flags.writeable = False
+            return times
+        return self._times
+    
+    @property
+    def temps(self):
+        return self._temps
+
+#-----------------------------------------------------------------------------------------
+
+class TcTimeState(object):
+    """Conductor temperature that advances with the samples of a current feed
+    
+    Only the present state is stored (no history). Each update integrates the heat
+    balance of tcalc with steps not longer than tcalc.timeStep, the same steps of
+    getData when dt is timeStep (TI_EULER or TI_RK4, TI_ADAPTIVE uses TI_EULER).
+    
+    Read-only properties
+    tcalc : TcTimeCalc instance
+    time  : Time elapsed with updates [seconds]
+    
+    Read-write properties
+    tc    : Conductor temperature [°C]
+    
+    """
+    
+    __slots__ = ('_tcalc', '_tc', '_time')
+    
+    def __init__(self, tcalc, tc, time=0):
+        """
+        tcalc : TcTimeCalc instance (uses currentcalc and timeStep, not ta)
+        tc    : Initial conductor temperature [°C]
+        time  : Optional. Initial time [seconds]
+        """
+        self._tcalc = tcalc
+        self.tc = tc
+        self._time = time
+    
+    #-------------------------------------------------------------------------------------
+    # Public methods
+    
+    def update(self, current, ta, dt):
+        """Advances the state and returns conductor temperature after dt [°C]
+        current : Current during dt [ampere]
+        ta      : Ambient temperature during dt [°C]
+        dt      : Time interval [seconds]
+        Arguments can be arrays (broadcast) with samples to apply in order, then returns
+        an array with the conductor temperature after each sample. The state does not
+        change if a sample raises ValueError.
+        """
+        if np.ndim(current) == 0 and np.ndim(ta) == 0 and np.ndim(dt) == 0:
+            self._check(current, ta, ta, dt)
+            tc = self._advance(self._tc, (current,), (ta,), (dt,))
+            self._tc = tc
+            self._time = self._time + dt
+            return tc
+        
+        ics, tas, dts = np.broadcast_arrays(np.asarray(current, dtype=float),
+                                            np.asarray(ta, dtype=float),
+                                            np.asarray(dt, dtype=float))
+        ics = ics.reshape(-1)
+        tas = tas.reshape(-1)
+        dts = dts.reshape(-1)
+        if len(ics) == 0:
+            return np.empty(0)
+        self._check(ics.min(), tas.min(), tas.max(), dts.min())
+        
+        out = []
+        tc = self._advance(self._tc, ics.tolist(), tas.tolist(), dts.tolist(), out)
+        self._tc = tc
+        self._time = self._time + float(dts.sum())
+        return np.array(out)
+    
+    #-------------------------------------------------------------------------------------
+    # Private methods
+    
+    def _check(self, icMin, taMin, taMax, dtMin):
+        if icMin < 0: raise ValueError("current < 0")
+        if taMin < TA_MIN: raise ValueError("ta < TA_MIN")
+        if taMax > TA_MAX: raise ValueError("ta > TA_MAX")
+        if dtMin <= 0: raise ValueError("dt <= 0")
+    
+    def _advance(self, temp, ics, tas, dts, out=None):
+        # Returns the temperature after the samples from temp, appends each one to out
+        tcalc = self._tcalc
+        timeStep = tcalc.timeStep
+        
+        dtx = None
+        for icfin, ta, dt in zip(ics, tas, dts):
+            if dt != dtx:
+                # Pasos iguales no mayores que timeStep
+                dtx = dt
+                n = 1 if dt <= timeStep else int(math.ceil(dt/timeStep))
+                buf = np.empty(n + 1)
+            buf[0] = temp
+            tcalc._fillSteps(buf, icfin, ta, dt/n)
+            temp = float(buf[n])
+            if out is not None:
+                out.append(temp)
+        return temp
+    
+    #-------------------------------------------------------------------------------------
+    # Properties
+    
+    @property
+    def tcalc(self):
+        return self._tcalc
+    
+    @property
+    def time(self):
+        return self._time
+    
+    @property
+    def tc(self):
+        return self._tc
+    
+    @tc.setter
+    def tc(self, value):
+        if value < TC_MIN: raise ValueError("value < TC_MIN")
+        if value > TC_MAX: raise ValueError("value > TC_MAX")
+        self._tc = value
@@ -0,0 +1,121 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+from cer.conductor import cx
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------------------
+
+class TCConductorCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.conds = [
+            cx.Conductor("CU 2/0 AWG", cx.CC_CU, diameter=10.5, area=67.4, weight=0.6, 
+                         strength=2500, r25=0.2767, hcap=0.1, idx="A"),
+            cx.Conductor("COPPERWELD 3/8", cx.CC_CUWELD, diameter=9.78, r25=1.030581, idx="B"),
+            cx.Conductor("AAAC 740,8 MCM FLINT", cx.CC_AAAC, diameter=25.17, r25=0.089360),
+        ]
+        self.cat = cx.ConductorCatalog(self.conds)
+    
+    def test_values(self):
+        self.assertEqual(len(self.cat), 3)
+        self.assertEqual(self.cat.names, ("CU 2/0 AWG", "COPPERWELD 3/8", "AAAC 740,8 MCM FLINT"))
+        self.assertEqual(self.cat.categories, (cx.CC_CU, cx.CC_CUWELD, cx.CC_AAAC))
+        self.assertEqual(self.cat.idxs, ("A", "B", None))
+        self.assertEqual(self.cat.diameter.tolist(), [10.5, 9.78, 25.17])
+        self.assertEqual(self.cat.r25.tolist(), [0.2767, 1.030581, 0.089360])
+        self.assertEqual(self.cat.alpha.tolist(), [0.00374, 0.00380, 0.00340])
+        self.assertEqual(self.cat.area[0], 67.4)
+        self.assertEqual(self.cat.weight[0], 0.6)
+        self.assertEqual(self.cat.strength[0], 2500)
+        self.assertEqual(self.cat.hcap[0], 0.1)
+    
+    def test_readOnly(self):
+        def setItem():
+            self.cat.diameter[0] = 1
+        self.assertRaises(ValueError, setItem)
+        self.assertRaises(AttributeError, setattr, self.cat, "r25", 3)
+    
+    def test_getConductors(self):
+        for c1, c2 in zip(self.conds, self.cat.getConductors()):
+            for prop in ["name", "category", "diameter", "area", "weight", "strength", "r25", 
+                         "hcap", "idx"]:
+                self.assertEqual(getattr(c1, prop), getattr(c2, prop))
+        self.assertEqual(self.cat.getConductor(-1).name, "AAAC 740,8 MCM FLINT")
+        self.assertEqual(len(cx.ConductorCatalog([])), 0)
+
+#-----------------------------------------------------------------------------------------
+
+class TCCatalogCalc(unittest.TestCase):
+
+    def setUp(self):
+        self.conds = [
+            cx.Conductor("CU 2/0 AWG", cx.CC_CU, diameter=10.5, r25=0.2767),
+            cx.Conductor("COPPERWELD 3/8", cx.CC_CUWELD, diameter=9.78, r25=1.030581),
+            cx.Conductor("AAAC 740,8 MCM FLINT", cx.CC_AAAC, diameter=25.17, r25=0.089360),
+        ]
+        self.calc = cx.CatalogCalc(cx.ConductorCatalog(self.conds))
+        self.ccs = [cx.CurrentCalc(c) for c in self.conds]
+    
+    def setAll(self, prop, value):
+        setattr(self.calc, prop, value)
+        for cc in self.ccs:
+            setattr(cc, prop, value)
+    
+    def test_defaults(self):
+        cc = self.ccs[0]
+        for prop in ["altitude", "airVelocity", "sunEffect", "emissivity", "formula", 
+                     "deltaTemp"]:
+            self.assertEqual(getattr(self.calc, prop), getattr(cc, prop))
+    
+    def test_errors(self):
+        cond = cx.Conductor("X", cx.CC_CU, diameter=0, r25=0.2767)
+        self.assertRaises(ValueError, cx.CatalogCalc, cx.ConductorCatalog([cond]))
+        cond = cx.Conductor("X", cx.CC_CU, diameter=10.5, r25=0)
+        self.assertRaises(ValueError, cx.CatalogCalc, cx.ConductorCatalog([cond]))
+        self.assertRaises(ValueError, setattr, self.calc, "altitude", -1)
+        self.assertRaises(ValueError, setattr, self.calc, "airVelocity", -1)
+        self.assertRaises(ValueError, setattr, self.calc, "sunEffect", 1.1)
+        self.assertRaises(ValueError, setattr, self.calc, "emissivity", -0.1)
+        self.assertRaises(ValueError, setattr, self.calc, "formula", 3)
+        self.assertRaises(ValueError, setattr, self.calc, "deltaTemp", 0)
+        self.assertRaises(ValueError, self.calc.getCurrent, cx.TA_MAX + 1, 50)
+        self.assertRaises(ValueError, self.calc.getCurrent, 25, cx.TC_MAX + 1)
+        self.assertRaises(ValueError, self.calc.getTc, 25, -1)
+        self.assertRaises(ValueError, self.calc.getTc, 25, [1, 1, 1e6])
+    
+    def test_getCurrent(self):
+        for prop, value in [(None, None), ("airVelocity", 0.0), ("formula", cx.CF_CLASSIC),
+                            ("sunEffect", 0.3), ("altitude", 1500), ("emissivity", 0.9)]:
+            if prop:
+                self.setAll(prop, value)
+            amps = self.calc.getCurrent(35, 75)
+            self.assertEqual(amps.shape, (3,))
+            for amp, cc in zip(amps, self.ccs):
+                self.assertAlmostEqual(amp, cc.getCurrent(35, 75), 8)
+        
+        ta = np.array([-10.0, 25.0, 40.0, 60.0])
+        amps = self.calc.getCurrent(ta[:, None], 50)
+        self.assertEqual(amps.shape, (4, 3))
+        for i, t in enumerate(ta):
+            for j, cc in enumerate(self.ccs):
+                self.assertAlmostEqual(amps[i, j], cc.getCurrent(t, 50), 8)
+    
+    def test_getTc(self):
+        ic = np.array([[0.0], [200.0], [400.0]])
+        tcs = self.calc.getTc(25, ic)
+        self.assertEqual(tcs.shape, (3, 3))
+        for i in range(3):
+            for j, cc in enumerate(self.ccs):
+                self.assertTrue(abs(tcs[i, j] - cc.getTc(25, ic[i, 0])) <= self.calc.deltaTemp)
+
+#-----------------------------------------------------------------------------------------
+
+s1 = unittest.TestLoader().loadTestsFromTestCase(TCConductorCatalog)
+s2 = unittest.TestLoader().loadTestsFromTestCase(TCCatalogCalc)
+
+suite = unittest.TestSuite([s1, s2])
+
+#-----------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,94 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+from cer.conductor import cx
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------------------
+
+class TCCurrentSurface(unittest.TestCase):
+
+    def setUp(self):
+        cond = cx.Conductor("AAAC 740,8 MCM FLINT", cx.CC_AAAC, diameter=25.17, r25=0.089360)
+        self.cc = cx.CurrentCalc(cond)
+    
+    def test_defaults(self):
+        self.assertEqual(self.cc.surface, None)
+        self.assertEqual(self.cc.useSurface, False)
+    
+    def test_errors(self):
+        self.assertRaises(ValueError, self.cc.buildSurface, 0)
+        self.assertRaises(ValueError, self.cc.buildSurface, 0.1, cx.TA_MIN - 1)
+        self.assertRaises(ValueError, self.cc.buildSurface, 0.1, 0, cx.TA_MAX + 1)
+        self.assertRaises(ValueError, self.cc.buildSurface, 0.1, 40, 30)
+        self.assertRaises(ValueError, self.cc.buildSurface, 0.1, 0, 40, 0)
+        self.assertRaises(ValueError, self.cc.buildSurface, 0.1, 0, 40, cx.TC_MAX + 1)
+    
+    def test_error(self):
+        # Verifica el error de interpolación en puntos al azar
+        surf = self.cc.buildSurface(0.5, -10, 50, 150)
+        self.assertTrue(surf.error <= 0.5)
+        self.assertEqual(self.cc.surface, surf)
+        
+        rnd = np.random.RandomState(1)
+        ta = rnd.uniform(-10, 50, 20000)
+        tc = rnd.uniform(-10, 150, 20000)
+        exact = self.cc.getCurrentArray(ta, tc)
+        approx = surf.getCurrentArray(ta, tc)
+        self.assertTrue(abs(approx - exact).max() <= 0.5)
+        
+        for i in range(200):
+            self.assertAlmostEqual(surf.getCurrent(ta[i], tc[i]), approx[i], 8)
+        self.assertEqual(surf.getCurrent(30, 30), 0)
+        self.assertEqual(surf.getCurrent(30, 20), 0)
+    
+    def test_useSurface(self):
+        exact = self.cc.getCurrent(25.3, 51.7)
+        surf = self.cc.buildSurface(0.5, 0, 40, 100)
+        self.cc.useSurface = True
+        self.assertEqual(self.cc.getCurrent(25.3, 51.7), surf.getCurrent(25.3, 51.7))
+        self.assertNotEqual(self.cc.getCurrent(25.3, 51.7), exact)
+        self.assertTrue(abs(self.cc.getCurrent(25.3, 51.7) - exact) <= 0.5)
+        self.assertTrue(abs(self.cc.getTc(25.3, exact) - 51.7) < 0.1)
+        
+        # Fuera de la superficie se usa la fórmula
+        self.assertEqual(self.cc.getCurrent(25, 120), cx.CurrentCalc(self.cc.conductor).getCurrent(25, 120))
+        amps = self.cc.getCurrentArray([25.3, 25], [51.7, 120])
+        self.assertAlmostEqual(amps[0], surf.getCurrent(25.3, 51.7), 8)
+        self.assertAlmostEqual(amps[1], self.cc.getCurrent(25, 120), 8)
+        
+        # Cambios en parámetros eliminan la superficie
+        self.cc.sunEffect = 0.5
+        self.assertEqual(self.cc.surface, None)
+        self.cc.sunEffect = 1.0
+        self.assertEqual(self.cc.getCurrent(25.3, 51.7), exact)
+        self.cc.buildSurface(0.5, 0, 40, 100)
+        self.cc.formula = cx.CF_CLASSIC
+        self.assertEqual(self.cc.surface, None)
+    
+    def test_cachedResults(self):
+        # buildSurface y useSurface renuevan los resultados guardados en OperatingTable
+        table = cx.OperatingTable()
+        table.items.append(cx.OperatingItem(self.cc, 51.7))
+        table.buildBreakpoints()
+        surf = self.cc.buildSurface(0.5, 0, 40, 100)
+        self.assertEqual(table.breakpoints, None)
+        table.buildBreakpoints()
+        self.cc.useSurface = True
+        self.assertEqual(table.breakpoints, None)
+        self.assertEqual(table.getCurrent(25.3), surf.getCurrent(25.3, 51.7))
+        
+        # Arreglos 0-d dentro y fuera de la superficie
+        self.assertEqual(self.cc.getCurrentArray(25.3, 51.7), surf.getCurrent(25.3, 51.7))
+        self.assertEqual(self.cc.getCurrentArray(45.0, 51.7), self.cc.getCurrent(45.0, 51.7))
+        self.assertEqual(surf.getCurrentArray(25.3, 51.7), surf.getCurrent(25.3, 51.7))
+
+#-----------------------------------------------------------------------------------------
+
+s1 = unittest.TestLoader().loadTestsFromTestCase(TCCurrentSurface)
+
+suite = unittest.TestSuite([s1])
+
+#-----------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,84 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+from cer.conductor import cx
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------------------
+
+class TCRatingStream(unittest.TestCase):
+
+    def setUp(self):
+        cab0 = cx.Conductor(name="CU 2/0 AWG", category=cx.CC_CU, diameter=10.5, r25=0.2767)
+        cab1 = cx.Conductor(name="COPPERWELD 3/8", category=cx.CC_CUWELD, diameter=9.78, 
+                            r25=1.030581)
+        self.cc0 = cx.CurrentCalc(cab0)
+        self.cc1 = cx.CurrentCalc(cab1)
+        self.table = cx.OperatingTable()
+        self.table.items.append(cx.OperatingItem(self.cc0, 50.0, 2))
+        self.table.items.append(cx.OperatingItem(self.cc1, 125.0, 1))
+        
+        rnd = np.random.RandomState(1)
+        self.ta = rnd.uniform(-10, 45, 1000)
+        self.av = rnd.uniform(0, 10, 1000)
+        self.av[::7] = 0
+        self.se = rnd.uniform(0, 1, 1000)
+    
+    def exact(self, i):
+        # Corriente calculada modificando los parámetros de CurrentCalc
+        for cc in [self.cc0, self.cc1]:
+            cc.airVelocity = self.av[i]
+            cc.sunEffect = self.se[i]
+        amp = self.table.getCurrent(self.ta[i])
+        for cc in [self.cc0, self.cc1]:
+            cc.airVelocity = 2.0
+            cc.sunEffect = 1.0
+        return amp
+    
+    def test_defaults(self):
+        rs = cx.RatingStream(self.table)
+        self.assertEqual(rs.table, self.table)
+        self.assertEqual(rs.chunkSize, 4096)
+    
+    def test_errors(self):
+        self.assertRaises(ValueError, cx.RatingStream, self.table, 0)
+        rs = cx.RatingStream(self.table)
+        self.assertRaises(ValueError, rs.getCurrentArray, 25, -1, 0.5)
+        self.assertRaises(ValueError, rs.getCurrentArray, 25, 2, 1.5)
+        self.assertRaises(ValueError, rs.getCurrentArray, cx.TA_MAX + 1, 2, 0.5)
+    
+    def test_getCurrentArray(self):
+        rs = cx.RatingStream(self.table)
+        amps = rs.getCurrentArray(self.ta, self.av, self.se)
+        for i in range(0, 1000, 37):
+            self.assertAlmostEqual(amps[i], self.exact(i), 8)
+        self.assertEqual(self.cc0.airVelocity, 2.0)
+        self.assertEqual(self.cc0.sunEffect, 1.0)
+        
+        amps = cx.RatingStream(cx.OperatingTable()).getCurrentArray(self.ta, 2, 1)
+        self.assertTrue((amps == 100000).all())
+    
+    def test_iter(self):
+        rs = cx.RatingStream(self.table, 64)
+        amps = rs.getCurrentArray(self.ta, self.av, self.se)
+        
+        records = zip(self.ta, self.av, self.se)
+        res = list(rs.iterCurrents(records))
+        self.assertEqual(len(res), 1000)
+        self.assertTrue(np.allclose(res, amps, rtol=0, atol=1e-8))
+        self.assertEqual(list(rs.iterCurrents([])), [])
+        
+        chunks = ((self.ta[i:i + 300], self.av[i:i + 300], self.se[i:i + 300]) 
+                  for i in range(0, 1000, 300))
+        res = np.concatenate(list(rs.iterChunks(chunks)))
+        self.assertTrue(np.allclose(res, amps, rtol=0, atol=1e-8))
+
+#-----------------------------------------------------------------------------------------
+
+s1 = unittest.TestLoader().loadTestsFromTestCase(TCRatingStream)
+
+suite = unittest.TestSuite([s1])
+
+#-----------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,90 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+from cer.conductor import cx
+from concurrent.futures import ProcessPoolExecutor
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------------------
+
+class TCFleetRating(unittest.TestCase):
+
+    def setUp(self):
+        cab0 = cx.Conductor(name="CU 2/0 AWG", category=cx.CC_CU, diameter=10.5, r25=0.2767)
+        cab1 = cx.Conductor(name="COPPERWELD 3/8", category=cx.CC_CUWELD, diameter=9.78, 
+                            r25=1.030581)
+        cc0 = cx.CurrentCalc(cab0)
+        cc1 = cx.CurrentCalc(cab1)
+        cc2 = cx.CurrentCalc(cab1)
+        cc2.airVelocity = 0
+        cc2.formula = cx.CF_CLASSIC
+        cc2.sunEffect = 0.4
+        
+        self.tables = []
+        for k in range(10):
+            table = cx.OperatingTable(k)
+            if k % 4 != 3:                             # Algunas tablas sin items
+                table.items.append(cx.OperatingItem(cc0, 50.0 + k, 1 + k % 2))
+                table.items.append(cx.OperatingItem([cc1, cc2][k % 2], 75.0, 1))
+            self.tables.append(table)
+        self.ta = np.array([-10.0, 0.0, 15.5, 25.0, 35.0, 49.0])
+    
+    def exact(self):
+        return np.array([[t.getCurrent(x) for x in self.ta] for t in self.tables])
+    
+    def test_defaults(self):
+        fleet = cx.FleetRating(self.tables)
+        self.assertEqual(fleet.tables, tuple(self.tables))
+        self.assertEqual(fleet.maxWorkers, None)
+        self.assertEqual(fleet.chunkSize, 64)
+        self.assertEqual(fleet.executor, None)
+    
+    def test_errors(self):
+        self.assertRaises(ValueError, cx.FleetRating, self.tables, 0)
+        self.assertRaises(ValueError, cx.FleetRating, self.tables, 2, 0)
+        fleet = cx.FleetRating(self.tables, 1)
+        self.assertRaises(ValueError, fleet.getCurrentArray, [25, cx.TA_MAX + 1])
+        self.assertRaises(ValueError, fleet.getCurrentArray, [cx.TA_MIN - 1])
+    
+    def test_getCurrentArray(self):
+        exact = self.exact()
+        for maxWorkers, chunkSize in [(1, 64), (1, 3), (2, 3)]:
+            fleet = cx.FleetRating(self.tables, maxWorkers, chunkSize)
+            amps = fleet.getCurrentArray(self.ta)
+            self.assertEqual(amps.shape, (10, 6))
+            self.assertTrue(np.allclose(amps, exact, rtol=0, atol=1e-8))
+        self.assertTrue((amps[3] == 100000).all())
+        
+        self.assertEqual(cx.FleetRating([], 1).getCurrentArray(self.ta).shape, (0, 6))
+        self.assertEqual(cx.FleetRating(self.tables, 1).getCurrentArray([]).shape, (10, 0))
+    
+    def test_executor(self):
+        exact = self.exact()
+        # El pool se crea una vez y se reutiliza hasta close
+        with cx.FleetRating(self.tables, 2, 3) as fleet:
+            amps = fleet.getCurrentArray(self.ta)
+            executor = fleet.executor
+            self.assertTrue(executor is not None)
+            self.assertTrue(np.allclose(fleet.getCurrentArray(self.ta), amps, rtol=0, atol=0))
+            self.assertTrue(fleet.executor is executor)
+        self.assertEqual(fleet.executor, None)
+        self.assertTrue(np.allclose(amps, exact, rtol=0, atol=1e-8))
+        
+        # Executor externo, no se cierra con close
+        with ProcessPoolExecutor(2) as executor:
+            fleet = cx.FleetRating(self.tables, 1, 3, executor)
+            amps = fleet.getCurrentArray(self.ta)
+            fleet.close()
+            self.assertTrue(fleet.executor is executor)
+            self.assertTrue(np.allclose(fleet.getCurrentArray(self.ta), amps, rtol=0, atol=0))
+        self.assertTrue(np.allclose(amps, exact, rtol=0, atol=1e-8))
+
+#-----------------------------------------------------------------------------------------
+
+s1 = unittest.TestLoader().loadTestsFromTestCase(TCFleetRating)
+
+suite = unittest.TestSuite([s1])
+
+#-----------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
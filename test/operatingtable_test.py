@@ -1,7 +1,10 @@
 # CRISTIAN ECHEVERRÍA RABÍ
 
 from cer.conductor import cx
+import copy
+import pickle
 import unittest
+import numpy as np
 
 #-----------------------------------------------------------------------------------------
 
@@ -77,6 +80,208 @@ class TCTablaOperacion(unittest.TestCase):
         ic0 = self.item0.currentcalc.getCurrent(ta, self.item0.tempMaxOp)
         ic1 = self.item1.currentcalc.getCurrent(ta, self.item1.tempMaxOp)
         self.assertEqual(ic, min([ic0, ic1]))
+    
+    def test_tableGetLimitArray(self):
+        opt = cx.OperatingTable()
+        ta = np.array([-10.0, 25.0, 49.9, 80.0])
+        amps, index = opt.getLimitArray(ta)
+        self.assertEqual(amps.tolist(), [100000]*4)
+        self.assertEqual(index.tolist(), [-1]*4)
+        
+        item2 = cx.OperatingItem(self.cc0, 40.0, 1)
+        opt.items.extend([self.item0, self.item1, item2])
+        amps, index = opt.getLimitArray(ta)
+        self.assertEqual(amps.shape, (4,))
+        for i, t in enumerate(ta):
+            self.assertAlmostEqual(amps[i], opt.getCurrent(t), 8)
+            self.assertAlmostEqual(amps[i], opt.items[index[i]].getCurrent(t), 8)
+        self.assertEqual(index.tolist(), [1, 2, 0, 0])
+        self.assertEqual(opt.getLimitArray(30.0)[1], 2)
+        self.assertTrue(np.allclose(opt.getCurrentArray(ta), amps, rtol=0, atol=1e-8))
+        self.assertTrue(np.allclose(item2.getCurrentArray(ta), 
+                                    [item2.getCurrent(t) for t in ta], rtol=0, atol=1e-8))
+        
+        # Condiciones de viento y sol por elemento, sin modificar los CurrentCalc
+        av = np.array([0.0, 1.0, 2.0, 5.0])
+        se = np.array([0.0, 0.5, 1.0, 0.2])
+        amps2 = opt.getCurrentArray(ta, av, se)
+        for i, t in enumerate(ta):
+            self.cc0.airVelocity = self.cc1.airVelocity = av[i]
+            self.cc0.sunEffect = self.cc1.sunEffect = se[i]
+            self.assertAlmostEqual(amps2[i], opt.getCurrent(t), 8)
+        self.cc0.airVelocity = self.cc1.airVelocity = 2.0
+        self.cc0.sunEffect = self.cc1.sunEffect = 1.0
+        self.assertTrue(np.allclose(opt.getCurrentArray(ta, None, 1.0), amps, rtol=0, atol=1e-8))
+        self.assertEqual(opt.getCurrentArray(ta, av[:, None]).shape, (4, 4))
+        self.assertEqual(cx.OperatingTable().getCurrentArray(ta, 2.0).tolist(), [100000]*4)
+        
+        amps, index = opt.getLimitArray([[25.0], [80.0]])
+        self.assertEqual(amps.shape, (2, 1))
+        self.assertEqual(index.shape, (2, 1))
+        self.assertRaises(ValueError, opt.getLimitArray, [cx.TA_MAX + 1])
+
+    
+    def test_tablePlan(self):
+        # Items con igual CurrentCalc y tempMaxOp se calculan una vez
+        class CountCalc(cx.CurrentCalc):
+            count = 0
+            def getCurrent(self, ta, tc):
+                CountCalc.count += 1
+                return cx.CurrentCalc.getCurrent(self, ta, tc)
+        
+        cc = CountCalc(self.cab0)
+        opt = cx.OperatingTable()
+        opt.items.extend([cx.OperatingItem(cc, 50.0, 3), cx.OperatingItem(cc, 50.0, 1),
+                          cx.OperatingItem(cc, 50.0, 2), self.item1])
+        ic = opt.getCurrent(25.0)
+        self.assertEqual(CountCalc.count, 1)
+        self.assertEqual(ic, min([item.getCurrent(25.0) for item in opt.items]))
+        amps, index = opt.getLimitArray([25.0, 30.0])
+        self.assertEqual(index.tolist(), [1, 1])
+        
+        # Cambios en items renuevan el plan
+        opt.items.append(cx.OperatingItem(cc, 40.0, 1))
+        CountCalc.count = 0
+        ic = opt.getCurrent(25.0)
+        self.assertEqual(CountCalc.count, 2)
+        self.assertEqual(ic, opt.items[-1].getCurrent(25.0))
+        opt.items[:] = [self.item0]
+        self.assertEqual(opt.getCurrent(25.0), self.item0.getCurrent(25.0))
+        del opt.items[:]
+        self.assertEqual(opt.getCurrent(25.0), 100000)
+
+    
+    def test_tableBreakpoints(self):
+        opt = cx.OperatingTable()
+        opt.items.extend([self.item0, self.item1, cx.OperatingItem(self.cc1, 60.0, 2)])
+        tas = np.linspace(cx.TA_MIN, cx.TA_MAX, 721)
+        exact = [opt.getCurrent(ta) for ta in tas]
+        self.assertEqual(opt.breakpoints, None)
+        
+        breaks = opt.buildBreakpoints()
+        self.assertEqual(opt.breakpoints, tuple(breaks))
+        self.assertTrue(len(breaks) > 0)
+        index = opt.getLimitArray(tas)[1]
+        self.assertEqual(len(breaks), (index[1:] != index[:-1]).sum())
+        for ta, ic in zip(tas, exact):
+            self.assertAlmostEqual(opt.getCurrent(ta), ic, 8)
+        for ta in breaks:
+            self.assertAlmostEqual(opt.getCurrent(ta), opt.getLimitArray(ta)[0], 0)
+        
+        # Cambios en items o en CurrentCalc anulan los breakpoints
+        self.cc0.airVelocity = 1.0
+        self.assertEqual(opt.breakpoints, None)
+        self.assertEqual(opt.getCurrent(25.0), min([item.getCurrent(25.0) for item in opt.items]))
+        opt.buildBreakpoints()
+        opt.items.pop()
+        self.assertEqual(opt.breakpoints, None)
+        self.assertEqual(opt.getCurrent(25.0), min([item.getCurrent(25.0) for item in opt.items]))
+        
+        # Cada cambio de la lista de items anula los breakpoints
+        item2 = cx.OperatingItem(self.cc0, 40.0, 1)
+        changes = [lambda items: items.append(item2), lambda items: items.extend([item2]),
+                   lambda items: items.insert(0, item2), lambda items: items.remove(item2),
+                   lambda items: items.pop(), lambda items: items.reverse(),
+                   lambda items: items.sort(key=lambda item: item.tempMaxOp),
+                   lambda items: items.__setitem__(0, item2), 
+                   lambda items: items.__delitem__(0), lambda items: items.__iadd__([item2]),
+                   lambda items: items.__imul__(1), lambda items: items.clear()]
+        for change in changes:
+            opt.items[:] = [self.item0, self.item1, item2]
+            opt.buildBreakpoints()
+            change(opt.items)
+            self.assertEqual(opt.breakpoints, None)
+            self.assertEqual(opt.getCurrent(25.0), 
+                             min([item.getCurrent(25.0) for item in opt.items] + [100000]))
+        
+        # CurrentCalc copiado sin las tablas que lo usan
+        opt.items[:] = [self.item0, self.item1]
+        breaks = tuple(opt.buildBreakpoints())
+        cc = pickle.loads(pickle.dumps(self.cc0))
+        self.assertEqual(cc.getCurrent(25.0, 50.0), self.cc0.getCurrent(25.0, 50.0))
+        cc.altitude = 1000.0
+        self.assertEqual(opt.breakpoints, breaks)
+        
+        opt = cx.OperatingTable()
+        self.assertEqual(opt.buildBreakpoints(), [])
+        self.assertEqual(opt.getCurrent(25.0), 100000)
+        self.assertRaises(ValueError, opt.buildBreakpoints, 0)
+        self.assertRaises(ValueError, opt.buildBreakpoints, 0.5, 0)
+
+    
+    def test_tableCurve(self):
+        opt = cx.OperatingTable()
+        opt.items.extend([self.item0, self.item1, cx.OperatingItem(self.cc1, 60.0, 2)])
+        self.assertEqual(opt.curveTolerance, None)
+        self.assertRaises(ValueError, setattr, opt, "curveTolerance", 0)
+        exactMin = lambda ta: min([item.getCurrent(ta) for item in opt.items])
+        
+        rnd = np.random.RandomState(1)
+        tas = rnd.uniform(cx.TA_MIN, cx.TA_MAX, 2000)
+        exact = opt.getCurrentArray(tas)
+        for tol in [1.0, 0.05]:
+            opt.curveTolerance = tol
+            amps = opt.getCurrentArray(tas)
+            self.assertTrue(abs(amps - exact).max() <= tol)
+            for i in range(200):
+                self.assertAlmostEqual(opt.getCurrent(tas[i]), amps[i], 8)
+        self.assertAlmostEqual(opt.getCurrent(cx.TA_MIN), exact.max(), 0)
+        self.assertEqual(opt.getCurrent(cx.TA_MAX), exactMin(cx.TA_MAX))
+        self.assertRaises(ValueError, opt.getCurrent, cx.TA_MAX + 1)
+        
+        # Cambios en items o en CurrentCalc renuevan la curva
+        self.cc0.sunEffect = 0.2
+        self.assertTrue(abs(opt.getCurrent(25.3) - exactMin(25.3)) <= 0.05)
+        opt.items.pop(0)
+        self.assertTrue(abs(opt.getCurrent(25.3) - exactMin(25.3)) <= 0.05)
+        
+        # Consultas sin cambios reutilizan la curva
+        nodes = opt._curveTas
+        opt.getCurrent(30.0)
+        opt.getCurrentArray(tas)
+        self.assertTrue(opt._curveTas is nodes)
+        
+        # Curva sobre CurrentSurface, se renueva al cambiar useSurface
+        self.cc1.buildSurface()
+        self.cc1.useSurface = True
+        self.assertTrue(abs(opt.getCurrent(25.3) - exactMin(25.3)) <= 0.05)
+        self.cc1.useSurface = False
+        self.assertTrue(opt._curveTas is None)
+        self.assertTrue(abs(opt.getCurrent(25.3) - exactMin(25.3)) <= 0.05)
+        
+        opt.curveTolerance = None
+        self.assertEqual(opt.getCurrent(25.3), exactMin(25.3))
+    
+    def test_tableCopy(self):
+        opt = cx.OperatingTable("L1")
+        opt.items.extend([self.item0, self.item1])
+        opt.curveTolerance = 0.05
+        opt.getCurrent(25.0)
+        opt.buildBreakpoints()
+        
+        # Copias con los mismos items, sin resultados guardados
+        for opt2 in [pickle.loads(pickle.dumps(opt)), copy.copy(opt), copy.deepcopy(opt)]:
+            self.assertEqual(opt2.idx, "L1")
+            self.assertEqual(opt2.curveTolerance, 0.05)
+            self.assertEqual(len(opt2.items), 2)
+            self.assertEqual(opt2.breakpoints, None)
+            self.assertEqual(opt2.getCurrent(25.0), opt.getCurrent(25.0))
+            # Cambios de la copia no afectan al original
+            opt.buildBreakpoints()
+            opt2.items.pop()
+            self.assertTrue(opt.breakpoints is not None)
+            self.assertEqual(len(opt.items), 2)
+        self.assertTrue(copy.copy(opt).items[0] is self.item0)
+        self.assertEqual(len(pickle.loads(pickle.dumps(opt.items))), 2)
+        
+        # La copia profunda se registra en sus CurrentCalc y renueva su curva
+        opt2 = copy.deepcopy(opt)
+        cc = opt2.items[0].currentcalc
+        self.assertTrue(cc is not self.cc0)
+        opt2.getCurrent(25.0)
+        cc.emissivity = 0.9
+        exact = min([item.getCurrent(25.0) for item in opt2.items])
+        self.assertTrue(abs(opt2.getCurrent(25.0) - exact) <= 0.05)
 
 #-----------------------------------------------------------------------------------------
 
@@ -0,0 +1,90 @@
+# CRISTIAN ECHEVERRÍA RABÍ
+
+from cer.conductor import cx
+import unittest
+import numpy as np
+
+#-----------------------------------------------------------------------------------------
+
+class TCLineRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.cab0 = cx.Conductor(name="CU 2/0 AWG", category=cx.CC_CU, diameter=10.5, 
+                                 r25=0.2767)
+        self.cab1 = cx.Conductor(name="COPPERWELD 3/8", category=cx.CC_CUWELD, diameter=9.78,
+                                 r25=1.030581)
+        cc0 = cx.CurrentCalc(self.cab0)
+        cc1 = cx.CurrentCalc(self.cab1)
+        cc2 = cx.CurrentCalc(self.cab0)
+        cc2.airVelocity = 0
+        cc2.formula = cx.CF_CLASSIC
+        cc2.altitude = 2000
+        
+        self.tables = []
+        for k in range(12):
+            table = cx.OperatingTable("L%d" % k)
+            if k % 5 != 4:                             # Algunas tablas sin items
+                table.items.append(cx.OperatingItem([cc0, cc2][k % 2], 50.0 + k, 1 + k % 3))
+                table.items.append(cx.OperatingItem(cc1, 75.0, 1))
+            self.tables.append(table)
+        self.tables.append(cx.OperatingTable())
+        self.reg = cx.LineRegistry(self.tables)
+    
+    def test_values(self):
+        reg = self.reg
+        self.assertEqual(len(reg), 13)
+        self.assertEqual(reg.idxs[:2], ("L0", "L1"))
+        self.assertEqual(reg.idxs[-1], None)
+        self.assertEqual(reg.offsets[:6].tolist(), [0, 2, 4, 6, 8, 8])
+        self.assertEqual(reg.offsets[-1], 20)
+        self.assertEqual(reg.catalog.names, ("CU 2/0 AWG", "COPPERWELD 3/8"))
+        self.assertEqual(reg.conductor[:4].tolist(), [0, 1, 0, 1])
+        self.assertEqual(reg.tempMaxOp[:4].tolist(), [50.0, 75.0, 51.0, 75.0])
+        self.assertEqual(reg.nsc[:4].tolist(), [1, 1, 2, 1])
+        self.assertEqual(reg.altitude[:3].tolist(), [300, 300, 2000])
+        self.assertEqual(reg.airVelocity[:3].tolist(), [2, 2, 0])
+        self.assertEqual(reg.formula[:3].tolist(), [cx.CF_IEEE, cx.CF_IEEE, cx.CF_CLASSIC])
+        self.assertEqual(reg.sunEffect[0], 1.0)
+        self.assertEqual(reg.emissivity[0], 0.5)
+        self.assertEqual(reg.getPosition("L3"), 3)
+        self.assertRaises(KeyError, reg.getPosition, "X")
+    
+    def test_errors(self):
+        self.assertRaises(ValueError, cx.LineRegistry, self.tables + [cx.OperatingTable("L0")])
+        self.assertRaises(ValueError, self.reg.getCurrent, cx.TA_MAX + 1)
+        self.assertRaises(ValueError, self.reg.getTableCurrent, "L0", [cx.TA_MIN - 1])
+    
+    def test_getCurrent(self):
+        ta = np.array([-10.0, 0.0, 25.0, 35.5, 49.0])
+        exact = np.array([[t.getCurrent(x) for x in ta] for t in self.tables])
+        amps = self.reg.getCurrent(ta)
+        self.assertEqual(amps.shape, (13, 5))
+        self.assertTrue(np.allclose(amps, exact, rtol=0, atol=1e-8))
+        self.assertEqual(amps[4].tolist(), [100000]*5)
+        
+        amps = self.reg.getCurrent(25.0)
+        self.assertEqual(amps.shape, (13,))
+        self.assertTrue(np.allclose(amps, exact[:, 2], rtol=0, atol=1e-8))
+        
+        self.assertAlmostEqual(self.reg.getTableCurrent("L7", 35.5), exact[7, 3], 8)
+        amps = self.reg.getTableCurrent("L7", ta)
+        self.assertTrue(np.allclose(amps, exact[7], rtol=0, atol=1e-8))
+        self.assertEqual(cx.LineRegistry([]).getCurrent(ta).shape, (0, 5))
+    
+    def test_blocks(self):
+        # Bloques de tablas con cantidad limitada de items
+        blocks = list(self.reg._blocks(0, 13, 1, 3))
+        self.assertEqual(blocks[0], (0, 1))
+        self.assertEqual(blocks[-1][1], 13)
+        for (a, b), (c, d) in zip(blocks[:-1], blocks[1:]):
+            self.assertEqual(b, c)
+
+#-----------------------------------------------------------------------------------------
+
+s1 = unittest.TestLoader().loadTestsFromTestCase(TCLineRegistry)
+
+suite = unittest.TestSuite([s1])
+
+#-----------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.TextTestRunner(verbosity=2).run(suite)
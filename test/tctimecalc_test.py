@@ -1,7 +1,11 @@
 # CRISTIAN ECHEVERRÍA RABÍ 
 
 from cer.conductor import cx
+from cer.conductor import tctimecalc
+import json
+import pickle
 import unittest
+import warnings
 
 #-----------------------------------------------------------------------------------------
 
@@ -23,6 +27,10 @@ class TCConstructor(unittest.TestCase):
         self.assertEqual(scc.ta, 25.0)
         self.assertEqual(scc.timeStep, 1.0)
         self.assertEqual(scc.deltaIc, 0.01)
+        self.assertEqual(scc.integrator, cx.TI_EULER)
+        self.assertEqual(scc.tolerance, 0.001)
+        self.assertEqual(scc.steadyDelta, None)
+        self.assertEqual(scc.solver, cx.SV_BISECTION)
         self.assertEqual(scc.icmax, Imax)
     
     #--------------------------------------------------------------------------
@@ -65,6 +73,20 @@ class TCProperties(unittest.TestCase):
         self.scc.deltaIc = 0.02
         self.assertEqual(self.scc.deltaIc, 0.02)
         
+        self.scc.integrator = cx.TI_RK4
+        self.assertEqual(self.scc.integrator, cx.TI_RK4)
+        
+        self.scc.tolerance = 0.05
+        self.assertEqual(self.scc.tolerance, 0.05)
+        
+        self.scc.steadyDelta = 0.0001
+        self.assertEqual(self.scc.steadyDelta, 0.0001)
+        self.scc.steadyDelta = None
+        self.assertEqual(self.scc.steadyDelta, None)
+        
+        self.scc.solver = cx.SV_BRENT
+        self.assertEqual(self.scc.solver, cx.SV_BRENT)
+        
     def test_errors(self):
         # Verifica que lanza error con valores fuera de rango
         self.assertRaises(AttributeError, self.SetValue, "currentcalc", 1)
@@ -78,6 +100,11 @@ class TCProperties(unittest.TestCase):
         
         self.assertRaises(ValueError, self.SetValue, "deltaIc", -0.1)
         self.assertRaises(ValueError, self.SetValue, "deltaIc",  0.0)
+        
+        self.assertRaises(ValueError, self.SetValue, "integrator", 3)
+        self.assertRaises(ValueError, self.SetValue, "tolerance",  0.0)
+        self.assertRaises(ValueError, self.SetValue, "steadyDelta",  0.0)
+        self.assertRaises(ValueError, self.SetValue, "solver", 2)
 
 #-----------------------------------------------------------------------------------------
 
@@ -101,6 +128,220 @@ class TCMethods(unittest.TestCase):
         self.assertRaises(ValueError, self.scc.getData, 50, 500,  0.0)
         self.assertRaises(ValueError, self.scc.getData, 50, 500, -0.1) 
 
+    def test_getDataArray(self):
+        # Mismos valores que la integración de Euler paso a paso
+        scc = self.scc
+        times, temps = scc.getDataArray(40, 900, 15*60, timex=-70)
+        K = 0.86/3600*scc.timeStep/scc.currentcalc.conductor.hcap
+        temp = 40
+        for k in range(len(times)):
+            self.assertEqual(times[k], -70 + k*scc.timeStep)
+            self.assertEqual(temps[k], temp)
+            Rtemp = scc.getResistance(temp)*.0003048
+            temp = temp + K*Rtemp*(900**2 - scc.getCurrent(temp)**2)
+        self.assertEqual(len(times), 15*60//7 + 2)
+        
+        data = scc.getData(40, 900, 15*60, timex=-70)
+        self.assertEqual(list(data), list(zip(times.tolist(), temps.tolist())))
+        # Errores
+        self.assertRaises(ValueError, scc.getDataArray, cx.TC_MAX+1, 500, 15*60)
+        self.assertRaises(ValueError, scc.getDataArray, 50, -0.1, 15*60)
+        self.assertRaises(ValueError, scc.getDataArray, 50, 500, 0.0)
+    
+    @unittest.skipIf(tctimecalc._fillEuler is None, "zx not available")
+    def test_getDataArrayZx(self):
+        # Loop de zx con los mismos valores que el de Python, ambas fórmulas
+        scc = self.scc
+        fill = tctimecalc._fillEuler
+        for formula in [cx.CF_IEEE, cx.CF_CLASSIC]:
+            scc.currentcalc.formula = formula
+            times, temps = scc.getDataArray(40, 900, 3600)
+            # Cada intervalo de getScheduleData en una llamada
+            d = scc.getScheduleData(40, [0, 1400, 2100, 4900], [600, 1100, 300], [20, 25, 30])
+            try:
+                tctimecalc._fillEuler = None
+                times0, temps0 = scc.getDataArray(40, 900, 3600)
+                d0 = scc.getScheduleData(40, [0, 1400, 2100, 4900], [600, 1100, 300], 
+                                         [20, 25, 30])
+            finally:
+                tctimecalc._fillEuler = fill
+            self.assertEqual(temps.tolist(), temps0.tolist())
+            self.assertEqual(d.temps.tolist(), d0.temps.tolist())
+        self.assertRaises(ValueError, scc.getDataArray, cx.TC_MAX+1, 500, 15*60)
+    
+    def test_integrators(self):
+        # RK4 y adaptivo contra referencia con pasos pequeños
+        scc = self.scc
+        for tcx, icfin in [(40, 900), (90, 300), (40, 1500), (40, 0)]:
+            scc.integrator = cx.TI_RK4
+            scc.timeStep = 0.1
+            ref = scc.getDataArray(tcx, icfin, 3600)[1][::10]
+            
+            scc.timeStep = 1
+            scc.integrator = cx.TI_EULER
+            euler = scc.getDataArray(tcx, icfin, 3600)[1]
+            scc.integrator = cx.TI_ADAPTIVE
+            times, temps = scc.getDataArray(tcx, icfin, 3600)
+            self.assertEqual(len(times), 3601)
+            self.assertEqual(temps[0], tcx)
+            self.assertTrue(abs(temps - ref).max() < max(abs(euler - ref).max(), 0.01))
+            
+            scc.integrator = cx.TI_RK4
+            scc.timeStep = 60
+            temps = scc.getDataArray(tcx, icfin, 3600)[1]
+            self.assertTrue(abs(temps - ref[::60]).max() < 0.001)
+            
+            # Con getData
+            data = scc.getData(tcx, icfin, 3600)
+            self.assertEqual([x[1] for x in data], temps.tolist())
+    
+    def test_steadyDelta(self):
+        # Pasos hasta el cambio menor que steadyDelta, luego temperatura de equilibrio
+        scc = self.scc
+        cc = scc.currentcalc
+        for timeStep in [7, 1]:
+            scc.timeStep = timeStep
+            for tcx, icfin in [(40, 900), (90, 300), (40, 0), (20, 0)]:
+                full = scc.getDataArray(tcx, icfin, 5*3600)[1]
+                Teq = cc.getTc(scc.ta, icfin) if full[-1] > scc.ta else tcx
+                for steady in [0.0001, 0.05]:
+                    scc.steadyDelta = steady
+                    temps = scc.getDataArray(tcx, icfin, 5*3600)[1]
+                    scc.steadyDelta = None
+                    self.assertEqual(len(temps), len(full))
+                    k = 2
+                    while abs(full[k] - full[k - 1]) >= steady:
+                        k = k + 1
+                    self.assertEqual(temps[:k + 1].tolist(), full[:k + 1].tolist())
+                    self.assertEqual(temps[k + 1:].tolist(), [Teq]*(len(full) - k - 1))
+                    self.assertTrue(abs(temps[-1] - full[-1]) < cc.deltaTemp)
+    
+    def test_getFinalTc(self):
+        # Mismo valor que getData(...).getTc(lapse)
+        scc = self.scc
+        for integrator in [cx.TI_EULER, cx.TI_RK4, cx.TI_ADAPTIVE]:
+            for steadyDelta in [None, 0.0001]:
+                scc.integrator = integrator
+                scc.steadyDelta = steadyDelta
+                for lapse in [1, 7, 100, 5*3600]:
+                    data = scc.getData(40, 900, lapse)
+                    self.assertEqual(scc.getFinalTc(40, 900, lapse), data.getTc(lapse))
+        self.assertRaises(ValueError, scc.getFinalTc, 50, -0.1, 15*60)
+        self.assertRaises(ValueError, scc.getFinalTc, 50, 500, 0.0)
+    
+    def test_solverBrent(self):
+        # Mismos resultados que la bisección de una instancia por defecto dentro de deltaIc
+        cab = self.scc.currentcalc.conductor
+        ref = cx.TcTimeCalc(cx.CurrentCalc(cab), 25.0)
+        scc = cx.TcTimeCalc(cx.CurrentCalc(cab), 25.0)
+        scc.solver = cx.SV_BRENT
+        for tcx in [45, 50, 75, 100]:
+            for factor in [0.5, 1.2, 2, 3]:
+                for lapse in [60, 300, 900]:
+                    x = scc.getIcini(tcx, factor, lapse)
+                    self.assertTrue(abs(x - ref.getIcini(tcx, factor, lapse)) <= ref.deltaIc)
+        cfin = [(70, 300, 600, None), (40, 600, 600, None), (70, 300, 600, 45), (60, 900, 60, None)]
+        for c in cfin:
+            self.assertTrue(abs(scc.getIcfin(*c) - ref.getIcfin(*c)) <= ref.deltaIc)
+        
+        # Errores
+        self.assertRaises(ValueError, scc.getIcini, scc.ta, 2, 500)
+        self.assertRaises(ValueError, scc.getIcfin, 50, 0.0, 500)
+    
+    def test_getIciniTable(self):
+        scc = self.scc
+        scc.timeStep = 5
+        tas = [10, 15, 20, 25]
+        lapses = [300, 600, 900]
+        factors = [1.5, 2]
+        table = scc.getIciniTable(55, tas, lapses, factors)
+        self.assertEqual(table.shape, (4, 3, 2))
+        scc.solver = cx.SV_BRENT
+        brent = scc.getIciniTable(55, tas, lapses, factors)
+        
+        # Valores de getIcini con el mismo solver, y con SV_BRENT dentro de deltaIc
+        ref = cx.TcTimeCalc(scc.currentcalc, 25.0)
+        ref.timeStep = 5
+        for i, ta in enumerate(tas):
+            ref.ta = ta
+            for j, lapse in enumerate(lapses):
+                for k, factor in enumerate(factors):
+                    self.assertEqual(table[i, j, k], ref.getIcini(55, factor, lapse))
+                    self.assertTrue(abs(brent[i, j, k] - table[i, j, k]) <= ref.deltaIc)
+        
+        # Con procesos
+        table2 = scc.getIciniTable(55, tas, lapses, factors, maxWorkers=2)
+        self.assertTrue(abs(brent - table2).max() < 0.01)
+        
+        self.assertEqual(scc.getIciniTable(55, [], lapses, factors).shape, (0, 3, 2))
+        self.assertRaises(ValueError, scc.getIciniTable, 55, [10, 55], lapses, factors)
+        self.assertRaises(ValueError, scc.getIciniTable, 55, tas, [0], factors)
+        self.assertRaises(ValueError, scc.getIciniTable, 55, tas, lapses, [0])
+        self.assertRaises(ValueError, scc.getIciniTable, 55, tas, lapses, factors, 0)
+    
+    def test_adiabatic(self):
+        scc = self.scc
+        cc = scc.currentcalc
+        
+        # Integración de dT/dt = R(T)*ic^2/hcap con pasos pequeños
+        temp = 50.0
+        dt = 0.0001
+        for x in range(10000):
+            temp = temp + 0.86/3600*dt/cc.conductor.hcap*cc.getResistance(temp)*.0003048*20000**2
+        self.assertAlmostEqual(scc.getAdiabaticTc(50, 20000, 1.0), temp, 2)
+        
+        # Valores vectorizados e inversa
+        ic = [[5000], [20000], [40000]]
+        t = [0.1, 0.5, 2]
+        tc = scc.getAdiabaticTc(50, ic, t)
+        self.assertEqual(tc.shape, (3, 3))
+        self.assertEqual(tc[1, 2], scc.getAdiabaticTc(50, 20000, 2))
+        self.assertTrue(abs(scc.getAdiabaticTime(50, ic, tc) - t).max() < 1e-9)
+        self.assertAlmostEqual(scc.getAdiabaticTc(50, 0, 10), 50, 9)
+        self.assertEqual(scc.getAdiabaticTime(50, [0, 1000], [60, 40]).tolist(), [float('inf'), 0])
+        # ic = 0 sin RuntimeWarning
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(scc.getAdiabaticTime(50, 0, 50), 0)
+            self.assertEqual(scc.getAdiabaticTime(50, 0, [40, 50, 60]).tolist(), [0, 0, float('inf')])
+        
+        self.assertRaises(ValueError, scc.getAdiabaticTc, cx.TC_MAX + 1, 1000, 1)
+        self.assertRaises(ValueError, scc.getAdiabaticTc, 50, -1, 1)
+        self.assertRaises(ValueError, scc.getAdiabaticTc, 50, 1000, -1)
+        self.assertRaises(ValueError, scc.getAdiabaticTime, 50, 1000, cx.TC_MAX + 1)
+
+    def test_getScheduleData(self):
+        scc = self.scc
+        # Un intervalo es getData
+        d1 = scc.getData(40, 600, 3600, 100)
+        d2 = scc.getScheduleData(40, [100, 3700], [600])
+        self.assertEqual(d1.times.tolist(), d2.times.tolist())
+        self.assertEqual(d1.temps.tolist(), d2.temps.tolist())
+        
+        # Varios intervalos y ta es getData encadenado
+        times = [0, 1400, 2100, 4900]
+        currents = [600, 1100, 300]
+        tas = [20, 25, 30]
+        scc.integrator = cx.TI_ADAPTIVE
+        d = scc.getScheduleData(40, times, currents, tas)
+        self.assertEqual(len(d), 701)
+        tc = 40
+        for i in range(3):
+            scc.ta = tas[i]
+            tc = scc.getData(tc, currents[i], times[i + 1] - times[i]).temps[-1]
+            self.assertAlmostEqual(d.getTc(times[i + 1]), tc, 3)
+        for integrator, delta in ((cx.TI_EULER, 0.5), (cx.TI_RK4, 0.01)):
+            scc.integrator = integrator
+            dx = scc.getScheduleData(40, times, currents, tas)
+            self.assertTrue(abs(dx.temps - d.temps).max() < delta)
+        
+        self.assertRaises(ValueError, scc.getScheduleData, 40, [0, 100], [600, 700])
+        self.assertRaises(ValueError, scc.getScheduleData, 40, [0, 100, 100], [600, 700])
+        self.assertRaises(ValueError, scc.getScheduleData, 40, [0, 100], [-1])
+        self.assertRaises(ValueError, scc.getScheduleData, 40, [0, 100], [scc.icmax + 1])
+        self.assertRaises(ValueError, scc.getScheduleData, 40, [0, 100], [600], [20, 25])
+        self.assertRaises(ValueError, scc.getScheduleData, 40, [0, 100], [600], [cx.TA_MAX + 1])
+
     def test_getIcini(self):
         # tcx
         self.assertRaises(ValueError, self.scc.getIcini, self.scc.ta, 2, 500)
@@ -202,14 +443,177 @@ class TCMethods(unittest.TestCase):
         data = [(0,0)]
         # Verifica que lanza error con len(data) < 2 
         self.assertRaises(ValueError, cx.TcTimeData, data)
+    
+    def test_TcTimeDataArrays(self):
+        def bisect(values, x, grow):
+            # Índices de la bisección original
+            ilo = 0
+            ihi = len(values) - 1
+            while ihi - ilo > 1:
+                mid = (ilo + ihi) // 2
+                if (x > values[mid]) == grow:
+                    ilo = mid
+                else:
+                    ihi = mid
+            return ilo, ihi
+        
+        def interp(x, x0, x1, y0, y1):
+            return (x - x0)*(y1 - y0)/(x1 - x0) + y0
+        
+        for Ifin in [900, 0]:
+            pairs = list(self.scc.getData(60, Ifin, 10*60, timex=-30))
+            times = [x[0] for x in pairs]
+            temps = [x[1] for x in pairs]
+            grow = temps[-1] > temps[0]
+            for data in [cx.TcTimeData(pairs), cx.TcTimeData.fromArrays(times, temps),
+                         cx.TcTimeData.fromSteps(temps, self.scc.timeStep, -30)]:
+                self.assertEqual(len(data), len(pairs))
+                self.assertEqual(list(data), pairs)
+                self.assertEqual(data, tuple(pairs))
+                self.assertEqual(data[-1], pairs[-1])
+                self.assertEqual(data[2:5], tuple(pairs[2:5]))
+                self.assertEqual(data.growing, grow)
+                self.assertEqual((data.timeMin, data.timeMax), (times[0], times[-1]))
+                self.assertEqual((data.tempMin, data.tempMax), (min(temps), max(temps)))
+                
+                for t in [-100, -30, -29, 0, 7, 7.5, 300, times[-1], 1000]:
+                    i, j = bisect(times, t, True)
+                    self.assertEqual(data.getTc(t), interp(t, times[i], times[j], temps[i], temps[j]))
+                for tc in [0, temps[0], 55.5, 60.5, 65, temps[-1], 200]:
+                    i, j = bisect(temps, tc, grow)
+                    tx = max(interp(tc, temps[i], temps[j], times[i], times[j]), 0)
+                    self.assertEqual(data.getTime(tc), tx)
+        
+        self.assertRaises(ValueError, cx.TcTimeData.fromArrays, [0, 1], [0])
+        self.assertRaises(ValueError, cx.TcTimeData.fromSteps, [0], 1)
+        self.assertRaises(ValueError, cx.TcTimeData.fromSteps, [0, 1], 0)
+    
+    def test_TcTimeDataTuple(self):
+        # Operaciones de tuple que se mantienen
+        pairs = tuple(self.scc.getData(60, 900, 10*60))
+        for data in [cx.TcTimeData(pairs), cx.TcTimeData.fromSteps([x[1] for x in pairs], 7)]:
+            self.assertTrue(isinstance(data, tuple))
+            self.assertNotEqual(data, list(pairs))
+            self.assertEqual(json.dumps(data), json.dumps(pairs))
+            self.assertEqual(data + data, pairs + pairs)
+            self.assertEqual(data + pairs[:2], pairs + pairs[:2])
+            self.assertEqual(pairs[:2] + data, pairs[:2] + pairs)
+            self.assertEqual(data*2, pairs*2)
+            self.assertEqual(2*data, pairs*2)
+            self.assertEqual(data.index(pairs[3]), 3)
+            self.assertEqual(data.count(pairs[3]), 1)
+            self.assertTrue(pairs[3] in data)
+            self.assertEqual(list(reversed(data)), list(reversed(pairs)))
+            self.assertEqual(hash(data), hash(pairs))
+            self.assertEqual(len(set([data, pairs])), 1)
+            self.assertEqual(data, pickle.loads(pickle.dumps(data)))
+            self.assertEqual(pickle.loads(pickle.dumps(data)).temps.tolist(), data.temps.tolist())
+            self.assertRaises(ValueError, data.index, (-1, 0))
+            self.assertRaises(TypeError, lambda: data + [pairs[0]])
+    
+    @unittest.skipIf(tctimecalc._fillEuler is None, "zx not available")
+    def test_TcTimeDataZx(self):
+        # Mismos valores y consultas que zx.TcTimeData
+        from cer.conductor import zx
+        for Ifin in [900, 0]:
+            data = self.scc.getData(60, Ifin, 10*60, timex=-30)
+            zdata = zx.TcTimeData(data)
+            self.assertEqual(data, zdata.data)
+            self.assertEqual(data.times.tolist(), list(zdata.times))
+            self.assertEqual(data.temps.tolist(), list(zdata.temps))
+            self.assertEqual((data.growing, data.tempMin, data.tempMax, data.timeMin, 
+                              data.timeMax), (zdata.growing, zdata.tempMin, zdata.tempMax, 
+                              zdata.timeMin, zdata.timeMax))
+            for t in [-30, 0, 7.5, 300, 570]:
+                self.assertEqual(data.getTc(t), zdata.getTc(t))
+            for tc in [55.5, 60.5, 65, data[-1][1]]:
+                self.assertEqual(data.getTime(tc), zdata.getTime(tc))
+    
+    def test_TcTimeDataQueries(self):
+        # Mismos valores que getTime y getTc
+        for Ifin in [900, 0]:
+            pairs = list(self.scc.getData(60, Ifin, 10*60, timex=-30))
+            times = [x[0] for x in pairs]
+            temps = [x[1] for x in pairs]
+            ts = [-100, -30, -29, 0, 7, 7.5, 300] + times + [1000]
+            tcs = [0, 55.5, 60.5, 65, 200] + temps[::7]
+            for data in [cx.TcTimeData(pairs), cx.TcTimeData.fromSteps(temps, 7, -30)]:
+                self.assertEqual(data.getTcArray(ts).tolist(), [data.getTc(t) for t in ts])
+                self.assertEqual(data.getTimeArray(tcs).tolist(), [data.getTime(tc) for tc in tcs])
+                self.assertEqual(data.getTcArray([[0, 7.5]]).shape, (1, 2))
+                self.assertEqual(float(data.getTcArray(7.5)), data.getTc(7.5))
+
+#-----------------------------------------------------------------------------------------
+
+class TSMethods(unittest.TestCase):
+    
+    def setUp(self):
+        cab = cx.Conductor(category=cx.CC_AAAC, name="AAAC 740,8 MCM FLINT",
+                           diameter=25.17, r25=0.089360, hcap=0.052744)
+        cc = cx.CurrentCalc(cab)
+        self.scc = cx.TcTimeCalc(cc, 25.0)
+        self.scc.timeStep = 7
+    
+    def test_constructor(self):
+        st = cx.TcTimeState(self.scc, 40)
+        self.assertEqual(st.tcalc, self.scc)
+        self.assertEqual(st.tc, 40)
+        self.assertEqual(st.time, 0)
+        self.assertRaises(ValueError, cx.TcTimeState, self.scc, cx.TC_MIN - 1)
+        self.assertRaises(ValueError, cx.TcTimeState, self.scc, cx.TC_MAX + 1)
+    
+    def test_update(self):
+        # Pasos timeStep son getData
+        d = self.scc.getData(40, 600, 700)
+        st = cx.TcTimeState(self.scc, 40)
+        for i in range(100):
+            tc = st.update(600, 25, 7)
+        self.assertEqual(tc, d.temps[-1])
+        self.assertEqual(st.tc, tc)
+        self.assertEqual(st.time, 700)
+        
+        # Arreglos son updates sucesivos
+        ics = [600, 900, 1200, 300]
+        tas = [20, 22, 24, 26]
+        st1 = cx.TcTimeState(self.scc, 40, 100)
+        st2 = cx.TcTimeState(self.scc, 40, 100)
+        out = st1.update(ics, tas, 30)
+        self.assertEqual(len(out), 4)
+        for i in range(4):
+            self.assertEqual(st2.update(ics[i], tas[i], 30), out[i])
+        self.assertEqual(st1.tc, out[-1])
+        self.assertEqual(st1.time, 220)
+        self.assertEqual(len(st1.update([], 25, 1)), 0)
+        
+        # Pasos mayores que timeStep
+        st = cx.TcTimeState(self.scc, 40)
+        self.assertAlmostEqual(st.update(600, 25, 3600), self.scc.getFinalTc(40, 600, 3600), 2)
+        
+        # Pasos de RK4 con ese integrador
+        self.scc.integrator = cx.TI_RK4
+        d = self.scc.getData(40, 600, 700)
+        st = cx.TcTimeState(self.scc, 40)
+        out = st.update([600]*100, 25, 7)
+        self.assertEqual(out.tolist(), d.temps[1:].tolist())
+    
+    def test_updateErrors(self):
+        st = cx.TcTimeState(self.scc, 40)
+        self.assertRaises(ValueError, st.update, -1, 25, 1)
+        self.assertRaises(ValueError, st.update, 600, cx.TA_MIN - 1, 1)
+        self.assertRaises(ValueError, st.update, 600, [25, cx.TA_MAX + 1], 1)
+        self.assertRaises(ValueError, st.update, 600, 25, 0)
+        self.assertRaises(ValueError, st.update, [600, 20000], 25, 60)
+        self.assertEqual(st.tc, 40)
+        self.assertEqual(st.time, 0)
 
 #-----------------------------------------------------------------------------------------
 
 s1 = unittest.TestLoader().loadTestsFromTestCase(TCConstructor)
 s2 = unittest.TestLoader().loadTestsFromTestCase(TCProperties)
 s3 = unittest.TestLoader().loadTestsFromTestCase(TCMethods)
+s4 = unittest.TestLoader().loadTestsFromTestCase(TSMethods)
 
-suite = unittest.TestSuite([s1, s2, s3])
+suite = unittest.TestSuite([s1, s2, s3, s4])
 
 #-----------------------------------------------------------------------------------------
 if __name__ == '__main__':
@@ -2,12 +2,18 @@
 
 import unittest
 
-import currentcalc_test, tctimecalc_test, tensioncalc_test, operatingtable_test
+import catalog_test, currentcalc_test, currentsurface_test, dlr_test, fleet_test
+import registry_test, tctimecalc_test, tensioncalc_test, operatingtable_test
 
 #-----------------------------------------------------------------------------------------
 
-slist = [currentcalc_test.suite,
+slist = [catalog_test.suite,
+         currentcalc_test.suite,
+         currentsurface_test.suite,
+         dlr_test.suite,
+         fleet_test.suite,
          operatingtable_test.suite,
+         registry_test.suite,
          tctimecalc_test.suite, 
          tensioncalc_test.suite, 
          ]
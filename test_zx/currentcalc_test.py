@@ -2,6 +2,7 @@
 
 from cer.conductor import zx
 import unittest
+import numpy as np
 
 #-----------------------------------------------------------------------------------------
 
@@ -23,6 +24,7 @@ class TCConstructor(unittest.TestCase):
         self.assertEqual(cc.emissivity, 0.5)
         self.assertEqual(cc.formula, zx.CF_IEEE)
         self.assertEqual(cc.deltaTemp, 0.01)
+        self.assertEqual(cc.solver, zx.SV_BISECTION)
     
     #--------------------------------------------------------------------------
     # Verifica errores en parámetros de conductor y category conductor al crear CurrentCalc
@@ -120,6 +122,14 @@ class TCProperties(unittest.TestCase):
         self.assertTrue(self.SetValue("deltaTemp", 0.0001))
         self.assertRaises(ValueError, self.SetValue, "deltaTemp", -0.0001)
         self.assertRaises(ValueError, self.SetValue, "deltaTemp", 0)
+    
+    def test_solver(self):
+        self.cc.solver = zx.SV_BRENT
+        self.assertEqual(self.cc.solver, zx.SV_BRENT)
+        self.assertTrue(self.SetValue("solver", zx.SV_BISECTION))
+        self.assertTrue(self.SetValue("solver", zx.SV_BRENT))
+        self.assertRaises(ValueError, self.SetValue, "solver", -1)
+        self.assertRaises(ValueError, self.SetValue, "solver", 2)
 
 #-----------------------------------------------------------------------------------------
 
@@ -164,6 +174,43 @@ class TCMethods(unittest.TestCase):
         self.assertRaises(ValueError, self.cc.getCurrent, 25, zx.TC_MIN - 0.001)
         self.assertRaises(ValueError, self.cc.getCurrent, 25, zx.TC_MAX + 0.001)
     
+    def test_updateTerms(self):
+        # Cambios después de crear CurrentCalc dan los resultados de un CurrentCalc nuevo
+        values = [("altitude", 1500.0), ("airVelocity", 0.5), ("sunEffect", 0.3), 
+                  ("emissivity", 0.9)]
+        for i, (prop, value) in enumerate(values):
+            amp1 = self.cc.getCurrent(25, 60)
+            setattr(self.cc, prop, value)
+            amp2 = self.cc.getCurrent(25, 60)
+            self.assertNotEqual(amp1, amp2)
+            
+            cc = zx.CurrentCalc(self.cc.conductor)
+            for p, v in values[:i + 1]:
+                setattr(cc, p, v)
+            self.assertEqual(amp2, cc.getCurrent(25, 60))
+            self.assertEqual(self.cc.getCurrent(10, 100), cc.getCurrent(10, 100))
+    
+    def test_getCurrentArray(self):
+        # Verifica que los cálculos vectorizados coincidan con getCurrent
+        ta = np.array([-10.0, 10.0, 25.0, 35.0, 40.0])
+        tc = np.array([[30.0], [50.0], [75.0], [125.0]])
+        for formula in [zx.CF_IEEE, zx.CF_CLASSIC]:
+            self.cc.formula = formula
+            amps = self.cc.getCurrentArray(ta, tc)
+            self.assertEqual(amps.shape, (4, 5))
+            for i in range(4):
+                for j in range(5):
+                    self.assertAlmostEqual(amps[i, j], self.cc.getCurrent(ta[j], tc[i, 0]), 8)
+        
+        self.assertEqual(self.cc.getCurrentArray([25, 26], 25).tolist(), [0, 0])
+        self.assertEqual(self.cc.getCurrentArray([], 25).shape, (0,))
+        
+        # Verifica rangos de entrada
+        self.assertRaises(ValueError, self.cc.getCurrentArray, [25, zx.TA_MIN - 0.001], 50)
+        self.assertRaises(ValueError, self.cc.getCurrentArray, [25, zx.TA_MAX + 0.001], 50)
+        self.assertRaises(ValueError, self.cc.getCurrentArray, 25, [50, zx.TC_MIN - 0.001])
+        self.assertRaises(ValueError, self.cc.getCurrentArray, 25, [50, zx.TC_MAX + 0.001])
+    
     def test_getTc(self):
         # Verifica que los cálculos de getTc sean coherentes con getCurrent
         amp1 = self.cc.getCurrent(25, 50)
@@ -188,6 +235,66 @@ class TCMethods(unittest.TestCase):
         self.assertTrue(self.cc.getTc(30, Icmax))
         self.assertRaises(ValueError, self.cc.getTc, 30, Icmax + 0.001)
     
+    def test_solverBrent(self):
+        # Verifica que ambos métodos entreguen el mismo resultado dentro de deltaTemp
+        for sun in [0.0, 1.0]:
+            self.cc.sunEffect = sun
+            for ta, ic in [(25, 0), (25, 1), (25, 517.7), (-40, 100), (35, 1500), (80, 10)]:
+                self.cc.solver = zx.SV_BISECTION
+                tc1 = self.cc.getTc(ta, ic)
+                self.cc.solver = zx.SV_BRENT
+                tc2 = self.cc.getTc(ta, ic)
+                self.assertTrue(abs(tc1 - tc2) <= 2*self.cc.deltaTemp)
+            for tc, ic in [(50, 300), (65, 900), (100, 1200), (-40, 0), (50, 0)]:
+                self.cc.solver = zx.SV_BISECTION
+                ta1 = self.cc.getTa(tc, ic)
+                self.cc.solver = zx.SV_BRENT
+                ta2 = self.cc.getTa(tc, ic)
+                self.assertTrue(abs(ta1 - ta2) <= 2*self.cc.deltaTemp)
+        
+        Icmax = self.cc.getCurrent(30, zx.TC_MAX)
+        self.assertTrue(abs(self.cc.getTc(30, Icmax) - zx.TC_MAX) <= self.cc.deltaTemp)
+        self.assertRaises(ValueError, self.cc.getTc, 30, Icmax + 0.001)
+    
+    def test_iterTc(self):
+        # Verifica que la secuencia coincida con getTc dentro de deltaTemp
+        tas = [25, 25.5, 26, 30, 30, 10, 10, -20, 40]
+        ics = [500, 510, 0, 800, 50, 50, 1200, 1200, 10]
+        for solver in [zx.SV_BISECTION, zx.SV_BRENT]:
+            self.cc.solver = solver
+            tcs = list(self.cc.iterTc(tas, ics))
+            self.assertEqual(len(tcs), len(tas))
+            for ta, ic, tc in zip(tas, ics, tcs):
+                self.assertTrue(abs(tc - self.cc.getTc(ta, ic)) <= 2*self.cc.deltaTemp)
+        
+        self.assertEqual(list(self.cc.iterTc([], [])), [])
+        Icmax = self.cc.getCurrent(30, zx.TC_MAX)
+        tcs = list(self.cc.iterTc([30, 30], [100, Icmax]))
+        self.assertTrue(abs(tcs[1] - zx.TC_MAX) <= self.cc.deltaTemp)
+        self.assertRaises(ValueError, list, self.cc.iterTc([30, 30], [100, Icmax + 0.001]))
+        self.assertRaises(ValueError, list, self.cc.iterTc([30, 30], [100, -1]))
+        self.assertRaises(ValueError, list, self.cc.iterTc([30, zx.TA_MAX + 1], [100, 100]))
+    
+    def test_getTcArray(self):
+        # Verifica que los cálculos vectorizados coincidan con getTc
+        ta = np.array([-10.0, 10.0, 25.0, 35.0])
+        ic = np.array([[0.0], [250.0], [600.0], [1200.0]])
+        tcs = self.cc.getTcArray(ta, ic)
+        self.assertEqual(tcs.shape, (4, 4))
+        for i in range(4):
+            for j in range(4):
+                self.assertTrue(abs(tcs[i, j] - self.cc.getTc(ta[j], ic[i, 0])) <= self.cc.deltaTemp)
+        
+        amps = self.cc.getCurrentArray(ta, 75.0)
+        self.assertTrue((abs(self.cc.getTcArray(ta, amps) - 75.0) < self.cc.deltaTemp).all())
+        
+        # Verifica rangos de entrada
+        Icmax = self.cc.getCurrent(30, zx.TC_MAX)
+        self.assertRaises(ValueError, self.cc.getTcArray, [25, zx.TA_MIN - 0.001], 100)
+        self.assertRaises(ValueError, self.cc.getTcArray, [25, zx.TA_MAX + 0.001], 100)
+        self.assertRaises(ValueError, self.cc.getTcArray, 30, [100, -0.001])
+        self.assertRaises(ValueError, self.cc.getTcArray, 30, [100, Icmax + 0.001])
+    
     def test_getTa(self):
         # Verifica que los cálculos de getTa sean coherentes con getCurrent
         amp1 = self.cc.getCurrent(25, 50)
@@ -213,6 +320,32 @@ class TCMethods(unittest.TestCase):
         self.assertRaises(ValueError, self.cc.getTa, 100, Icmin - 0.0001)
         self.assertTrue(self.cc.getTa(100, Icmax))
         self.assertRaises(ValueError, self.cc.getTa, 100, Icmax + 0.0001)
+    
+    def test_getTaArray(self):
+        # Verifica que los cálculos vectorizados coincidan con getTa
+        tc = np.array([50.0, 65.0, 100.0])
+        ic = np.array([[300.0], [600.0], [900.0]])
+        tas = self.cc.getTaArray(tc, ic)
+        self.assertEqual(tas.shape, (3, 3))
+        for i in range(3):
+            for j in range(3):
+                try:
+                    ta = self.cc.getTa(tc[j], ic[i, 0])
+                except ValueError:
+                    self.assertTrue(np.isnan(tas[i, j]))
+                else:
+                    self.assertTrue(abs(tas[i, j] - ta) <= self.cc.deltaTemp)
+        
+        amps = self.cc.getCurrentArray([25, 35], [50, 65])
+        self.assertTrue((abs(self.cc.getTaArray([50, 65], amps) - [25, 35]) < self.cc.deltaTemp).all())
+        
+        # Elementos fuera de rango retornan NaN
+        Icmin = self.cc.getCurrent(zx.TA_MAX, 100)
+        Icmax = self.cc.getCurrent(zx.TA_MIN, 100)
+        tas = self.cc.getTaArray([zx.TC_MIN - 0.0001, zx.TC_MAX + 0.0001, 100, 100, 100],
+                                 [0, 0, Icmin - 0.0001, Icmax + 0.0001, Icmax])
+        self.assertEqual(np.isnan(tas).tolist(), [True, True, True, True, False])
+        self.assertEqual(self.cc.getTaArray(zx.TC_MIN, 0), zx.TC_MIN)
         
 #-----------------------------------------------------------------------------------------
 
@@ -2,6 +2,7 @@
 
 from cer.conductor import zx
 import unittest
+import numpy as np
 
 #-----------------------------------------------------------------------------------------
 
@@ -78,11 +79,51 @@ class TCTablaOperacion(unittest.TestCase):
         ic1 = self.item1.currentcalc.getCurrent(ta, self.item1.tempMaxOp)
         self.assertEqual(ic, min([ic0, ic1]))
 
+
+#-----------------------------------------------------------------------------------------
+
+class TCTablaOperacionArray(unittest.TestCase):
+    
+    def setUp(self):
+        cab0 = zx.Conductor(zx.CC_CU, diameter=10.5, r25=0.2767)            # CU 2/0 AWG
+        cab1 = zx.Conductor(zx.CC_CUWELD, diameter=9.78, r25=1.030581)      # COPPERWELD 3/8
+        self.cc0 = zx.CurrentCalc(cab0)
+        self.cc1 = zx.CurrentCalc(cab1)
+        self.item0 = zx.OperatingItem(self.cc0,  50.0, 1)
+        self.item1 = zx.OperatingItem(self.cc1, 125.0, 1)
+    
+    def test_tableGetLimitArray(self):
+        opt = zx.OperatingTable()
+        ta = np.array([-10.0, 25.0, 49.9, 80.0])
+        amps, index = opt.getLimitArray(ta)
+        self.assertEqual(amps.tolist(), [100000]*4)
+        self.assertEqual(index.tolist(), [-1]*4)
+        
+        item2 = zx.OperatingItem(self.cc0, 40.0, 1)
+        opt.items.extend([self.item0, self.item1, item2])
+        amps, index = opt.getLimitArray(ta)
+        self.assertEqual(amps.shape, (4,))
+        for i, t in enumerate(ta):
+            self.assertAlmostEqual(amps[i], opt.getCurrent(t), 8)
+            self.assertAlmostEqual(amps[i], opt.items[index[i]].getCurrent(t), 8)
+        self.assertEqual(index.tolist(), [1, 2, 0, 0])
+        self.assertEqual(opt.getLimitArray(30.0)[1], 2)
+        self.assertTrue(np.allclose(opt.getCurrentArray(ta), amps, rtol=0, atol=1e-8))
+        self.assertTrue(np.allclose(item2.getCurrentArray(ta), 
+                                    [item2.getCurrent(t) for t in ta], rtol=0, atol=1e-8))
+        
+        amps, index = opt.getLimitArray([[25.0], [80.0]])
+        self.assertEqual(amps.shape, (2, 1))
+        self.assertEqual(index.shape, (2, 1))
+        self.assertRaises(ValueError, opt.getLimitArray, [zx.TA_MAX + 1])
+
 #-----------------------------------------------------------------------------------------
 
 s1 = unittest.TestLoader().loadTestsFromTestCase(TCTablaOperacion)
 
-suite = unittest.TestSuite([s1])
+s2 = unittest.TestLoader().loadTestsFromTestCase(TCTablaOperacionArray)
+
+suite = unittest.TestSuite([s1, s2])
 
 #-----------------------------------------------------------------------------------------
 if __name__ == '__main__':
@@ -1,28 +1,34 @@
 # CRISTIAN ECHEVERRÍA RABÍ
 
-from libc.math cimport pow, sqrt
+from libc.math cimport pow, sqrt, fabs, NAN
+
+import numpy as np
 
 #-----------------------------------------------------------------------------------------
 # Constants
 
 cdef int _CF_IEEE   = 0
 cdef int _CF_CLASSIC = 1
+cdef int _SV_BISECTION = 0
+cdef int _SV_BRENT = 1
 cdef double _TA_MIN = -90.0
 cdef double _TA_MAX =  90.0
 cdef double _TC_MIN =  -90.0
 cdef double _TC_MAX = 2000.0
 cdef double _TENSION_MAX = 50000
-#cdef double _ITER_MAX = 20000
+cdef int _ITER_MAX = 20000
 
 
 CF_IEEE = _CF_IEEE
 CF_CLASSIC = _CF_CLASSIC
+SV_BISECTION = _SV_BISECTION
+SV_BRENT = _SV_BRENT
 TA_MIN = _TA_MIN
 TA_MAX = _TA_MAX
 TC_MIN = _TC_MIN
 TC_MAX = _TC_MAX
 TENSION_MAX = _TENSION_MAX
-#ITER_MAX = _ITER_MAX
+ITER_MAX = _ITER_MAX
 
 #-----------------------------------------------------------------------------------------
 # Category 
@@ -56,6 +62,45 @@ cdef class Conductor:
         self.r25 = r25
         self.hcap = hcap
 
+#-----------------------------------------------------------------------------------------
+# Heat balance
+
+cdef double _heatCurrent(double ta, double tc, double r25, double alpha, double D, 
+                         double D75, double Pb, double V, double Qr0, double Qs, int formula):
+    # Current with the terms of CurrentCalc, without range checks
+    cdef double Rc, Tm, Rf, Uf, Kf, Qc, factor, Qc1, Qc2, LK, MK, Qr
+    
+    if ta >= tc:
+        return 0.0
+    
+    Rc = r25*(1 + alpha*(tc - 25))*0.0003048                            # Resistencia en ohm/pies
+    Tm = 0.5*(tc + ta)                                                  # Temperatura media
+    Rf = 0.2901577*Pb/(273 + Tm)                                        # Densidad rel.aire ¿lb/ft^3?
+    Uf = 0.04165 + 0.000111*Tm                                          # Viscosidad abs. aire ¿lb/(ft x hora)
+    Kf = 0.00739 + 0.0000227*Tm                                         # Coef. conductividad term. aire [Watt/(ft x °C)]
+    Qc = .283*sqrt(Rf)*D75*pow(tc - ta, 1.25)                           # watt/ft
+    
+    if V != 0:
+        factor = D*Rf*V/Uf
+        Qc1 = 0.1695*Kf*(tc - ta)*pow(factor, 0.6)
+        Qc2 = Kf*(tc - ta)*(1.01 + 0.371*pow(factor, 0.52))
+        if formula == 0:                  # IEEE criteria
+            Qc = max(Qc, Qc1, Qc2)
+        else:                             # CLASSIC criteria
+            if factor < 12000:
+                Qc = Qc2
+            else:
+                Qc = Qc1
+    
+    LK = pow((tc + 273)/100, 4)
+    MK = pow((ta + 273)/100, 4)
+    Qr = Qr0*(LK - MK)
+    
+    if (Qc + Qr) < Qs: 
+        return 0.0
+    else: 
+        return sqrt((Qc + Qr - Qs)/Rc)
+
 #-----------------------------------------------------------------------------------------
 # CurrentCalc
 
@@ -64,7 +109,8 @@ cdef class CurrentCalc:
     cdef readonly Conductor conductor
     cdef double _r25, _diameter, _alpha
     cdef double _altitude, _airVelocity, _sunEffect, _emissivity, _deltaTemp
-    cdef int _formula
+    cdef double _D, _D75, _Pb, _V, _Qr0, _Qs
+    cdef int _formula, _solver
 
     def __cinit__(self, Conductor conductor):
         if conductor.diameter <= 0: raise ValueError("diameter <= 0")
@@ -85,6 +131,8 @@ cdef class CurrentCalc:
         self._emissivity = 0.5
         self._formula = _CF_IEEE
         self._deltaTemp = 0.01
+        self._solver = _SV_BISECTION
+        self._updateTerms()
 
     def getResistance(self, double tc):
         return self._getResistance(tc)
@@ -102,43 +150,45 @@ cdef class CurrentCalc:
         if ta > _TA_MAX: raise ValueError("ta > TA_MAX")
         if tc < _TC_MIN: raise ValueError("tc < TC_MIN")
         if tc > _TC_MAX: raise ValueError("tc > TC_MAX")
-
-        cdef double D, Pb, V, Rc, Tm, Rf, Uf, Kf, Qc, factor, Qc1, Qc2, LK, MK, Qr, Qs
-        
-        if ta >= tc:
-            return 0.0
-        
-        D = self._diameter/25.4                                             # Diámetro en pulgadas
-        Pb = pow(10, 1.880813592 - self._altitude/18336)                    # Presión barométrica en cmHg
-        V = self._airVelocity*3600                                          # Vel. viento en pies/hora
-        Rc = self._getResistance(tc)*0.0003048                              # Resistencia en ohm/pies
-        Tm = 0.5*(tc + ta)                                                  # Temperatura media
-        Rf = 0.2901577*Pb/(273 + Tm)                                        # Densidad rel.aire ¿lb/ft^3?
-        Uf = 0.04165 + 0.000111*Tm                                          # Viscosidad abs. aire ¿lb/(ft x hora)
-        Kf = 0.00739 + 0.0000227*Tm                                         # Coef. conductividad term. aire [Watt/(ft x °C)]
-        Qc = .283*sqrt(Rf)*pow(D, 0.75)*pow(tc - ta, 1.25)                  # watt/ft
-        
-        if V != 0:
-            factor = D*Rf*V/Uf
-            Qc1 = 0.1695*Kf*(tc - ta)*pow(factor, 0.6)
-            Qc2 = Kf*(tc - ta)*(1.01 + 0.371*pow(factor, 0.52))
-            if self._formula == 0:            # IEEE criteria
-                Qc = max(Qc, Qc1, Qc2)
-            else:                             # CLASSIC criteria
-                if factor < 12000:
-                    Qc = Qc2
-                else:
-                    Qc = Qc1
+        return self._calcCurrent(ta, tc)
+    
+    def getCurrentArray(self, ta, tc):
+        cdef const double[:] vta, vtc
+        cdef double[:] vout
+        cdef Py_ssize_t i, n
+        
+        ata, atc = np.broadcast_arrays(np.asarray(ta, dtype=np.float64), 
+                                       np.asarray(tc, dtype=np.float64))
+        shape = ata.shape
+        vta = np.ascontiguousarray(ata).ravel()
+        vtc = np.ascontiguousarray(atc).ravel()
+        n = vta.shape[0]
         
-        LK = pow((tc + 273)/100, 4)
-        MK = pow((ta + 273)/100, 4)
-        Qr = 0.138*D*self._emissivity*(LK - MK)
-        Qs = 3.87*D*self._sunEffect
+        for i in range(n):
+            if vta[i] < _TA_MIN: raise ValueError("ta < TA_MIN")
+            if vta[i] > _TA_MAX: raise ValueError("ta > TA_MAX")
+            if vtc[i] < _TC_MIN: raise ValueError("tc < TC_MIN")
+            if vtc[i] > _TC_MAX: raise ValueError("tc > TC_MAX")
         
-        if (Qc + Qr) < Qs: 
-            return 0.0
-        else: 
-            return sqrt((Qc + Qr - Qs)/Rc)
+        out = np.empty(n, dtype=np.float64)
+        vout = out
+        for i in range(n):
+            vout[i] = self._calcCurrent(vta[i], vtc[i])
+        return out.reshape(shape)
+    
+    cdef double _calcCurrent(self, double ta, double tc):
+        # _getCurrent without range checks
+        return _heatCurrent(ta, tc, self._r25, self._alpha, self._D, self._D75, self._Pb,
+                            self._V, self._Qr0, self._Qs, self._formula)
+    
+    cdef void _updateTerms(self):
+        # Terms of _calcCurrent that depend only on conductor and settings
+        self._D = self._diameter/25.4                                       # Diámetro en pulgadas
+        self._D75 = pow(self._D, 0.75)
+        self._Pb = pow(10, 1.880813592 - self._altitude/18336)              # Presión barométrica en cmHg
+        self._V = self._airVelocity*3600                                    # Vel. viento en pies/hora
+        self._Qr0 = 0.138*self._D*self._emissivity
+        self._Qs = 3.87*self._D*self._sunEffect
     
     def getTc(self, double ta, double ic):
         return self._getTc(ta, ic)
@@ -147,11 +197,17 @@ cdef class CurrentCalc:
         if ta < _TA_MIN: raise ValueError("ta < TA_MIN")
         if ta > _TA_MAX: raise ValueError("ta > TA_MAX")
         if ic < 0: raise ValueError("ic < 0")
-        if ic > self._getCurrent(ta, _TC_MAX): raise ValueError("ic > Imax (TC_MAX)")
-
-        cdef double Tmin, Tmax, Tmed, Imed
+        
+        cdef double Tmin, Tmax, Tmed, Imed, Icmax
         #cdef int cuenta
         
+        Icmax = self._getCurrent(ta, _TC_MAX)
+        if ic > Icmax: raise ValueError("ic > Imax (TC_MAX)")
+        
+        # With ic = 0 the root is not unique (sun effect), bisection gives the highest one
+        if self._solver == _SV_BRENT and ic > 0:
+            return self._brent(0, ta, ic, ta, _TC_MAX, -ic, Icmax - ic)
+        
         Tmin = ta
         Tmax = _TC_MAX
         #cuenta = 0
@@ -168,27 +224,155 @@ cdef class CurrentCalc:
             #    raise RuntimeError(err_msg)
         return Tmed
     
+    def getTcArray(self, ta, ic):
+        cdef const double[:] vta, vic
+        cdef double[:] vout
+        cdef Py_ssize_t i, n
+        
+        ata, aic = np.broadcast_arrays(np.asarray(ta, dtype=np.float64), 
+                                       np.asarray(ic, dtype=np.float64))
+        shape = ata.shape
+        vta = np.ascontiguousarray(ata).ravel()
+        vic = np.ascontiguousarray(aic).ravel()
+        n = vta.shape[0]
+        
+        out = np.empty(n, dtype=np.float64)
+        vout = out
+        for i in range(n):
+            vout[i] = self._getTc(vta[i], vic[i])
+        return out.reshape(shape)
+    
+    def iterTc(self, tas, ics):
+        cdef double tc, tcx, step
+        cdef bint first = True
+        
+        tc = 0.0
+        step = 2*self._deltaTemp
+        for ta, ic in zip(tas, ics):
+            # With ic = 0 the root is not unique (sun effect), _getTc gives the highest one
+            if first or ic == 0:
+                tcx = self._getTc(ta, ic)
+                first = False
+            else:
+                tcx = self._getTcNear(ta, ic, tc, step)
+                step = max(fabs(tcx - tc), 2*self._deltaTemp)
+            tc = tcx
+            yield tc
+    
+    cdef double _getTcNear(self, double ta, double ic, double t0, double step) except -1000:
+        # _getTc for ic > 0 with bracket around t0, expanded doubling step until it 
+        # contains the root: _calcCurrent(ta, Tmin) <= ic < _calcCurrent(ta, Tmax)
+        if ta < _TA_MIN: raise ValueError("ta < TA_MIN")
+        if ta > _TA_MAX: raise ValueError("ta > TA_MAX")
+        if ic < 0: raise ValueError("ic < 0")
+        
+        cdef double Tmin, Tmax, Tmed, Imed, fmin, fmax, f0
+        
+        t0 = min(max(t0, ta), _TC_MAX)
+        f0 = self._calcCurrent(ta, t0) - ic
+        if f0 > 0:
+            Tmax = t0
+            fmax = f0
+            Tmin = max(t0 - step, ta)
+            fmin = self._calcCurrent(ta, Tmin) - ic
+            while fmin > 0:                            # En Tmin = ta, fmin = -ic < 0
+                Tmax = Tmin
+                fmax = fmin
+                step = 2*step
+                Tmin = max(Tmin - step, ta)
+                fmin = self._calcCurrent(ta, Tmin) - ic
+        else:
+            Tmin = t0
+            fmin = f0
+            Tmax = min(t0 + step, _TC_MAX)
+            fmax = self._calcCurrent(ta, Tmax) - ic
+            while fmax <= 0 and Tmax < _TC_MAX:
+                Tmin = Tmax
+                fmin = fmax
+                step = 2*step
+                Tmax = min(Tmax + step, _TC_MAX)
+                fmax = self._calcCurrent(ta, Tmax) - ic
+            if fmax < 0: raise ValueError("ic > Imax (TC_MAX)")
+        
+        if self._solver == _SV_BRENT:
+            return self._brent(0, ta, ic, Tmin, Tmax, fmin, fmax)
+        
+        Tmed = 0.5*(Tmin + Tmax)
+        while (Tmax - Tmin) > self._deltaTemp:
+            Tmed = 0.5*(Tmin + Tmax)
+            Imed = self._calcCurrent(ta, Tmed)
+            if Imed > ic:
+                Tmax = Tmed
+            else:
+                Tmin = Tmed
+        return Tmed
+    
     def getTa(self, double tc, double ic):
         return self._getTa(tc, ic)
     
     cdef double _getTa(self, double tc, double ic) except -1000:
         if tc < _TC_MIN: raise ValueError("tc < TC_MIN")
         if tc > _TC_MAX: raise ValueError("tc > TC_MAX")
-        if ic < self._getCurrent(_TA_MAX, tc): raise ValueError("ic < Imin (TA_MAX)")
-        if ic > self._getCurrent(_TA_MIN, tc): raise ValueError("ic > Imax (TA_MIN)")
         
+        cdef double Icmin, Icmax
+        
+        Icmin = self._getCurrent(_TA_MAX, tc)
+        Icmax = self._getCurrent(_TA_MIN, tc)
+        if ic < Icmin: raise ValueError("ic < Imin (TA_MAX)")
+        if ic > Icmax: raise ValueError("ic > Imax (TA_MIN)")
+        return self._calcTa(tc, ic, Icmin, Icmax)
+    
+    def getTaArray(self, tc, ic):
+        cdef const double[:] vtc, vic
+        cdef double[:] vout
+        cdef double t, amp, Icmin, Icmax
+        cdef Py_ssize_t i, n
+        
+        atc, aic = np.broadcast_arrays(np.asarray(tc, dtype=np.float64), 
+                                       np.asarray(ic, dtype=np.float64))
+        shape = atc.shape
+        vtc = np.ascontiguousarray(atc).ravel()
+        vic = np.ascontiguousarray(aic).ravel()
+        n = vtc.shape[0]
+        
+        out = np.empty(n, dtype=np.float64)
+        vout = out
+        for i in range(n):
+            t = vtc[i]
+            amp = vic[i]
+            if t < _TC_MIN or t > _TC_MAX:
+                vout[i] = NAN
+                continue
+            Icmin = self._calcCurrent(_TA_MAX, t)
+            Icmax = self._calcCurrent(_TA_MIN, t)
+            if not (amp >= Icmin and amp <= Icmax):
+                vout[i] = NAN
+            else:
+                vout[i] = self._calcTa(t, amp, Icmin, Icmax)
+        return out.reshape(shape)
+    
+    cdef double _calcTa(self, double tc, double ic, double Icmin, double Icmax) except -1000:
+        # _getTa without range checks
+        # Icmin, Icmax : Currents at TA_MAX and TA_MIN
         cdef double Tmin, Tmax, Tmed, Imed
         #cdef int cuenta
         
         Tmin = _TA_MIN
-        Tmax = min([_TA_MAX, tc])
+        Tmax = min(_TA_MAX, tc)
         if Tmin >= Tmax:
             return tc
         
+        # With ic = 0 the root is not unique (sun effect), bisection gives the lowest one
+        if self._solver == _SV_BRENT and ic > 0:
+            if Tmax < _TA_MAX:
+                Icmin = 0.0
+            return self._brent(1, tc, ic, Tmin, Tmax, Icmax - ic, Icmin - ic)
+        
         #cuenta = 0
+        Tmed = 0.5*(Tmin + Tmax)
         while (Tmax - Tmin) > self._deltaTemp:
             Tmed = 0.5*(Tmin + Tmax)
-            Imed = self._getCurrent(Tmed, tc)
+            Imed = self._calcCurrent(Tmed, tc)
             if Imed > ic:
                 Tmin = Tmed
             else: 
@@ -198,6 +382,72 @@ cdef class CurrentCalc:
             #    err_msg = "getTa(): N° iterations > %d" % ITER_MAX
             #    raise RuntimeError(err_msg)
         return Tmed
+    
+    cdef double _balance(self, int mode, double fixed, double x, double ic):
+        # Function to solve. mode = 0: x is tc and fixed is ta, mode = 1: x is ta and fixed is tc
+        if mode == 0:
+            return self._calcCurrent(fixed, x) - ic
+        return self._calcCurrent(x, fixed) - ic
+    
+    cdef double _brent(self, int mode, double fixed, double ic, double xa, double xb, 
+                       double fa, double fb) except -1000:
+        # Brent method to find the root of _balance in [xa, xb]. Returns x within deltaTemp.
+        # fa, fb : _balance values at xa and xb, with opposite signs
+        cdef double xpre, xcur, xblk, fpre, fcur, fblk, spre, scur, sbis, stry, dpre, dblk, tol
+        cdef int cuenta
+        
+        xpre = xa
+        xcur = xb
+        fpre = fa
+        fcur = fb
+        xblk = fblk = spre = scur = 0.0
+        if fpre == 0: return xpre
+        if fcur == 0: return xcur
+        
+        tol = 0.5*self._deltaTemp
+        for cuenta in range(_ITER_MAX):
+            if fpre*fcur < 0:
+                xblk = xpre
+                fblk = fpre
+                spre = scur = xcur - xpre
+            if fabs(fblk) < fabs(fcur):
+                xpre = xcur
+                xcur = xblk
+                xblk = xpre
+                fpre = fcur
+                fcur = fblk
+                fblk = fpre
+            
+            sbis = 0.5*(xblk - xcur)
+            if fcur == 0 or fabs(sbis) < tol:
+                return xcur
+            
+            if fabs(spre) > tol and fabs(fcur) < fabs(fpre):
+                if xpre == xblk:
+                    # Interpolación lineal
+                    stry = -fcur*(xcur - xpre)/(fcur - fpre)
+                else:
+                    # Interpolación cuadrática inversa
+                    dpre = (fpre - fcur)/(xpre - xcur)
+                    dblk = (fblk - fcur)/(xblk - xcur)
+                    stry = -fcur*(fblk*dblk - fpre*dpre)/(dblk*dpre*(fblk - fpre))
+                if 2*fabs(stry) < min(fabs(spre), 3*fabs(sbis) - tol):
+                    spre = scur
+                    scur = stry
+                else:
+                    spre = scur = sbis
+            else:
+                spre = scur = sbis
+            
+            xpre = xcur
+            fpre = fcur
+            if fabs(scur) > tol:
+                xcur += scur
+            else:
+                xcur += tol if sbis > 0 else -tol
+            fcur = self._balance(mode, fixed, xcur, ic)
+        
+        raise RuntimeError("brent: N° iterations > %d" % _ITER_MAX)
 
     @property
     def altitude(self):
@@ -207,6 +457,7 @@ cdef class CurrentCalc:
     def altitude(self, double v):
         if v < 0: raise ValueError("altitude < 0")
         self._altitude = v
+        self._updateTerms()
     
     @property
     def airVelocity(self):
@@ -216,6 +467,7 @@ cdef class CurrentCalc:
     def airVelocity(self, double v):
         if v < 0: raise ValueError("airVelocity < 0")
         self._airVelocity = v
+        self._updateTerms()
     
     @property
     def sunEffect(self):
@@ -226,6 +478,7 @@ cdef class CurrentCalc:
         if v < 0: raise ValueError("sunEffect < 0")
         if v > 1: raise ValueError("sunEffect > 1")
         self._sunEffect = v
+        self._updateTerms()
     
     @property
     def emissivity(self):
@@ -236,6 +489,7 @@ cdef class CurrentCalc:
         if v < 0: raise ValueError("emissivity < 0")
         if v > 1: raise ValueError("emissivity > 1")
         self._emissivity = v
+        self._updateTerms()
     
     @property
     def formula(self):
@@ -254,6 +508,15 @@ cdef class CurrentCalc:
     def deltaTemp(self, double v):
         if v <= 0: raise ValueError("deltaTemp <= 0")
         self._deltaTemp = v
+    
+    @property
+    def solver(self):
+        return self._solver
+    
+    @solver.setter
+    def solver(self, int v):
+        if v not in [_SV_BISECTION, _SV_BRENT]: raise ValueError("solver <> SV_BISECTION, SV_BRENT")
+        self._solver = v
 
 #-----------------------------------------------------------------------------------------
 # OperatingItem
@@ -279,6 +542,9 @@ cdef class OperatingItem:
     cdef double _getCurrent(self, double ta) except -1000:
         return self.currentcalc._getCurrent(ta, self.tempMaxOp) * self.nsc
 
+    def getCurrentArray(self, ta):
+        return self.currentcalc.getCurrentArray(ta, self.tempMaxOp) * self.nsc
+
 #-----------------------------------------------------------------------------------------
 # OperatingTable
 
@@ -304,6 +570,38 @@ cdef class OperatingTable:
             if amp < minimo: minimo = amp
         return minimo
 
+    def getCurrentArray(self, ta):
+        return self.getLimitArray(ta)[0]
+    
+    def getLimitArray(self, ta):
+        cdef const double[:] vta
+        cdef double[:] vout
+        cdef Py_ssize_t[:] vidx
+        cdef double minimo, amp
+        cdef Py_ssize_t i, k, n, limit
+        cdef OperatingItem item
+        
+        ata = np.asarray(ta, dtype=np.float64)
+        shape = ata.shape
+        vta = np.ascontiguousarray(ata).ravel()
+        n = vta.shape[0]
+        
+        out = np.empty(n, dtype=np.float64)
+        index = np.empty(n, dtype=np.intp)
+        vout = out
+        vidx = index
+        for i in range(n):
+            minimo = 100000
+            limit = -1
+            for k, item in enumerate(self.items):
+                amp = item._getCurrent(vta[i])
+                if amp < minimo:
+                    minimo = amp
+                    limit = k
+            vout[i] = minimo
+            vidx[i] = limit
+        return out.reshape(shape), index.reshape(shape)
+
 #-----------------------------------------------------------------------------------------
 # TcTimeData
 
@@ -371,4 +669,42 @@ cdef class TcTimeData:
         t0, v0 = self.data[ilo]
         t1, v1 = self.data[ihi]
 
-        return (t - t0)*(v1 - v0)/(t1 - t0) + v0
\ No newline at end of file
+        return (t - t0)*(v1 - v0)/(t1 - t0) + v0
+
+#-----------------------------------------------------------------------------------------
+# Euler integration
+
+def fillEuler(double[:] out, double tcx, double icfin, double ta, double timeStep, 
+              double r25, double alpha, double hcap, tuple terms, int formula):
+    """Fills out with the temperatures each timeStep from tcx [°C], the Euler steps of
+    cx TcTimeCalc.getData
+    out      : Buffer with the number of values (float array)
+    tcx      : Conductor temperature to start calculus [°C]
+    icfin    : Current during the steps [ampere]
+    ta       : Ambient temperature [°C]
+    timeStep : Time step [seconds]
+    r25      : Conductor resistance at 25 °C [ohm/km]
+    alpha    : Temperature coefficient of resistance [1/°C]
+    hcap     : Heat capacity of conductor
+    terms    : (D, D75, Pb, V, Qr0, Qs) terms of the CurrentCalc heat balance
+    formula  : CF_IEEE or CF_CLASSIC
+    """
+    cdef double D, D75, Pb, V, Qr0, Qs, K, ic2, temp, Rtemp, Itemp
+    cdef Py_ssize_t i, n
+    
+    D, D75, Pb, V, Qr0, Qs = terms
+    K = 0.86/3600*timeStep/hcap
+    ic2 = icfin*icfin
+    n = out.shape[0]
+    
+    temp = tcx
+    if temp < _TC_MIN: raise ValueError("tc < TC_MIN")
+    if temp > _TC_MAX: raise ValueError("tc > TC_MAX")
+    out[0] = temp
+    for i in range(1, n):
+        Rtemp = r25*(1 + alpha*(temp - 25))*.0003048                    # Resistencia Ohm/pie
+        Itemp = _heatCurrent(ta, temp, r25, alpha, D, D75, Pb, V, Qr0, Qs, formula)
+        temp = temp + K*Rtemp*(ic2 - Itemp*Itemp)
+        if temp < _TC_MIN: raise ValueError("tc < TC_MIN")
+        if temp > _TC_MAX: raise ValueError("tc > TC_MAX")
+        out[i] = temp